@@ -1,69 +1,84 @@
 # app.py
-import time, json
+import io
 import streamlit as st
-import streamlit.components.v1 as components
-from string import Template
+from utils.acoes import AcaoInvalida
+from utils.penalidades import FilaPenalidades, id_penalidade
+from utils.periodos import PERIODOS, REGULAMENTARES, TECNICOS_POR_EQUIPE
+from utils.partidas import Partida
+from utils import perfil, recursos
+from utils.placar import quadra_e_excluidos
+from utils.registros import (
+    COLUNAS_EVENTOS, COLUNAS_JOGADORES, csv_em_blocos, escrever_parquet, linhas_eventos, linhas_jogadores,
+)
+from utils.relogio import relogio_partida
+from utils.servidor import PORTA_PLACAR, central_placar, partida_atual
+from utils.tempo import agora as relogio_servidor
 
 # =====================================================
-# 🔧 Inicialização de estado global
+# 🔧 Partida compartilhada (registro por processo) + estado da sessão
 # =====================================================
-if "equipes" not in st.session_state:
-    st.session_state["equipes"] = {"A": [], "B": []}
-if "cores" not in st.session_state:
-    st.session_state["cores"] = {"A": "#00AEEF", "B": "#EC008C"}
-if "titulares_definidos" not in st.session_state:
-    st.session_state["titulares_definidos"] = {"A": False, "B": False}
-if "nome_A" not in st.session_state:
-    st.session_state["nome_A"] = "Equipe A"
-if "nome_B" not in st.session_state:
-    st.session_state["nome_B"] = "Equipe B"
-
-# =====================================================
-# 🧭 Abas
-# =====================================================
-abas = st.tabs([
-    "Configuração da Equipe",
-    "Definir Titulares",
-    "Controle do Jogo",
-    "Visualização de Dados"
-])
+perfil.iniciar_rerun()  # instrumentação opcional (?perfil=1); sem custo se desligada
+partida: Partida = partida_atual()
+estado = partida.estado
+central_placar()  # servidor SSE/hora (uma vez por processo): o relógio da mesa sincroniza por ele
+
+# Estado só desta sessão (visualização)
+if "invert_lados" not in st.session_state:
+    st.session_state["invert_lados"] = False
+
+# Só a seção escolhida executa; o Streamlit descarta o estado dos widgets que
+# não foram desenhados no rerun, então reatribuímos os campos ainda não salvos
+# para que sobrevivam à troca de seção.
+_WIDGETS_PRESERVADOS = ("nome_A", "nome_B", "qtd_A", "qtd_B", "cor_A", "cor_B", "retro_eq", "retro_tempo")
+for _k in _WIDGETS_PRESERVADOS:
+    if _k in st.session_state:
+        st.session_state[_k] = st.session_state[_k]
 
 # =====================================================
 # Helpers básicos compartilhados
 # =====================================================
 def get_team_name(eq: str) -> str:
     """Nome configurado da equipe (A/B), com fallback."""
-    return st.session_state.get(f"nome_{eq}") or f"Equipe {eq}"
-
-def atualizar_estado(eq: str, numero: int, novo_estado: str) -> bool:
-    """Muda o estado do jogador (jogando|banco|excluido|expulso)."""
-    for j in st.session_state["equipes"][eq]:
-        if int(j["numero"]) == int(numero):
-            j["estado"] = novo_estado
-            return True
-    return False
-
-def jogadores_por_estado(eq: str, estado: str):
-    """Lista de jogadores elegíveis (não-expulsos) no estado informado."""
-    return [
-        int(j["numero"])
-        for j in st.session_state["equipes"][eq]
-        if j.get("elegivel", True) and j.get("estado") == estado
-    ]
+    return estado["nomes"].get(eq) or f"Equipe {eq}"
 
+# Leituras do elenco sempre sob a trava de leitura: o Elenco monta as listas
+# por estado sob demanda e as guarda em cache — sem a trava, uma lista montada
+# antes de uma mudança concorrente poderia ficar no cache depois dela.
 def elenco(eq: str):
     """Todos os jogadores elegíveis (não-expulsos)."""
-    return [
-        int(j["numero"])
-        for j in st.session_state["equipes"][eq]
-        if j.get("elegivel", True)
-    ]
+    with partida.leitura():
+        return list(estado["equipes"][eq].elegiveis())
+
+# ---------- Relógio e ações (sobre a partida compartilhada) ----------
+def tempo_logico_atual() -> float:
+    """Tempo exibido no cronômetro (reinicia no 'Zerar')."""
+    return partida.tempo_logico()
+
+def tempo_partida() -> float:
+    """Tempo de jogo monotônico da partida (não reinicia no 'Zerar'); base da linha do tempo."""
+    return partida.tempo_partida()
+
+def acao(tipo: str, t: float | None = None, **dados) -> dict | None:
+    """
+    Aplica uma ação da mesa à partida, registra na linha do tempo e persiste.
+    Se o motor recusar (regra do jogo), mostra o motivo e devolve None.
+    """
+    try:
+        return partida.aplicar(tipo, t, **dados)
+    except AcaoInvalida as e:
+        st.error(str(e))
+        return None
+
+# Sessão nova numa partida já em andamento: números do elenco salvo no formulário
+for _eq in ("A", "B"):
+    if f"numeros_{_eq}" not in st.session_state and estado["equipes"][_eq]:
+        st.session_state[f"numeros_{_eq}"] = estado["equipes"][_eq].numeros()
 
 
 # =====================================================
 # ABA 1 — CONFIGURAÇÃO DA EQUIPE
 # =====================================================
-with abas[0]:
+def secao_configuracao():
     st.subheader("Configuração da Equipe")
 
     def ensure_num_list(team_key: str, qtd: int):
@@ -83,11 +98,14 @@ with abas[0]:
         with col:
             st.markdown(f"### {get_team_name(eq)}")
 
+            st.session_state.setdefault(f"nome_{eq}", estado["nomes"][eq])
+            st.session_state.setdefault(f"qtd_{eq}", len(estado["equipes"][eq]) or 7)
+            st.session_state.setdefault(f"cor_{eq}", estado["cores"][eq])
+
             nome = st.text_input(f"Nome da equipe {eq}", key=f"nome_{eq}")
             qtd = st.number_input(
                 f"Quantidade de jogadores ({eq})",
                 min_value=1, max_value=20, step=1,
-                value=len(st.session_state["equipes"][eq]) or 7,
                 key=f"qtd_{eq}"
             )
 
@@ -105,40 +123,32 @@ with abas[0]:
                     )
                     st.session_state[f"numeros_{eq}"][i] = int(novo)
 
-            cor = st.color_picker(
-                f"Cor da equipe {eq}",
-                value=st.session_state["cores"][eq],
-                key=f"cor_{eq}"
-            )
-            st.session_state["cores"][eq] = cor
+            cor = st.color_picker(f"Cor da equipe {eq}", key=f"cor_{eq}")
 
             if st.button(f"Salvar equipe {eq}", key=f"save_team_{eq}"):
                 numeros = list(dict.fromkeys(st.session_state[f"numeros_{eq}"]))  # sem duplicatas
-                st.session_state["equipes"][eq] = [
-                    {"numero": int(n), "estado": "banco", "elegivel": True, "exclusoes": 0}
-                    for n in numeros
-                ]
-                st.success(f"Equipe {eq} salva com {len(numeros)} jogadores.")
-                st.session_state["titulares_definidos"][eq] = False
+                if acao("elenco", equipe=eq, numeros=[int(n) for n in numeros], nome=nome, cor=cor):
+                    st.success(f"Equipe {eq} salva com {len(numeros)} jogadores.")
 
 
 # =====================================================
 # ABA 2 — DEFINIR TITULARES
 # =====================================================
-with abas[1]:
+def secao_titulares():
     st.subheader("Definir Titulares")
 
     for eq in ["A", "B"]:
         st.markdown(f"### {get_team_name(eq)}")
 
-        jogadores = st.session_state["equipes"][eq]
-        if not jogadores:
+        with partida.leitura():
+            jogadores = estado["equipes"][eq]
+            numeros = jogadores.numeros()
+            em_quadra = list(jogadores.por_estado("jogando"))
+        if not numeros:
             st.info(f"Cadastre primeiro a {get_team_name(eq)} na aba anterior.")
             continue
 
-        numeros = [j["numero"] for j in jogadores]
-
-        disabled = bool(st.session_state["titulares_definidos"][eq])
+        disabled = bool(estado["titulares_definidos"][eq])
         if disabled:
             st.success("Titulares já registrados. Clique em **Corrigir** para editar.")
 
@@ -146,7 +156,7 @@ with abas[1]:
         titulares_sel = st.multiselect(
             "Selecione titulares (adicione um a um)",
             options=numeros,
-            default=[j["numero"] for j in jogadores if j.get("estado") == "jogando"],
+            default=em_quadra,
             key=tit_key,
             disabled=disabled
         )
@@ -154,133 +164,60 @@ with abas[1]:
         c1, c2 = st.columns(2)
         with c1:
             if st.button(f"Registrar titulares ({eq})", key=f"registrar_tit_{eq}", disabled=disabled):
-                if not titulares_sel:
-                    st.error("Selecione pelo menos 1 titular.")
-                else:
-                    sel = set(map(int, titulares_sel))
-                    for j in st.session_state["equipes"][eq]:
-                        j["estado"] = "jogando" if j["numero"] in sel else "banco"
-                        j["elegivel"] = True
-                        # zera “banco” do titular até agora (fix incremental titulação)
-                        if j["estado"] == "jogando":
-                            s = st.session_state.setdefault("stats", {"A":{}, "B":{}})[eq].setdefault(
-                                int(j["numero"]), {"jogado_1t":0.0,"jogado_2t":0.0,"banco":0.0,"doismin":0.0}
-                            )
-                            s["banco"] = 0.0
-                    st.session_state["titulares_definidos"][eq] = True
+                sel = set(map(int, titulares_sel))
+                if acao("titulares", equipe=eq, numeros=sorted(sel)):
                     st.success(f"Titulares de {get_team_name(eq)} registrados.")
         with c2:
             if st.button(f"Corrigir ({eq})", key=f"corrigir_tit_{eq}"):
-                st.session_state["titulares_definidos"][eq] = False
+                acao("corrigir_titulares", equipe=eq)
                 st.info("Edição de titulares liberada.")
 
 
 # =====================================================
 # ABA 3 — CONTROLE DO JOGO (entradas, saídas e penalidades)
 # =====================================================
-import streamlit.components.v1 as components
-from string import Template  # ok repetir o import; não dá erro
-
-# ---------- Estado mínimo do relógio e dados ----------
-def _init_clock_state():
-    if "iniciado" not in st.session_state: st.session_state["iniciado"] = False
-    if "ultimo_tick" not in st.session_state: st.session_state["ultimo_tick"] = time.time()
-    if "cronometro" not in st.session_state: st.session_state["cronometro"] = 0.0
-    if "periodo" not in st.session_state: st.session_state["periodo"] = "1º Tempo"
-    if "invert_lados" not in st.session_state: st.session_state["invert_lados"] = False
-    if "penalties" not in st.session_state:
-        # penalties[eq] = [{numero, start, end, consumido}]
-        st.session_state["penalties"] = {"A": [], "B": []}
-    if "stats" not in st.session_state:
-        st.session_state["stats"] = {"A": {}, "B": {}}
-
 # ---------- Penalidades: helpers ----------
-def _equipe_penalidades(eq: str):
-    return st.session_state["penalties"].get(eq, [])
-
-def _registrar_exclusao(eq: str, numero: int, start_elapsed: float):
-    st.session_state["penalties"][eq].append({
-        "numero": int(numero),
-        "start": float(start_elapsed),
-        "end": float(start_elapsed) + 120.0,  # 2 minutos = 120s
-        "consumido": False
-    })
+def _equipe_penalidades(eq: str) -> FilaPenalidades:
+    return estado["penalties"][eq]
 
 def _penalidades_ativas(eq: str, agora_elapsed: float):
-    return [p for p in _equipe_penalidades(eq) if (agora_elapsed < p["end"]) and not p["consumido"]]
+    return _equipe_penalidades(eq).ativas(agora_elapsed)
 
 def _penalidades_concluidas_nao_consumidas(eq: str, agora_elapsed: float):
-    return [p for p in _equipe_penalidades(eq) if (agora_elapsed >= p["end"]) and not p["consumido"]]
-
-# ---------- Cronômetro principal (JS fixo) ----------
-def render_cronometro_js():
-    iniciado = "true" if st.session_state["iniciado"] else "false"
-    base_elapsed = float(st.session_state["cronometro"])
-    start_epoch = float(st.session_state["ultimo_tick"]) if st.session_state["iniciado"] else None
-
-    st.markdown("""
-        <style>
-        .cronofixo { position: sticky; top: 0; z-index: 999; text-align:center; padding:6px 0; background:#fff;
-                     border-bottom:1px solid #e5e7eb; margin-bottom:10px; }
-        .digital { font-family:'Courier New', monospace; font-size:28px; font-weight:700;
-                   color:#FFD700; background:#000; padding:6px 16px; border-radius:8px;
-                   letter-spacing:2px; box-shadow:0 0 8px rgba(255,215,0,.4); display:inline-block; }
-        .team-head { color:#fff; padding:6px 10px; border-radius:8px; font-size:14px; font-weight:700; margin-bottom:6px; }
-        .sec-title { font-size:14px; font-weight:700; margin:6px 0 4px; }
-        .compact .stSelectbox label, .compact .stButton button, .compact .stRadio label { font-size:13px!important; }
-        .chip { display:inline-block; padding:2px 6px; border-radius:6px; font-size:12px; margin-left:6px; }
-        .chip-sai { background:#ffe5e5; color:#a30000; }
-        .chip-ent { background:#e7ffe7; color:#005a00; }
-        .chips-line { margin:6px 0 10px; display:flex; flex-wrap:wrap; gap:6px; }
-        .chip-quadra { background:#e8ffe8; color:#0b5; border:1px solid #bfe6bf; }
-        .chip-inelegivel { background:#f2f3f5; color:#888; border:1px solid #dcdfe3; opacity:.8; }
-        </style>
-    """, unsafe_allow_html=True)
-
-    html = f"""
-    <div class="cronofixo">
-      <div id="cronovisual" class="digital">⏱ 00:00</div>
-    </div>
-    <script>
-      (function(){{
-        const el = document.getElementById('cronovisual');
-        const iniciado = {iniciado};
-        const baseElapsed = {json.dumps(base_elapsed)};
-        const startEpoch = {json.dumps(start_epoch)};
-        function fmt(sec){{
-          sec = Math.max(0, Math.floor(sec));
-          const m = Math.floor(sec/60), s = sec % 60;
-          return (m<10?'0':'')+m+':' + (s<10?'0':'')+s;
-        }}
-        function tick(){{
-          let elapsed = baseElapsed;
-          if (iniciado && startEpoch){{
-            const now = Date.now()/1000;
-            elapsed = baseElapsed + (now - startEpoch);
-          }}
-          el.textContent = '⏱ ' + fmt(elapsed);
-        }}
-        tick();
-        if (window.__cronovisual_timer) clearInterval(window.__cronovisual_timer);
-        window.__cronovisual_timer = setInterval(tick, 250);
-      }})();
-    </script>
-    """
-    components.html(html, height=62)
-
-# ---------- Utilitários de tempo / stats ----------
-def _ensure_player_stats(eq: str, numero: int):
-    if "stats" not in st.session_state:
-        st.session_state["stats"] = {"A": {}, "B": {}}
-    return st.session_state["stats"][eq].setdefault(int(numero), {
-        "jogado_1t": 0.0, "jogado_2t": 0.0, "banco": 0.0, "doismin": 0.0
-    })
-
-def tempo_logico_atual() -> float:
-    if st.session_state["iniciado"]:
-        return st.session_state["cronometro"] + (time.time() - st.session_state["ultimo_tick"])
-    return st.session_state["cronometro"]
-
+    return _equipe_penalidades(eq).concluidas_nao_consumidas(agora_elapsed)
+
+# ---------- Cronômetro + penalidades (um único componente) ----------
+@perfil.cronometrado()
+def render_relogio(lados):
+    """Relógio principal e contagens de 2' ativas num só iframe (um laço de timer)."""
+    recursos.estilo("mesa.css")
+
+    with partida.leitura():
+        agora = tempo_partida()
+        penalidades = [
+            {"id": id_penalidade(eq, p), "equipe": eq,
+             "numero": p.numero, "end": p.end}
+            for eq in lados
+            for p in _penalidades_ativas(eq, agora)
+        ]
+        relogio = (estado["iniciado"], estado["cronometro"], estado["ultimo_tick"], estado["tempo_base"])
+        fim = partida.periodos().fim_previsto()
+        fim_periodo = None if fim is None else fim - estado["tempo_base"]
+    equipes = [
+        {"equipe": eq, "nome": get_team_name(eq), "cor": estado["cores"].get(eq, "#333")}
+        for eq in lados
+    ]
+    retorno = relogio_partida(*relogio, equipes, penalidades, PORTA_PLACAR, partida.id, fim_periodo)
+    perfil.contar("componentes")
+    # Aviso (uma vez) das penalidades que o navegador viu zerar
+    avisadas = st.session_state.setdefault("pen_avisadas", set())
+    for pid in (retorno or {}).get("expiradas", []):
+        if pid not in avisadas:
+            avisadas.add(pid)
+            _, eq, numero, _ = pid.split("_")
+            st.toast(f"2' concluído: {get_team_name(eq)} #{numero}", icon="✅")
+
+# ---------- Utilitários de tempo ----------
 def _parse_mmss(txt: str) -> int | None:
     try:
         mm, ss = txt.strip().split(":")
@@ -290,36 +227,52 @@ def _parse_mmss(txt: str) -> int | None:
     except Exception:
         return None
 
-# ---------- Botões do relógio (sem st.rerun dentro da função) ----------
+# ---------- Botões do relógio (callbacks on_click, sem st.rerun) ----------
 def toggle_relogio():
-    """Inicia ou pausa o relógio."""
-    if not st.session_state.get("iniciado", False):
-        st.session_state["iniciado"] = True
-        st.session_state["ultimo_tick"] = time.time()
-        st.toast("⏱️ Iniciado", icon="▶️")
-    else:
-        agora = time.time()
-        st.session_state["cronometro"] = float(st.session_state.get("cronometro", 0.0)) + (agora - st.session_state.get("ultimo_tick", agora))
-        st.session_state["iniciado"] = False
-        st.session_state["ultimo_tick"] = agora
+    """Inicia (abrindo o próximo período, se o anterior foi encerrado) ou pausa o relógio."""
+    agora = relogio_servidor()
+    t = tempo_partida()
+    if not estado.get("iniciado", False):
+        if acao("inicio", t=t, epoch=agora):
+            st.toast(f"⏱️ Iniciado — {estado['periodo']}", icon="▶️")
+    elif acao("pausa", t=t, epoch=agora):
         st.toast("⏸️ Pausado", icon="⏸️")
 
 def zerar_relogio():
-    st.session_state["iniciado"] = False
-    st.session_state["cronometro"] = 0.0
-    st.session_state["ultimo_tick"] = time.time()
-    st.toast("🔁 Zerado", icon="🔁")
+    if acao("zerar", epoch=relogio_servidor()):
+        st.toast("🔁 Zerado", icon="🔁")
+
+def encerrar_periodo():
+    periodo = estado["periodo"]
+    if acao("fim_periodo", epoch=relogio_servidor(), periodo=periodo):
+        st.toast(f"Fim do {periodo}", icon="⏹️")
+
+def pedir_tempo_tecnico(eq: str):
+    if acao("tempo_tecnico", equipe=eq, epoch=relogio_servidor()):
+        st.toast(f"Tempo técnico: {get_team_name(eq)}", icon="⏱️")
 
 # ---------- Painel da equipe ----------
+# Cada painel é um fragmento: um clique (Substituição, 2', retorno, expulsão)
+# reexecuta só o painel da própria equipe. O que aparece fora dele é
+# propagado explicitamente — hoje só a exclusão, que abre uma contagem no
+# relógio (outro fragmento) e por isso pede um rerun do app inteiro.
+@st.fragment
+@perfil.cronometrado()
 def painel_equipe(eq: str):
-    cor = st.session_state["cores"].get(eq, "#333")
+    cor = estado["cores"].get(eq, "#333")
     nome = get_team_name(eq)
     st.markdown(f"<div class='team-head' style='background:{cor};'>{nome}</div>", unsafe_allow_html=True)
 
+    # Listas do painel lidas de uma vez, sob a trava de leitura
+    with partida.leitura():
+        jogadores = estado["equipes"][eq]
+        on_court, excluidos = quadra_e_excluidos(jogadores)
+        list_sai = list(jogadores.por_estado("jogando"))
+        list_entra = list(jogadores.por_estado("banco"))
+        elegiveis_retorno = list_entra + list(jogadores.por_estado("excluido"))
+        jogadores_all = list(jogadores.elegiveis())
+
     # Linha com quem está em quadra (jogando) e quem está nos 2' (cinza)
-    jogadores = st.session_state["equipes"].get(eq, [])
-    on_court = sorted([int(j["numero"]) for j in jogadores if j.get("estado") == "jogando" and j.get("elegivel", True)])
-    excluidos = sorted([int(j["numero"]) for j in jogadores if j.get("estado") == "excluido" and j.get("elegivel", True)])
 
     chips = []
     for num in on_court:
@@ -338,21 +291,15 @@ def painel_equipe(eq: str):
         # --- Substituição ---
         st.markdown("<div class='sec-title'>🔁 Substituição</div>", unsafe_allow_html=True)
         cols_sub = st.columns([1, 1, 1])
-        list_sai = jogadores_por_estado(eq, "jogando")
-        list_entra = jogadores_por_estado(eq, "banco")
         sai = cols_sub[0].selectbox("Sai", list_sai, key=f"sai_{eq}")
         entra = cols_sub[1].selectbox("Entra", list_entra, key=f"entra_{eq}")
         if cols_sub[2].button("Confirmar", key=f"btn_sub_{eq}", disabled=(not list_sai or not list_entra)):
-            if (sai in list_sai) and (entra in list_entra):
-                atualizar_estado(eq, sai, "banco")
-                atualizar_estado(eq, entra, "jogando")
+            if acao("substituicao", equipe=eq, sai=sai, entra=entra):
                 st.success(f"Substituição: Sai {sai} / Entra {entra}", icon="🔁")
                 st.markdown(
                     f"<span class='chip chip-sai'>Sai {sai}</span><span class='chip chip-ent'>Entra {entra}</span>",
                     unsafe_allow_html=True
                 )
-            else:
-                st.error("Seleção inválida para substituição.")
         st.markdown("---")
 
         # --- 2 minutos & Completou ---
@@ -360,184 +307,178 @@ def painel_equipe(eq: str):
 
         with cols_pen[0]:
             st.markdown("<div class='sec-title'>⛔ 2 minutos</div>", unsafe_allow_html=True)
-            jogadores_all = elenco(eq)
             jog_2m = st.selectbox("Jogador", jogadores_all, key=f"doismin_sel_{eq}")
             if st.button("Aplicar 2'", key=f"btn_2min_{eq}", disabled=(len(jogadores_all) == 0)):
-                atualizar_estado(eq, jog_2m, "excluido")
-                start = tempo_logico_atual()
-                _registrar_exclusao(eq, jog_2m, start_elapsed=start)
-                st.warning(f"Jogador {jog_2m} excluído por 2 minutos.")
+                if acao("exclusao", equipe=eq, numero=jog_2m):
+                    st.toast(f"Jogador {jog_2m} excluído por 2 minutos.", icon="⛔")
+                    st.rerun()  # relógio precisa mostrar a nova contagem
 
         with cols_pen[1]:
             st.markdown("<div class='sec-title'>✅ Completou</div>", unsafe_allow_html=True)
-            agora = tempo_logico_atual()
-            concluidas = _penalidades_concluidas_nao_consumidas(eq, agora)
-            elegiveis_retorno = jogadores_por_estado(eq, "banco") + jogadores_por_estado(eq, "excluido")
             comp = st.selectbox("Jogador que entra", elegiveis_retorno, key=f"comp_sel_{eq}")
             if st.button("Confirmar retorno", key=f"btn_comp_{eq}", disabled=(len(elegiveis_retorno) == 0)):
-                if not concluidas:
-                    st.error("Ainda não há exclusões concluídas (2' completos). Aguarde.")
-                else:
-                    concluidas.sort(key=lambda p: p["end"])
-                    concluidas[0]["consumido"] = True
-                    atualizar_estado(eq, comp, "jogando")
+                if acao("retorno", equipe=eq, numero=comp):
                     st.success(f"Jogador {comp} entrou após 2'.")
 
         st.markdown("---")
 
         # --- Expulsão ---
         st.markdown("<div class='sec-title'>🟥 Expulsão</div>", unsafe_allow_html=True)
-        jogadores_all = elenco(eq)
         exp = st.selectbox("Jogador", jogadores_all, key=f"exp_sel_{eq}")
         if st.button("Confirmar expulsão", key=f"btn_exp_{eq}", disabled=(len(jogadores_all) == 0)):
-            ok = False
-            for j in st.session_state["equipes"][eq]:
-                if int(j["numero"]) == int(exp):
-                    j["estado"] = "expulso"
-                    j["elegivel"] = False
-                    ok = True
-                    break
-            if ok:
+            if acao("expulsao", equipe=eq, numero=exp):
                 st.error(f"Jogador {exp} expulso.")
-            else:
-                st.error("Não foi possível expulsar o jogador selecionado.")
 
         st.markdown("</div>", unsafe_allow_html=True)
 
-# ---------- Render da ABA 3 ----------
-with abas[2]:
-    _init_clock_state()
-    st.subheader("Controle do Jogo")
-
-    # Linha do relógio e período
+# ---------- Linha do relógio + cronômetro (fragmento) ----------
+@st.fragment
+@perfil.cronometrado()
+def area_relogio(lados):
+    """Botões do relógio e dos períodos e o componente; reexecuta sem tocar nos painéis."""
+    periodos = partida.periodos()
+    iniciado = estado.get("iniciado", False)
     cc1, cc2, cc3 = st.columns([1, 1, 2])
     with cc1:
-        label = "▶️ Iniciar" if not st.session_state.get("iniciado", False) else "⏸️ Pausar"
-        if st.button(label, key="clk_toggle", use_container_width=True):
-            toggle_relogio()
-            st.rerun()  # <- agora fora do callback
+        if iniciado:
+            label = "⏸️ Pausar"
+        elif periodos.proximo is not None:
+            label = f"▶️ Iniciar {PERIODOS[periodos.proximo]}"
+        else:
+            label = "▶️ Iniciar"
+        # callbacks rodam antes do fragmento: o rótulo já sai atualizado, sem rerun extra
+        st.button(
+            label, key="clk_toggle", use_container_width=True, on_click=toggle_relogio,
+            disabled=not (iniciado or periodos.aberto or periodos.proximo is not None),
+        )
     with cc2:
-        if st.button("🔁 Zerar", key="clk_reset", use_container_width=True):
-            zerar_relogio()
-            st.rerun()  # <- fora do callback
+        st.button("🔁 Zerar", key="clk_reset", use_container_width=True, on_click=zerar_relogio)
     with cc3:
         c31, c32 = st.columns([1, 1])
         with c31:
-            st.session_state["periodo"] = st.selectbox(
-                "Período", ["1º Tempo", "2º Tempo"],
-                index=0 if st.session_state["periodo"] == "1º Tempo" else 1,
-                key="sel_periodo"
+            # fronteiras de período no tempo de partida: o fim é registrado pela mesa
+            st.button(
+                f"⏹️ Encerrar {estado['periodo']}" if periodos.aberto else f"⏹️ {estado['periodo']}",
+                key="clk_fim_periodo", use_container_width=True, on_click=encerrar_periodo,
+                disabled=not (iniciado or periodos.comecou(tempo_partida())),
             )
         with c32:
-            st.session_state["invert_lados"] = st.toggle("Inverter lados (A ⇄ B)", value=st.session_state["invert_lados"])
+            invert = st.toggle("Inverter lados (A ⇄ B)", value=st.session_state["invert_lados"])
+            if invert != st.session_state["invert_lados"]:
+                st.session_state["invert_lados"] = invert
+                st.rerun()  # troca a ordem dos painéis: rerun do app inteiro
+
+    # Tempos técnicos (param o relógio; não há na prorrogação)
+    cols_tt = st.columns(len(lados))
+    for col, eq in zip(cols_tt, lados):
+        usados = periodos.tecnicos_de(eq)
+        col.button(
+            f"⏱️ Tempo técnico {get_team_name(eq)} ({usados}/{TECNICOS_POR_EQUIPE})",
+            key=f"clk_tt_{eq}", use_container_width=True, on_click=pedir_tempo_tecnico, args=(eq,),
+            disabled=not (iniciado and periodos.atual < REGULAMENTARES) or usados >= TECNICOS_POR_EQUIPE,
+        )
+
+    # Cronômetro + penalidades ativas
+    render_relogio(lados)
+
+# ---------- Desfazer / refazer (ações da mesa) ----------
+_ROTULOS = {
+    "substituicao": "substituição", "exclusao": "2'", "retorno": "retorno", "expulsao": "expulsão",
+    "inicio": "iniciar", "pausa": "pausar", "zerar": "zerar", "periodo": "período",
+    "fim_periodo": "fim de período", "tempo_tecnico": "tempo técnico",
+}
+
+def _descrever(ev: dict) -> str:
+    rotulo = _ROTULOS.get(ev["tipo"], ev["tipo"])
+    if "equipe" not in ev:
+        return rotulo
+    if ev["tipo"] == "substituicao":
+        return f"{rotulo} {get_team_name(ev['equipe'])}: sai {ev['sai']} / entra {ev['entra']}"
+    if "numero" not in ev:
+        return f"{rotulo} {get_team_name(ev['equipe'])}"
+    return f"{rotulo} {get_team_name(ev['equipe'])} #{ev['numero']}"
+
+# a ação desfeita/refeita é a do momento do clique (o callback a recebe do
+# motor): os botões da mesa reexecutam só o próprio fragmento, então a barra
+# tem rótulo fixo em vez de um "Desfazer <última ação>" que ficaria velho
+def desfazer_acao():
+    ev = partida.desfazer()
+    if ev is not None:
+        st.toast(f"Desfeito: {_descrever(ev)}", icon="↩️")
+    else:
+        st.toast("Nada para desfazer.", icon="↩️")
 
-    # Cronômetro JS
-    render_cronometro_js()
+def refazer_acao():
+    ev = partida.refazer()
+    if ev is not None:
+        st.toast(f"Refeito: {_descrever(ev)}", icon="↪️")
+    else:
+        st.toast("Nada para refazer.", icon="↪️")
+
+def barra_desfazer():
+    """Fora dos fragmentos: desfazer mexe no relógio e nos dois painéis."""
+    u1, u2 = st.columns(2)
+    u1.button("↩️ Desfazer", key="btn_desfazer", on_click=desfazer_acao, use_container_width=True)
+    u2.button("↪️ Refazer", key="btn_refazer", on_click=refazer_acao, use_container_width=True)
+
+# ---------- Render da ABA 3 ----------
+def secao_controle():
+    st.subheader("Controle do Jogo")
 
     # Painéis lado a lado — respeitando “Inverter lados”
     lados = ("A", "B") if not st.session_state["invert_lados"] else ("B", "A")
+
+    area_relogio(lados)
+    barra_desfazer()
+
     col_esq, col_dir = st.columns(2)
     with col_esq:
-        if st.session_state["equipes"][lados[0]]:
+        if estado["equipes"][lados[0]]:
             st.markdown(f"#### {get_team_name(lados[0])}")
             painel_equipe(lados[0])
         else:
             st.info(f"Cadastre a {get_team_name(lados[0])} na aba de Configuração.")
     with col_dir:
-        if st.session_state["equipes"][lados[1]]:
+        if estado["equipes"][lados[1]]:
             st.markdown(f"#### {get_team_name(lados[1])}")
             painel_equipe(lados[1])
         else:
             st.info(f"Cadastre a {get_team_name(lados[1])} na aba de Configuração.")
 
-    # -------------------- Penalidades ativas (persistentes) --------------------
-    st.markdown("### Penalidades ativas")
-    agora = tempo_logico_atual()
-
-    def _render_pen_timers(eq: str):
-        ativas = _penalidades_ativas(eq, agora)
-        if not ativas:
-            st.caption(f"{get_team_name(eq)}: nenhuma penalidade ativa.")
-            return
-        st.markdown(f"**{get_team_name(eq)}**")
-        for p in ativas:
-            restante = max(0, int(round(p["end"] - agora)))
-            minutos = restante // 60
-            segundos = restante % 60
-            elem_id = f"pen_{eq}_{p['numero']}_{int(p['start'])}"  # id único
-
-            html_tpl = Template("""
-            <div style="margin:6px 0;">
-              <div style="display:flex;align-items:center;gap:8px;">
-                <div style="font-size:13px;">#$numero — resta:</div>
-                <div id="$elem_id" style="font-family:'Courier New';font-size:18px;color:#FF3333;background:#111;padding:3px 10px;border-radius:6px;display:inline-block;text-shadow:0 0 6px red;">$mm:$ss</div>
-              </div>
-            </div>
-            <script>
-              (function(){
-                let r = $restante;
-                const el = document.getElementById("$elem_id");
-                const beep = new Audio("https://actions.google.com/sounds/v1/alarms/beep_short.ogg");
-                function tick(){
-                  r = Math.max(0, r-1);
-                  const m = String(Math.floor(r/60)).padStart(2,'0');
-                  const s = String(r%60).padStart(2,'0');
-                  if (el) el.textContent = m + ":" + s;
-                  if (r <= 0) { try { beep.play(); } catch(e) {} clearInterval(window["timer_$elem_id"]); }
-                }
-                if (window["timer_$elem_id"]) clearInterval(window["timer_$elem_id"]);
-                window["timer_$elem_id"] = setInterval(tick, 1000);
-              })();
-            </script>
-            """)
-            html = html_tpl.substitute(
-                numero=int(p["numero"]),
-                elem_id=elem_id,
-                mm=f"{minutos:02d}",
-                ss=f"{segundos:02d}",
-                restante=int(restante),
-            )
-            components.html(html, height=48)
-
-    colA_t, colB_t = st.columns(2)
-    with colA_t: _render_pen_timers(lados[0])
-    with colB_t: _render_pen_timers(lados[1])
-
     # -----------------------------------------------------
-    # Substituições avulsas (retroativas) — sempre aplica ao estado atual
+    # Substituições avulsas (retroativas) — inseridas no histórico e recalculadas dali em diante
     # -----------------------------------------------------
     st.divider()
     st.markdown("## 📝 Substituições avulsas (retroativas)")
 
-    # Garantia de stats
-    if "stats" not in st.session_state:
-        st.session_state["stats"] = {"A": {}, "B": {}}
-
-    col_eq, col_time = st.columns([1, 1])
-    with col_eq:
-        equipe_sel = st.radio(
-            "Equipe", ["A", "B"],
-            horizontal=True, key="retro_eq",
-            format_func=lambda x: get_team_name(x),
-        )
-    with col_time:
-        periodo_sel = st.selectbox(
-            "Período da jogada",
-            ["1º Tempo", "2º Tempo"],
-            key="retro_periodo",
-        )
+    equipe_sel = st.radio(
+        "Equipe", ["A", "B"],
+        horizontal=True, key="retro_eq",
+        format_func=lambda x: get_team_name(x),
+    )
 
+    # Quem estava em quadra / no banco no instante informado (índice da linha do tempo)
+    st.session_state.setdefault("retro_tempo", "00:00")
+    t_informado = _parse_mmss(st.session_state["retro_tempo"])
     all_nums = elenco(equipe_sel)
+    sai_opcoes, entra_opcoes = all_nums, all_nums
+    if t_informado is not None:
+        with partida.leitura():
+            estados_t = partida.escalacao().estados_em(equipe_sel, estado["tempo_base"] + t_informado)
+        sai_opcoes = [n for n in all_nums if estados_t.get(n) == "jogando"]
+        entra_opcoes = [n for n in all_nums if estados_t.get(n) == "banco"]
+        st.caption(
+            f"Aos {st.session_state['retro_tempo']}: em quadra {', '.join(map(str, sai_opcoes)) or '—'}"
+            f" | no banco {', '.join(map(str, entra_opcoes)) or '—'}"
+        )
     c1, c2, c3 = st.columns([1, 1, 1])
     with c1:
-        sai_num = st.selectbox("Sai", all_nums, key="retro_sai")
+        sai_num = st.selectbox("Sai", sai_opcoes, key="retro_sai")
     with c2:
-        entra_opcoes = [n for n in all_nums if n != sai_num]
-        entra_num = st.selectbox("Entra", entra_opcoes, key="retro_entra")
+        entra_num = st.selectbox("Entra", [n for n in entra_opcoes if n != sai_num], key="retro_entra")
     with c3:
         tempo_str = st.text_input(
             "Tempo do jogo (MM:SS)",
-            value="00:00",
             key="retro_tempo",
             help="Ex.: 12:34 = ocorreu aos 12min34s.",
         )
@@ -547,31 +488,25 @@ with abas[2]:
         if t_mark is None:
             st.error("Tempo inválido. Use o formato MM:SS (ex.: 07:45).")
             return
-        if sai_num == entra_num:
-            st.error("Os jogadores de 'Sai' e 'Entra' precisam ser diferentes.")
+        if sai_num is None or entra_num is None:
+            st.error("Ninguém para trocar nesse instante: confira o tempo informado.")
             return
-
         now_elapsed = tempo_logico_atual()
         dt = max(0.0, float(now_elapsed) - float(t_mark))
         if dt <= 0:
             st.warning("O tempo informado é igual ou maior que o tempo atual — nada a corrigir.")
             return
 
-        jog_key = "jogado_1t" if periodo_sel == "1º Tempo" else "jogado_2t"
-        s_out = _ensure_player_stats(equipe_sel, int(sai_num))
-        s_in  = _ensure_player_stats(equipe_sel, int(entra_num))
-
-        s_out[jog_key]  = max(0.0, s_out[jog_key] - dt)
-        s_out["banco"] += dt
-        s_in["banco"]   = max(0.0, s_in["banco"] - dt)
-        s_in[jogado_key]  += dt
-
-        atualizar_estado(equipe_sel, int(sai_num), "banco")
-        atualizar_estado(equipe_sel, int(entra_num), "jogando")
+        # Insere a substituição no passado; os tempos são re-derivados da linha do tempo
+        if not acao(
+            "substituicao", t=estado["tempo_base"] + t_mark,
+            equipe=equipe_sel, sai=int(sai_num), entra=int(entra_num), retro=True,
+        ):
+            return
 
         mm_dt, ss_dt = int(dt // 60), int(dt % 60)
         st.info(
-            f"Retroativo aplicado ({periodo_sel}) em {get_team_name(equipe_sel)}: "
+            f"Retroativo aplicado em {get_team_name(equipe_sel)}: "
             f"Sai {sai_num} (−{mm_dt:02d}:{ss_dt:02d} jogado, + banco) | "
             f"Entra {entra_num} (+ jogado, − banco) a partir de {tempo_str} até agora."
         )
@@ -605,102 +540,43 @@ with abas[2]:
 # =====================================================
 # ABA 4 — VISUALIZAÇÃO DE DADOS (auto opcional)
 # =====================================================
-with abas[3]:
+def secao_visualizacao():
     import pandas as pd
 
     # --------- Estado local desta aba ----------
-    if "last_accum" not in st.session_state:
-        st.session_state["last_accum"] = time.time()
     if "viz_auto" not in st.session_state:
         st.session_state["viz_auto"] = False
     if "viz_interval" not in st.session_state:
         st.session_state["viz_interval"] = 1.0
 
-    # --------- Acúmulo contínuo de tempo (apenas quando esta aba está aberta) ----------
-    def _accumulate_time_tick():
-        """
-        Converte o estado atual (jogando/banco/excluido) em segundos acumulados.
-        É chamado em todo render desta aba; se 'viz_auto' estiver ativo, roda em loop com st.rerun().
-        """
-        now = time.time()
-        dt = max(0.0, now - st.session_state["last_accum"])
-        st.session_state["last_accum"] = now
-
-        jogado_key = "jogado_1t" if st.session_state["periodo"] == "1º Tempo" else "jogado_2t"
-
-        # Garante dicionários
-        if "stats" not in st.session_state:
-            st.session_state["stats"] = {"A": {}, "B": {}}
-
-        for eq in ["A", "B"]:
-            for j in st.session_state["equipes"].get(eq, []):
-                num = int(j["numero"])
-                s = _ensure_player_stats(eq, num)
-                estado = j.get("estado", "banco")
-
-                if estado == "jogando":
-                    s[jogado_key] += dt
-                elif estado == "banco":
-                    s["banco"] += dt
-                elif estado == "excluido":
-                    s["doismin"] += dt
-                # 'expulso' e inelegível: não acumula nada adicional
-
-    # --------- Cálculo de 2' transcorridos (apoiado nas penalidades registradas) ----------
-    def _doismin_por_jogador_agora(eq: str, numero: int, agora_elapsed: float) -> float:
-        """
-        Soma, em minutos, o tempo já cumprido em 2' para esse jogador até o instante atual lógico.
-        Usa st.session_state["penalties"][eq] com pares start/end.
-        """
-        total_sec = 0.0
-        for p in st.session_state.get("penalties", {}).get(eq, []):
-            if int(p["numero"]) != int(numero):
-                continue
-            a, b = float(p["start"]), float(p["end"])
-            cumprido = max(0.0, min(agora_elapsed, b) - a)
-            total_sec += cumprido
-        return total_sec / 60.0
-
     # --------- Monta DataFrame para exibição e exportação ----------
+    @perfil.cronometrado()
     def _stats_to_dataframe() -> pd.DataFrame:
-        rows = []
-        for eq in ["A", "B"]:
-            cor = st.session_state["cores"].get(eq, "#333")
-            for j in st.session_state["equipes"].get(eq, []):
-                num = int(j["numero"])
-                est = j.get("estado", "banco")
-                exc = j.get("exclusoes", 0)
-
-                s = st.session_state["stats"][eq].get(
-                    num, {"jogado_1t": 0.0, "jogado_2t": 0.0, "banco": 0.0, "doismin": 0.0}
-                )
+        """Relatório a partir da tabela de tempos mantida pela partida (sem laço por jogador)."""
+        agora_elapsed = tempo_partida()
+        return partida.tabela.quadro(
+            agora_elapsed,
+            lambda eq, num: _equipe_penalidades(eq).cumprido(num, agora_elapsed),
+            estado["cores"],
+        )
+
+    # --------- Exportação (chamadas só no clique de download) ----------
+    def _exportar_jogadores_csv() -> bytes:
+        with partida.leitura():
+            linhas = list(linhas_jogadores(partida, tempo_partida(), partida.id))
+        return b"".join(csv_em_blocos(linhas, COLUNAS_JOGADORES))
 
-                j1 = s["jogado_1t"] / 60.0
-                j2 = s["jogado_2t"] / 60.0
-                jog_total = j1 + j2
-                banco_min = s["banco"] / 60.0
-
-                agora_elapsed = tempo_logico_atual()
-                dois_min = round(_doismin_por_jogador_agora(eq, num, agora_elapsed), 1)
-
-                rows.append({
-                    "Equipe": eq,
-                    "Número": num,
-                    "Estado": est,
-                    "Exclusões": exc,
-                    "Jogado 1ºT (min)": round(j1, 1),
-                    "Jogado 2ºT (min)": round(j2, 1),
-                    "Jogado Total (min)": round(jog_total, 1),
-                    "Banco (min)": round(banco_min, 1),
-                    "2 min (min)": round(dois_min, 1),
-                    "CorEquipe": cor,
-                })
-
-        if not rows:
-            return pd.DataFrame()
-
-        df = pd.DataFrame(rows).sort_values(["Equipe", "Número"])
-        return df
+    def _exportar_eventos_csv() -> bytes:
+        with partida.leitura():
+            eventos = list(estado["eventos"])
+        return b"".join(csv_em_blocos(linhas_eventos(eventos, partida.id), COLUNAS_EVENTOS))
+
+    def _exportar_eventos_parquet() -> bytes:
+        with partida.leitura():
+            eventos = list(estado["eventos"])
+        buf = io.BytesIO()
+        escrever_parquet(linhas_eventos(eventos, partida.id), buf, COLUNAS_EVENTOS)
+        return buf.getvalue()
 
     # --------- UI da aba ----------
     st.subheader("Visualização de Dados")
@@ -708,9 +584,9 @@ with abas[3]:
     cauto1, cauto2 = st.columns([1, 1])
     with cauto1:
         st.session_state["viz_auto"] = st.toggle(
-            "Atualizar automaticamente (1s)",
+            "Atualizar automaticamente",
             value=st.session_state["viz_auto"],
-            help="Recalcula os tempos a cada segundo apenas nesta aba."
+            help="Atualiza só o relatório desta aba no intervalo escolhido, sem bloquear a mesa."
         )
     with cauto2:
         st.session_state["viz_interval"] = st.number_input(
@@ -719,48 +595,146 @@ with abas[3]:
             help="Intervalo da atualização automática desta aba."
         )
 
-    # Acumula o tick desta renderização
-    _accumulate_time_tick()
+    # Auto refresh por fragmento: o timer fica no navegador e só esta função
+    # reexecuta — nada de time.sleep segurando a sessão entre os cliques da mesa.
+    intervalo = float(st.session_state["viz_interval"]) if st.session_state["viz_auto"] else None
 
-    # Gera DF e apresenta
-    df = _stats_to_dataframe()
-    if df.empty:
-        st.info("Sem dados ainda. Cadastre equipes, defina titulares e inicie o controle do jogo.")
-    else:
-        # Por equipe
-        for eq in ["A", "B"]:
-            sub = df[df["Equipe"] == eq].copy()
-            if sub.empty:
-                continue
+    @st.fragment(run_every=intervalo)
+    def _relatorio():
+        with partida.leitura():
+            df = _stats_to_dataframe()
+        if df.empty:
+            st.info("Sem dados ainda. Cadastre equipes, defina titulares e inicie o controle do jogo.")
+        else:
+            # Por equipe
+            for eq, sub in df.groupby("Equipe", sort=False):
+                cor = sub["CorEquipe"].iloc[0]
+                st.markdown(
+                    f"<div style='background:{cor};color:#fff;padding:6px 10px;border-radius:8px;font-weight:700;margin-top:8px;'>{get_team_name(eq)}</div>",
+                    unsafe_allow_html=True
+                )
+                st.dataframe(sub.drop(columns=["CorEquipe"]), use_container_width=True)
+
+                # (Opcional) gráfico de barras do tempo jogado total
+                try:
+                    chart_df = sub[["Número", "Jogado Total (min)"]].set_index("Número")
+                    st.bar_chart(chart_df, use_container_width=True)
+                except Exception:
+                    pass
+
+            st.markdown("---")
+            st.markdown("#### Relatório combinado")
+            st.dataframe(df.drop(columns=["CorEquipe"]), use_container_width=True)
+
+            # Exportar: os arquivos só são gerados no clique (em outra thread),
+            # linha a linha a partir da tabela e da linha do tempo
+            d1, d2, d3 = st.columns(3)
+            d1.download_button(
+                "📥 Baixar CSV (todas as equipes)",
+                data=_exportar_jogadores_csv,
+                file_name="relatorio_tempos.csv",
+                mime="text/csv"
+            )
+            d2.download_button(
+                "📥 Linha do tempo (CSV)",
+                data=_exportar_eventos_csv,
+                file_name="linha_do_tempo.csv",
+                mime="text/csv"
+            )
+            d3.download_button(
+                "📥 Linha do tempo (Parquet)",
+                data=_exportar_eventos_parquet,
+                file_name="linha_do_tempo.parquet",
+                mime="application/octet-stream"
+            )
+
+    _relatorio()
 
-            cor = sub["CorEquipe"].iloc[0]
+    # --------- Formações (quem jogou junto, e por quanto tempo) ----------
+    if st.toggle("👥 Formações em quadra", key="viz_formacoes"):
+        with partida.leitura():
+            agora = tempo_partida()
+            indice = partida.escalacao()
+            formacoes = {eq: indice.formacoes(eq, 0.0, agora) for eq in ("A", "B")}
+        for eq, lista in formacoes.items():
+            if not lista:
+                continue
+            total = sum(s for _, s in lista)
+            st.markdown(f"**{get_team_name(eq)}** — {len(lista)} formações")
+            st.dataframe(pd.DataFrame({
+                "Em quadra": [" · ".join(map(str, f)) for f, _ in lista[:10]],
+                "Minutos": [round(s / 60, 1) for _, s in lista[:10]],
+                "% do jogo": [round(100 * s / total, 1) for _, s in lista[:10]],
+            }), use_container_width=True, hide_index=True)
+
+    # --------- Minutos por período (fatiados nas fronteiras registradas) ----------
+    if st.toggle("⏱️ Minutos por período", key="viz_periodos"):
+        with partida.leitura():
+            agora = tempo_partida()
+            tabela = partida.tabela
+            idx = tabela.ordem()
+            por_periodo = tabela.totais_por_periodo(agora)[idx] / 60.0
+            equipes, numeros = tabela.equipe[idx], tabela.numero[idx]
+            periodos = partida.periodos()
+        jogados = sorted({k for k, _ in periodos.segmentos})
+        for eq in ("A", "B"):
+            sel = equipes == eq
+            if not sel.any():
+                continue
             st.markdown(
-                f"<div style='background:{cor};color:#fff;padding:6px 10px;border-radius:8px;font-weight:700;margin-top:8px;'>{get_team_name(eq)}</div>",
-                unsafe_allow_html=True
+                f"**{get_team_name(eq)}** — tempos técnicos: {periodos.tecnicos_de(eq)}/{TECNICOS_POR_EQUIPE}"
             )
-            st.dataframe(sub.drop(columns=["CorEquipe"]), use_container_width=True)
-
-            # (Opcional) gráfico de barras do tempo jogado total
-            try:
-                chart_df = sub[["Número", "Jogado Total (min)"]].set_index("Número")
-                st.bar_chart(chart_df, use_container_width=True)
-            except Exception:
-                pass
+            st.dataframe(pd.DataFrame({
+                "Número": numeros[sel],
+                **{f"{PERIODOS[k]} (min)": por_periodo[sel, k].round(1) for k in jogados},
+                "Total (min)": por_periodo[sel].sum(axis=1).round(1),
+            }), use_container_width=True, hide_index=True)
+
+    # --------- Temporada (partidas arquivadas) ----------
+    st.markdown("---")
+    if st.toggle("📚 Temporada (partidas arquivadas)", key="viz_temporada"):
+        from utils import temporada
+        from utils.servidor import armazenamento
+
+        pasta = st.text_input("Pasta do arquivo", value="dados/temporada", key="temporada_pasta")
+        if st.button("Arquivar partidas gravadas", key="temporada_arquivar"):
+            armazenamento().flush()
+            temporada.arquivar(armazenamento(), pasta)
+        try:
+            indice = temporada.carregar_indice(pasta)
+        except FileNotFoundError:
+            st.info("Nenhum arquivo nesta pasta ainda. Use **Arquivar partidas gravadas**.")
+        else:
+            eq_temp = st.selectbox(
+                "Equipe", [None, *temporada.equipes(indice)], key="temporada_eq",
+                format_func=lambda x: "Todas" if x is None else x,
+            )
+            st.caption(f"{indice['Partida'].nunique()} partidas no arquivo")
+            st.dataframe(temporada.por_jogador(indice, eq_temp), use_container_width=True, hide_index=True)
+            st.markdown("#### Rotação por partida")
+            st.dataframe(temporada.por_partida(indice), use_container_width=True, hide_index=True)
 
-        st.markdown("---")
-        st.markdown("#### Relatório combinado")
-        st.dataframe(df.drop(columns=["CorEquipe"]), use_container_width=True)
-
-        # Exportar CSV
-        csv = df.drop(columns=["CorEquipe"]).to_csv(index=False).encode("utf-8")
-        st.download_button(
-            "📥 Baixar CSV (todas as equipes)",
-            data=csv,
-            file_name="relatorio_tempos.csv",
-            mime="text/csv"
-        )
 
-    # Auto refresh desta aba (sem travar as outras)
-    if st.session_state["viz_auto"]:
-        time.sleep(float(st.session_state["viz_interval"]))
-        st.rerun()
+# =====================================================
+# 🧭 Navegação — só a seção ativa executa
+# =====================================================
+SECOES = {
+    "Configuração da Equipe": secao_configuracao,
+    "Definir Titulares": secao_titulares,
+    "Controle do Jogo": secao_controle,
+    "Visualização de Dados": secao_visualizacao,
+}
+
+if st.query_params.get("nav") == "abas":
+    # Modo antigo (st.tabs): todas as seções rodam a cada rerun; mantido para comparação
+    for _aba, (_nome, _secao) in zip(st.tabs(list(SECOES)), SECOES.items()):
+        with _aba, perfil.medir(_nome):
+            _secao()
+else:
+    _nome_secao = st.radio(
+        "Seção", list(SECOES), horizontal=True, key="secao", label_visibility="collapsed",
+    )
+    with perfil.medir(_nome_secao):
+        SECOES[_nome_secao]()
+
+perfil.finalizar_rerun()
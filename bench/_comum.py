@@ -0,0 +1,42 @@
+"""
+Saída comum dos benchmarks: --saida grava o JSON num arquivo e --comparar
+acrescenta "razao_vs_base" (atual/base, > 1 = maior que a base) contra o
+JSON de uma execução anterior.
+"""
+import json
+
+
+def argumentos_saida(ap):
+    ap.add_argument("--saida", help="grava o JSON também neste arquivo")
+    ap.add_argument("--comparar", help="JSON de uma execução anterior (base)")
+
+
+def razoes(atual: dict, base: dict) -> dict:
+    """Razão atual/base de cada número presente nos dois dicts (aninhados ou não)."""
+    saida = {}
+    for k, v in atual.items():
+        b = base.get(k)
+        if isinstance(v, dict) and isinstance(b, dict):
+            sub = razoes(v, b)
+            if sub:
+                saida[k] = sub
+        elif isinstance(v, (int, float)) and isinstance(b, (int, float)) and b:
+            saida[k] = round(v / b, 3)
+    return saida
+
+
+def emitir(resultado: dict, args, medidas):
+    """
+    Imprime o resultado em JSON (e grava em --saida). Com --comparar, as
+    razões vêm de medidas(resultado) x medidas(base): 'medidas' escolhe os
+    números que o benchmark compara.
+    """
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as f:
+            resultado["razao_vs_base"] = razoes(medidas(resultado), medidas(json.load(f)))
+
+    texto = json.dumps(resultado, indent=2, ensure_ascii=False)
+    if args.saida:
+        with open(args.saida, "w", encoding="utf-8") as f:
+            f.write(texto + "\n")
+    print(texto)
@@ -0,0 +1,156 @@
+"""
+Tempo das funções quentes do motor sobre partidas sintéticas.
+
+Gera partidas com utils.simulador (elenco, taxas de substituição, 2' e
+correções retroativas configuráveis) e mede, por chamada:
+  tabela_aplicar       TabelaStats.aplicar por evento (antigo _accumulate_time_tick)
+  quadro               TabelaStats.quadro (o _stats_to_dataframe do relatório)
+  penalidades_ativas   FilaPenalidades.ativas (_penalidades_ativas)
+  doismin_cumprido     FilaPenalidades.cumprido (_doismin_por_jogador_agora)
+  aplicar_retro        substituição retroativa no motor (aplicar_retro)
+  exportar_csv         relatório -> CSV, como o botão de download
+
+A saída é JSON; com --saida grava em arquivo e com --comparar mostra a
+razão atual/base de cada medida contra um JSON anterior.
+
+Uso:  python bench/funcoes_quentes.py [--partidas 20] [--jogadores 20]
+          [--subs-por-min 1.4] [--pen-por-min 0.16] [--retros-por-min 0.1]
+          [--saida atual.json] [--comparar base.json]
+"""
+import argparse
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from bench._comum import argumentos_saida, emitir  # noqa: E402
+from utils.linha_tempo import TabelaStats  # noqa: E402
+from utils.simulador import TAXAS, simular_partida  # noqa: E402
+
+CORES = {"A": "#00AEEF", "B": "#EC008C"}
+
+
+def _resumo(tempos_ns):
+    tempos = sorted(tempos_ns)
+    return {
+        "n": len(tempos),
+        "media_us": round(statistics.mean(tempos) / 1000, 3),
+        "mediana_us": round(statistics.median(tempos) / 1000, 3),
+        "p95_us": round(tempos[int(0.95 * (len(tempos) - 1))] / 1000, 3),
+    }
+
+
+def _cronometrar(fn, args_lista):
+    tempos = []
+    for args in args_lista:
+        t0 = time.perf_counter_ns()
+        fn(*args)
+        tempos.append(time.perf_counter_ns() - t0)
+    return tempos
+
+
+def _cumprido(motor, agora: float):
+    return lambda eq, n: motor.penalidades(eq).cumprido(n, agora)
+
+
+def medir(motores, rng: random.Random, amostras: int):
+    tempos = {k: [] for k in (
+        "tabela_aplicar", "quadro", "penalidades_ativas",
+        "doismin_cumprido", "aplicar_retro", "exportar_csv",
+    )}
+    for motor in motores:
+        eventos = motor.estado["eventos"]
+        fim = eventos[-1]["t"]
+        instantes = [rng.uniform(0.0, fim) for _ in range(amostras)]
+
+        tabela = TabelaStats()
+        tempos["tabela_aplicar"] += _cronometrar(tabela.aplicar, [(ev,) for ev in eventos])
+
+        tempos["quadro"] += _cronometrar(
+            motor.tabela.quadro, [(fim, _cumprido(motor, fim), CORES)] * amostras,
+        )
+        for eq in ("A", "B"):
+            fila = motor.penalidades(eq)
+            tempos["penalidades_ativas"] += _cronometrar(fila.ativas, [(t,) for t in instantes])
+            numeros = motor.elenco(eq).numeros()
+            tempos["doismin_cumprido"] += _cronometrar(
+                fila.cumprido, [(rng.choice(numeros), t) for t in instantes],
+            )
+
+        df = motor.tabela.quadro(fim, _cumprido(motor, fim), CORES)
+        tempos["exportar_csv"] += _cronometrar(
+            lambda: df.drop(columns=["CorEquipe"]).to_csv(index=False).encode("utf-8"), [()] * amostras,
+        )
+
+        # por último: cada retro muda a partida
+        retros = []
+        for _ in range(max(1, amostras // 10)):
+            eq = rng.choice(("A", "B"))
+            sai, entra = rng.sample(motor.elenco(eq).numeros(), 2)
+            retros.append((rng.uniform(0.0, fim), eq, sai, entra))
+        tempos["aplicar_retro"] += _cronometrar(
+            lambda t, eq, sai, entra: motor.aplicar(
+                "substituicao", t, equipe=eq, sai=sai, entra=entra, retro=True,
+            ),
+            retros,
+        )
+    return {k: _resumo(v) for k, v in tempos.items()}
+
+
+def _versao():
+    try:
+        return subprocess.run(
+            ["git", "-C", RAIZ, "describe", "--always", "--dirty"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def medias(resultado: dict):
+    """Números comparados com --comparar: a média de cada função (> 1 = mais lento que a base)."""
+    return {k: v.get("media_us") for k, v in resultado.get("medidas", {}).items()}
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--partidas", type=int, default=20)
+    ap.add_argument("--jogadores", type=int, default=14, choices=range(2, 21), metavar="2..20")
+    ap.add_argument("--subs-por-min", type=float, default=TAXAS["substituicao"])
+    ap.add_argument("--pen-por-min", type=float, default=TAXAS["exclusao"])
+    ap.add_argument("--retros-por-min", type=float, default=0.1)
+    ap.add_argument("--amostras", type=int, default=200, help="chamadas por função e partida")
+    ap.add_argument("--seed", type=int, default=0)
+    argumentos_saida(ap)
+    args = ap.parse_args()
+
+    taxas = {
+        "substituicao": args.subs_por_min,
+        "exclusao": args.pen_por_min,
+        "retro": args.retros_por_min,
+    }
+    motores = [
+        simular_partida(args.seed + i, jogadores=args.jogadores, taxas=taxas)
+        for i in range(args.partidas)
+    ]
+    resultado = {
+        "versao": _versao(),
+        "python": platform.python_version(),
+        "parametros": {
+            "partidas": args.partidas, "jogadores": args.jogadores, "amostras": args.amostras,
+            "seed": args.seed, "taxas_por_min": taxas,
+            "eventos_por_partida": round(statistics.mean(len(m.estado["eventos"]) for m in motores), 1),
+        },
+        "medidas": medir(motores, random.Random(args.seed), args.amostras),
+    }
+    emitir(resultado, args, medias)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Latência de rerun do app: st.tabs (todas as seções executam) x navegação
+preguiçosa (só a seção ativa executa).
+
+Monta uma partida com dois elencos de 20 jogadores e algumas penalidades
+num banco temporário, abre o app com streamlit.testing (AppTest) e mede o
+tempo de cada rerun disparado por um clique de mesa (substituição).
+
+Uso:  python bench/latencia_rerun.py [--reruns 30]
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from utils.persistencia import ArmazenamentoSQLite  # noqa: E402
+
+PARTIDA = "bench_rerun"
+
+
+def popular_banco(caminho: str):
+    arm = ArmazenamentoSQLite(caminho)
+    numeros = list(range(1, 21))
+    eventos = [
+        {"t": 0.0, "tipo": "elenco", "equipe": "A", "numeros": numeros, "nome": "A"},
+        {"t": 0.0, "tipo": "elenco", "equipe": "B", "numeros": numeros, "nome": "B"},
+        {"t": 0.0, "tipo": "titulares", "equipe": "A", "numeros": numeros[:7]},
+        {"t": 0.0, "tipo": "titulares", "equipe": "B", "numeros": numeros[:7]},
+        {"t": 30.0, "tipo": "exclusao", "equipe": "A", "numero": 3},
+        {"t": 60.0, "tipo": "exclusao", "equipe": "B", "numero": 5},
+    ]
+    for ev in eventos:
+        arm.registrar(PARTIDA, ev)
+    arm.fechar()
+
+
+def medir(nav: str | None, reruns: int):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(os.path.join(RAIZ, "app.py"), default_timeout=30)
+    at.query_params["partida"] = PARTIDA
+    if nav:
+        at.query_params["nav"] = nav
+    else:
+        at.session_state["secao"] = "Controle do Jogo"
+    at.run()
+
+    tempos = []
+    for _ in range(reruns):
+        sai, entra = at.selectbox(key="sai_A"), at.selectbox(key="entra_A")
+        sai.set_value(int(sai.options[0]))
+        entra.set_value(int(entra.options[0]))
+        t0 = time.perf_counter()
+        at.button(key="btn_sub_A").click().run()
+        tempos.append(time.perf_counter() - t0)
+        at.run()  # rerun sem clique: atualiza as listas de Sai/Entra para a próxima rodada
+    return {
+        "reruns": reruns,
+        "media_ms": round(statistics.mean(tempos) * 1000, 2),
+        "mediana_ms": round(statistics.median(tempos) * 1000, 2),
+        "p95_ms": round(sorted(tempos)[int(0.95 * (len(tempos) - 1))] * 1000, 2),
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--reruns", type=int, default=30)
+    args = ap.parse_args()
+
+    pasta = tempfile.mkdtemp(prefix="bench_rerun_")
+    os.chdir(pasta)  # o app grava em dados/partidas.db relativo ao cwd
+    popular_banco(os.path.join(pasta, "dados", "partidas.db"))
+
+    resultado = {
+        "antes_tabs": medir("abas", args.reruns),
+        "depois_secao_ativa": medir(None, args.reruns),
+    }
+    print(json.dumps(resultado, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
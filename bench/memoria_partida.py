@@ -0,0 +1,138 @@
+"""
+Memória por partida: layout antigo em dicts x motor compacto atual.
+
+Simula partidas com utils.simulador e mede com tracemalloc (bytes retidos):
+  estado_dicts     o layout antigo — equipes[eq][numero] = {"estado", "elegivel",
+                   "exclusoes"}, stats[eq][numero] = {4 floats}, penalties[eq] =
+                   [{"numero", "start", "end", "consumido"}] (uma cópia por sessão)
+  estado_compacto  o mesmo estado hoje — Elenco de Jogador (__slots__),
+                   FilaPenalidades de Penalidade (__slots__), TabelaStats em arrays
+                   (uma cópia por partida, compartilhada pelas sessões)
+  historico        pontos de restauração da tabela + pilha de desfazer
+  eventos          a linha do tempo (comum aos dois layouts)
+  motor            MotorPartida inteiro (estado_compacto + historico + eventos)
+e o instantâneo compacto (utils.instantaneo): tamanho em bytes e tempo de
+serializar/restaurar contra reaplicar todos os eventos (medidos sem o
+tracemalloc ligado).
+
+Uso:  python bench/memoria_partida.py [--partidas 20] [--jogadores 16]
+          [--saida atual.json] [--comparar base.json]
+"""
+import argparse
+import copy
+import gc
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from bench._comum import argumentos_saida, emitir  # noqa: E402
+from utils.instantaneo import restaurar, serializar  # noqa: E402
+from utils.motor import MotorPartida  # noqa: E402
+from utils.simulador import simular_partida  # noqa: E402
+
+
+def _retido(construir):
+    """(objeto, bytes alocados e ainda vivos após construir())."""
+    gc.collect()
+    antes = tracemalloc.get_traced_memory()[0]
+    obj = construir()
+    gc.collect()
+    return obj, tracemalloc.get_traced_memory()[0] - antes
+
+
+def layout_dicts(motor, agora: float) -> dict:
+    """O mesmo estado no layout antigo (dicts por jogador/penalidade)."""
+    tempos = motor.tempos(agora)
+    return {
+        "equipes": {
+            eq: {j.numero: {"estado": j.estado, "elegivel": j.elegivel, "exclusoes": j.exclusoes}
+                 for j in motor.elenco(eq)}
+            for eq in ("A", "B")
+        },
+        "stats": {eq: {n: dict(c) for n, c in tempos.get(eq, {}).items()} for eq in ("A", "B")},
+        "penalties": {
+            eq: [{"numero": p.numero, "start": p.start, "end": p.end, "consumido": p.consumido}
+                 for p in motor.penalidades(eq)]
+            for eq in ("A", "B")
+        },
+    }
+
+
+def estado_compacto(motor):
+    """Cópia de elencos, filas e tabela (sem os pontos de restauração)."""
+    tabela = copy.copy(motor.tabela)
+    tabela._checkpoints = []
+    return copy.deepcopy((motor.estado["equipes"], motor.estado["penalties"], tabela))
+
+
+def _ms(fn, repeticoes: int = 5):
+    tempos = []
+    for _ in range(repeticoes):
+        t0 = time.perf_counter()
+        fn()
+        tempos.append(time.perf_counter() - t0)
+    return statistics.median(tempos) * 1000
+
+
+def medir(partidas: int, jogadores: int, taxas: dict):
+    amostras = []
+    for seed in range(partidas):
+        tracemalloc.start()
+        motor, b_motor = _retido(lambda: simular_partida(seed, jogadores=jogadores, taxas=taxas))
+        eventos = motor.estado["eventos"]
+        agora = eventos[-1]["t"]
+        _, b_dicts = _retido(lambda: layout_dicts(motor, agora))
+        _, b_compacto = _retido(lambda: estado_compacto(motor))
+        _, b_eventos = _retido(lambda: copy.deepcopy(eventos))
+        tracemalloc.stop()
+        dados = serializar(motor)
+        amostras.append({
+            "eventos_n": len(eventos),
+            "estado_dicts": b_dicts, "estado_compacto": b_compacto,
+            "historico": b_motor - b_compacto - b_eventos, "eventos": b_eventos, "motor": b_motor,
+            "instantaneo": len(dados),
+            "serializar_ms": _ms(lambda: serializar(motor)),
+            "restaurar_ms": _ms(lambda: restaurar(dados, MotorPartida())),
+            "reproduzir_ms": _ms(lambda: MotorPartida().reproduzir(eventos)),
+        })
+
+    def med(chave, casas=1):
+        return round(statistics.median(a[chave] for a in amostras), casas)
+
+    return {
+        "eventos_por_partida": med("eventos_n"),
+        "bytes_por_partida": {
+            k: med(k, 0)
+            for k in ("estado_dicts", "estado_compacto", "historico", "eventos", "motor", "instantaneo")
+        },
+        "ms": {k: med(k, 3) for k in ("serializar_ms", "restaurar_ms", "reproduzir_ms")},
+    }
+
+
+def medidas(resultado: dict):
+    """Números comparados com --comparar: bytes e tempos por partida."""
+    return {**resultado.get("bytes_por_partida", {}), **resultado.get("ms", {})}
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--partidas", type=int, default=20)
+    ap.add_argument("--jogadores", type=int, default=16)
+    ap.add_argument("--retros-por-min", type=float, default=0.1)
+    argumentos_saida(ap)
+    args = ap.parse_args()
+
+    resultado = {
+        "parametros": {"partidas": args.partidas, "jogadores": args.jogadores, "retros_por_min": args.retros_por_min},
+        **medir(args.partidas, args.jogadores, {"retro": args.retros_por_min}),
+    }
+    emitir(resultado, args, medidas)
+
+
+if __name__ == "__main__":
+    main()
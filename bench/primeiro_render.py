@@ -0,0 +1,116 @@
+"""
+Tempo até o primeiro render de uma sessão nova de operador (mesa).
+
+Cada repetição roda num interpretador novo (imports a frio): abre o app
+com streamlit.testing (AppTest) na seção "Controle do Jogo" sobre uma
+partida de dois elencos de 20 jogadores e mede
+  frio_ms     do início do processo até o fim do 1º rerun (imports inclusos)
+  rerun_ms    só o 1º rerun do script
+  quente_ms   1º rerun de uma 2ª sessão no mesmo processo (recursos em cache)
+e quais bibliotecas pesadas ficaram carregadas depois do 1º render.
+Compara o modo antigo (?nav=abas: todas as seções executam, inclusive a
+de dados) com a navegação por seção.
+
+Uso:  python bench/primeiro_render.py [--repeticoes 5] [--saida atual.json]
+          [--comparar base.json]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+T0 = time.perf_counter()
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from bench._comum import argumentos_saida, emitir  # noqa: E402
+
+PARTIDA = "bench_render"
+PESADAS = ("pandas", "pyarrow", "plotly", "numpy")
+
+
+def popular_banco(caminho: str):
+    from utils.persistencia import ArmazenamentoSQLite
+
+    arm = ArmazenamentoSQLite(caminho)
+    numeros = list(range(1, 21))
+    for eq in ("A", "B"):
+        arm.registrar(PARTIDA, {"t": 0.0, "tipo": "elenco", "equipe": eq, "numeros": numeros, "nome": eq})
+        arm.registrar(PARTIDA, {"t": 0.0, "tipo": "titulares", "equipe": eq, "numeros": numeros[:7]})
+    arm.fechar()
+
+
+def _sessao(nav: str | None):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(os.path.join(RAIZ, "app.py"), default_timeout=60)
+    at.query_params["partida"] = PARTIDA
+    if nav:
+        at.query_params["nav"] = nav
+    else:
+        at.session_state["secao"] = "Controle do Jogo"
+    t0 = time.perf_counter()
+    at.run()
+    return time.perf_counter() - t0
+
+
+def filho(nav: str | None):
+    """Uma medida, num processo novo (chamado por main via subprocess)."""
+    rerun = _sessao(nav)
+    frio = time.perf_counter() - T0
+    carregadas = [m for m in PESADAS if m in sys.modules]
+    quente = _sessao(nav)
+    print(json.dumps({"frio": frio, "rerun": rerun, "quente": quente, "carregadas": carregadas}))
+
+
+def medir(nav: str | None, repeticoes: int, pasta: str):
+    amostras = []
+    for _ in range(repeticoes):
+        cmd = [sys.executable, os.path.abspath(__file__), "--filho", nav or "secao"]
+        saida = subprocess.run(cmd, cwd=pasta, capture_output=True, text=True, check=True).stdout
+        amostras.append(json.loads(saida.strip().splitlines()[-1]))
+    return {
+        "frio_ms": round(statistics.median(a["frio"] for a in amostras) * 1000, 1),
+        "rerun_ms": round(statistics.median(a["rerun"] for a in amostras) * 1000, 1),
+        "quente_ms": round(statistics.median(a["quente"] for a in amostras) * 1000, 1),
+        "carregadas": amostras[-1]["carregadas"],
+    }
+
+
+def medianas(resultado: dict):
+    """Números comparados com --comparar: as medianas de cada modo."""
+    return {
+        modo: {k: m.get(k) for k in ("frio_ms", "rerun_ms", "quente_ms")}
+        for modo, m in resultado.get("modos", {}).items()
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--repeticoes", type=int, default=5)
+    argumentos_saida(ap)
+    ap.add_argument("--filho", help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.filho:
+        filho(None if args.filho == "secao" else args.filho)
+        return
+
+    pasta = tempfile.mkdtemp(prefix="bench_render_")
+    popular_banco(os.path.join(pasta, "dados", "partidas.db"))  # o app usa dados/partidas.db do cwd
+    resultado = {
+        "repeticoes": args.repeticoes,
+        "modos": {
+            "abas": medir("abas", args.repeticoes, pasta),
+            "secao_ativa": medir(None, args.repeticoes, pasta),
+        },
+    }
+    emitir(resultado, args, medianas)
+
+
+if __name__ == "__main__":
+    main()
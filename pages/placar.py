@@ -0,0 +1,14 @@
+# pages/placar.py — placar somente leitura para telas do público
+import streamlit as st
+from utils.relogio import placar_publico
+from utils.servidor import PORTA_PLACAR, central_placar, partida_atual, partida_id
+
+# Esta página roda o script uma única vez: relógio, chips e contagens de 2'
+# são atualizados no navegador pelos diffs empurrados pelo servidor SSE.
+st.set_page_config(page_title="Placar", layout="wide")
+
+partida_atual()  # abre a partida como a mesa; o servidor SSE só serve partidas abertas
+canal = central_placar().canal(partida_id())
+_, placar = canal.atual()
+placar_publico(partida_id(), placar, PORTA_PLACAR)
+st.caption(f"Partida: {partida_id()} — abra com ?partida=<id> para outra quadra.")
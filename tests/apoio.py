@@ -0,0 +1,48 @@
+"""
+Apoio aos testes do motor: partidas simuladas (utils.simulador) comparadas
+com o que reaplicar a linha do tempo do zero dá.
+"""
+import numpy as np
+
+from utils.motor import MotorPartida
+
+SEMENTES = range(8)
+TAXAS = {"retro": 0.1, "tempo_tecnico": 0.1}
+
+
+def resumo(motor, agora: float):
+    """Estado observável do motor (elencos, 2', relógio, períodos, linha do tempo e tempos)."""
+    estado = motor.estado
+    return {
+        "elencos": {
+            eq: [(j.numero, j.estado, j.elegivel, j.exclusoes) for j in motor.elenco(eq)] for eq in ("A", "B")
+        },
+        "penalidades": {
+            eq: [(p.numero, p.start, p.end, p.consumido) for p in motor.penalidades(eq)] for eq in ("A", "B")
+        },
+        "relogio": {k: estado[k] for k in ("iniciado", "cronometro", "tempo_base", "periodo")},
+        "periodos": motor.periodos().como_dict(),
+        "eventos": [dict(ev) for ev in estado["eventos"]],
+        "tempos": np.round(motor.tabela.totais(agora), 6).tolist(),
+        "por_periodo": np.round(motor.tabela.totais_por_periodo(agora), 6).tolist(),
+    }
+
+
+def reproduzido(eventos):
+    """Motor novo com os eventos reaplicados do zero."""
+    motor = MotorPartida()
+    motor.reproduzir([dict(ev) for ev in eventos])
+    return motor
+
+
+def agora_final(motor):
+    eventos = motor.estado["eventos"]
+    return eventos[-1]["t"] if eventos else 0.0
+
+
+def copiar_para(motor, eventos):
+    """Aplica (validando) os eventos de outra partida, na ordem do log, em 'motor'."""
+    for ev in eventos:
+        dados = {k: v for k, v in ev.items() if k not in ("t", "tipo")}
+        motor.aplicar(ev["tipo"], ev["t"], **dados)
+    return motor
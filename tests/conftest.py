@@ -0,0 +1,5 @@
+import os
+import sys
+
+# os testes importam utils.* a partir da raiz do repositório (como os scripts de bench/)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
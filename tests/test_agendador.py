@@ -0,0 +1,64 @@
+"""Fim dos 2' no servidor (utils.agendador): disparo, pausa do relógio e desfazer."""
+import threading
+import time
+
+from utils import tempo
+from utils.agendador import AgendadorPenalidades
+from utils.partidas import Partida
+from utils.penalidades import FilaPenalidades, id_penalidade
+
+DURACAO = 0.3  # 2' encurtado para o teste (segundos reais)
+
+
+def _partida(agendador):
+    partida = Partida("teste")
+    partida.estado["penalties"]["A"] = FilaPenalidades(DURACAO)
+    partida.aplicar("elenco", 0.0, equipe="A", numeros=[1, 2, 3])
+    partida.aplicar("titulares", 0.0, equipe="A", numeros=[1, 2])
+    partida.aplicar("inicio", 0.0, epoch=tempo.agora())
+    agendador.acompanhar(partida)
+    return partida
+
+
+def _excluir(partida):
+    partida.aplicar("exclusao", equipe="A", numero=1)
+    return id_penalidade("A", partida.penalidades("A").ativas(partida.tempo_partida())[0])
+
+
+def _esperar(condicao, limite: float = 3.0) -> bool:
+    fim = time.monotonic() + limite
+    while time.monotonic() < fim:
+        if condicao():
+            return True
+        time.sleep(0.01)
+    return condicao()
+
+
+def test_fim_do_2min_marca_e_notifica():
+    partida = _partida(AgendadorPenalidades())
+    avisos, avisou = [], threading.Event()
+    partida.assinar(lambda _, ev: ev["tipo"] == "expirou" and (avisos.append(ev), avisou.set()))
+    pid = _excluir(partida)
+    versao = partida.versao
+    assert avisou.wait(3.0)
+    assert list(partida.expiradas) == [pid]
+    assert partida.versao == versao + 1
+    assert avisos[0]["equipe"] == "A" and avisos[0]["numero"] == 1
+
+
+def test_relogio_parado_segura_o_2min():
+    partida = _partida(AgendadorPenalidades())
+    pid = _excluir(partida)
+    partida.aplicar("pausa", epoch=tempo.agora())
+    time.sleep(3 * DURACAO)
+    assert pid not in partida.expiradas
+    partida.aplicar("inicio", epoch=tempo.agora())
+    assert _esperar(lambda: pid in partida.expiradas)
+
+
+def test_2min_desfeito_nao_expira():
+    partida = _partida(AgendadorPenalidades())
+    pid = _excluir(partida)
+    assert partida.desfazer()["tipo"] == "exclusao"
+    time.sleep(3 * DURACAO)
+    assert pid not in partida.expiradas
@@ -0,0 +1,61 @@
+"""
+Mesa (app.py) pelo streamlit.testing: cada teste abre uma partida própria
+numa pasta temporária (o app grava em dados/partidas.db do diretório atual).
+"""
+import os
+
+import pytest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def mesa(tmp_path, monkeypatch, request):
+    from streamlit.testing.v1 import AppTest
+
+    monkeypatch.chdir(tmp_path)
+    at = AppTest.from_file(os.path.join(RAIZ, "app.py"), default_timeout=60)
+    at.query_params["partida"] = f"teste_{request.node.name}"
+    at.run()
+    return at
+
+
+def _ir(at, secao):
+    at.session_state["secao"] = secao
+    at.run()
+    assert not at.exception
+
+
+def _preparar(at, jogadores: int):
+    _ir(at, "Configuração da Equipe")
+    at.number_input(key="qtd_A").set_value(jogadores).run()
+    at.button(key="save_team_A").click().run()
+    _ir(at, "Definir Titulares")
+    at.multiselect(key="titulares_sel_A").set_value([1, 2, 3, 4, 5, 6, 7]).run()
+    at.button(key="registrar_tit_A").click().run()
+    _ir(at, "Controle do Jogo")
+
+
+def test_desfazer_informa_a_acao_do_clique(mesa):
+    # os botões da mesa só reexecutam o próprio fragmento: o aviso vem do callback
+    _preparar(mesa, 10)
+    assert mesa.button(key="clk_fim_periodo").disabled  # período ainda não começou
+    mesa.button(key="clk_toggle").click().run()
+    mesa.button(key="btn_sub_A").click().run()
+    mesa.button(key="btn_exp_A").click().run()
+    mesa.button(key="btn_desfazer").click().run()
+    assert [t.value for t in mesa.toast] == ["Desfeito: expulsão Equipe A #1"]
+    mesa.button(key="btn_refazer").click().run()
+    assert [t.value for t in mesa.toast] == ["Refeito: expulsão Equipe A #1"]
+    mesa.button(key="btn_refazer").click().run()
+    assert [t.value for t in mesa.toast] == ["Nada para refazer."]
+    assert not mesa.exception
+
+
+def test_retorno_sem_selecao_mostra_a_regra(mesa):
+    # sem banco, a caixa de retorno começa vazia e fica em None quando o 2' a preenche
+    _preparar(mesa, 7)
+    mesa.button(key="btn_2min_A").click().run()
+    mesa.button(key="btn_comp_A").click().run()
+    assert not mesa.exception
+    assert [e.value for e in mesa.error] == ["Ainda não há exclusões concluídas (2' completos). Aguarde."]
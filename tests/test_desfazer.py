@@ -0,0 +1,50 @@
+"""Desfazer/refazer das ações da mesa (utils.motor) sobre partidas simuladas."""
+import pytest
+
+from apoio import SEMENTES, TAXAS, agora_final, reproduzido, resumo
+from utils.linha_tempo import PASSO_CHECKPOINT
+from utils.simulador import simular_partida
+
+
+@pytest.mark.parametrize("seed", SEMENTES)
+def test_desfazer_igual_a_reproduzir_o_prefixo(seed):
+    motor = simular_partida(seed, taxas=TAXAS)
+    agora = agora_final(motor)
+    passos = 0
+    while motor.desfazer() is not None:
+        passos += 1
+        if passos % 7 == 0:
+            assert resumo(motor, agora) == resumo(reproduzido(motor.estado["eventos"]), agora)
+    assert passos
+    assert resumo(motor, agora) == resumo(reproduzido(motor.estado["eventos"]), agora)
+
+
+@pytest.mark.parametrize("seed", SEMENTES)
+def test_refazer_volta_ao_estado_anterior(seed):
+    motor = simular_partida(seed, taxas=TAXAS)
+    agora = agora_final(motor)
+    antes = resumo(motor, agora)
+    desfeitos = 0
+    while desfeitos < 25 and motor.desfazer() is not None:
+        desfeitos += 1
+    for _ in range(desfeitos):
+        assert motor.refazer() is not None
+    assert resumo(motor, agora) == antes
+
+
+def test_ciclos_de_desfazer_nao_acumulam_memoria():
+    # cada desfazer refaz a tabela do ponto de restauração anterior: o número de
+    # pontos tem de continuar o de uma partida sem desfazer
+    motor = simular_partida(0)
+    tabela = motor.tabela
+    for _ in range(300):
+        assert motor.desfazer() is not None
+        assert motor.refazer() is not None
+    assert len(tabela._checkpoints) == len(range(0, tabela.aplicados, PASSO_CHECKPOINT))
+
+
+def test_acao_nova_descarta_o_refazer():
+    motor = simular_partida(0)
+    assert motor.desfazer()["tipo"] == "fim_periodo"  # o relógio volta a rodar
+    motor.aplicar("pausa", agora_final(motor), epoch=0.0)
+    assert motor.refazer() is None
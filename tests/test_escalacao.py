@@ -0,0 +1,50 @@
+"""Índice de escalação (utils.escalacao) mantido pelo motor evento a evento."""
+import pytest
+
+from utils.escalacao import IndiceEscalacao
+from utils.motor import MotorPartida
+from utils.partidas import Partida
+from utils.simulador import simular_partida
+
+
+def _conteudo(indice: IndiceEscalacao):
+    return indice._tempos, indice._estados, indice._inicios, indice._fins
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_indice_incremental_igual_ao_montado_do_log(seed):
+    eventos = simular_partida(seed).estado["eventos"]
+    motor = MotorPartida()
+    indice = motor.escalacao()
+    for i, ev in enumerate(eventos):
+        dados = {k: v for k, v in ev.items() if k not in ("t", "tipo")}
+        motor.aplicar(ev["tipo"], ev["t"], **dados)
+        if i % 40 == 39:
+            # desfazer mexe no passado: o índice é montado de novo na próxima consulta
+            assert motor.desfazer() is not None
+            assert motor.refazer() is not None
+            indice = motor.escalacao()
+        assert motor.escalacao() is indice  # eventos no fim do log não remontam o índice
+        if i % 10 == 0:
+            assert _conteudo(indice) == _conteudo(IndiceEscalacao(motor.estado["eventos"]))
+    assert _conteudo(motor.escalacao()) == _conteudo(IndiceEscalacao(motor.estado["eventos"]))
+
+
+def test_retroativa_refaz_o_indice():
+    motor = simular_partida(0)
+    antes = motor.escalacao()
+    sai, entra = motor.elenco("A").numeros()[:2]
+    motor.aplicar("substituicao", 100.0, equipe="A", sai=sai, entra=entra, retro=True)
+    depois = motor.escalacao()
+    assert depois is not antes
+    assert _conteudo(depois) == _conteudo(IndiceEscalacao(motor.estado["eventos"]))
+
+
+def test_fim_de_2min_nao_refaz_o_indice():
+    partida = Partida("teste")
+    partida.aplicar("elenco", 0.0, equipe="A", numeros=[1, 2, 3])
+    partida.aplicar("titulares", 0.0, equipe="A", numeros=[1, 2])
+    partida.aplicar("exclusao", 0.0, equipe="A", numero=1)
+    indice = partida.escalacao()
+    partida.marcar_expirada("A", partida.penalidades("A").ativas(0.0)[0])
+    assert partida.escalacao() is indice
@@ -0,0 +1,59 @@
+"""Instantâneos compactos da partida (utils.instantaneo) e a restauração por instantâneo + cauda."""
+import pytest
+
+from apoio import SEMENTES, TAXAS, agora_final, copiar_para, reproduzido, resumo
+from utils import instantaneo, partidas
+from utils.instantaneo import restaurar, serializar
+from utils.motor import MotorPartida
+from utils.partidas import Partida
+from utils.persistencia import ArmazenamentoSQLite
+from utils.simulador import simular_partida
+
+
+@pytest.mark.parametrize("seed", SEMENTES)
+def test_instantaneo_igual_a_reproduzir(seed):
+    motor = simular_partida(seed, taxas=TAXAS)
+    agora = agora_final(motor)
+    restaurado = restaurar(serializar(motor), MotorPartida())
+    assert resumo(restaurado, agora) == resumo(reproduzido(motor.estado["eventos"]), agora)
+    # a primeira correção retroativa depois de restaurar refaz a tabela sem pontos de restauração
+    eq = "A"
+    sai, entra = restaurado.elenco(eq).numeros()[:2]
+    for m in (restaurado, motor):
+        m.aplicar("substituicao", agora / 3, equipe=eq, sai=sai, entra=entra, retro=True)
+    assert resumo(restaurado, agora) == resumo(motor, agora)
+
+
+@pytest.fixture
+def gravada(tmp_path, monkeypatch):
+    monkeypatch.setattr(partidas, "INSTANTANEO_CADA", 50)
+    caminho = str(tmp_path / "partidas.db")
+    arm = ArmazenamentoSQLite(caminho)
+    partida = copiar_para(Partida("quadra1", arm), simular_partida(0).estado["eventos"])
+    arm.flush()
+    return caminho, partida
+
+
+def test_reabrir_aplica_so_a_cauda_do_instantaneo(gravada):
+    caminho, partida = gravada
+    reaberta = Partida("quadra1", ArmazenamentoSQLite(caminho))
+    assert reaberta.restaurar() == len(partida.estado["eventos"]) % 50
+    agora = agora_final(partida)
+    assert resumo(reaberta, agora) == resumo(partida, agora)
+    # segue gravando depois do instantâneo: a próxima reabertura enxerga a ação nova
+    eq = "A"
+    sai, entra = reaberta.elenco(eq).numeros()[:2]
+    reaberta.aplicar("substituicao", agora / 2, equipe=eq, sai=sai, entra=entra, retro=True)
+    reaberta.armazenamento.flush()
+    de_novo = Partida("quadra1", ArmazenamentoSQLite(caminho))
+    de_novo.restaurar()
+    assert resumo(de_novo, agora) == resumo(reaberta, agora)
+
+
+def test_instantaneo_de_outra_versao_reaplica_o_log(gravada, monkeypatch):
+    caminho, partida = gravada
+    monkeypatch.setattr(instantaneo, "VERSAO", instantaneo.VERSAO + 1)
+    reaberta = Partida("quadra1", ArmazenamentoSQLite(caminho))
+    assert reaberta.restaurar() == len(partida.estado["eventos"])
+    agora = agora_final(partida)
+    assert resumo(reaberta, agora) == resumo(partida, agora)
@@ -0,0 +1,22 @@
+"""Pontos de restauração da TabelaStats (utils.linha_tempo) nas correções retroativas."""
+import random
+
+import numpy as np
+
+from utils.linha_tempo import PASSO_CHECKPOINT, TabelaStats
+from utils.simulador import simular_partida
+
+
+def test_correcoes_retroativas_nao_duplicam_pontos_de_restauracao():
+    motor = simular_partida(0)
+    tabela = motor.tabela
+    fim = motor.estado["eventos"][-1]["t"]
+    rng = random.Random(0)
+    for _ in range(100):
+        eq = rng.choice(("A", "B"))
+        sai, entra = rng.sample(motor.elenco(eq).numeros(), 2)
+        motor.aplicar("substituicao", rng.uniform(0.0, fim), equipe=eq, sai=sai, entra=entra, retro=True)
+    pontos = [a for a, _ in tabela._checkpoints]
+    assert pontos == list(range(0, tabela.aplicados, PASSO_CHECKPOINT))
+    do_zero = TabelaStats.a_partir_de(motor.estado["eventos"])
+    np.testing.assert_allclose(tabela.totais(fim), do_zero.totais(fim))
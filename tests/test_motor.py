@@ -0,0 +1,46 @@
+"""
+Invariantes do motor sobre partidas simuladas (utils.simulador): a tabela
+mantida evento a evento tem de dar exatamente o que reaplicar a linha do
+tempo do zero dá; e ações sem seleção são recusadas.
+"""
+import numpy as np
+import pytest
+
+from apoio import SEMENTES, TAXAS, agora_final, reproduzido, resumo
+from utils.acoes import AcaoInvalida
+from utils.linha_tempo import TabelaStats
+from utils.motor import MotorPartida
+from utils.simulador import simular_partida
+
+
+@pytest.mark.parametrize("seed", SEMENTES)
+def test_tabela_incremental_igual_a_reproduzir(seed):
+    # inclui as retroativas, que refazem a tabela a partir do ponto de restauração
+    motor = simular_partida(seed, taxas=TAXAS)
+    eventos = motor.estado["eventos"]
+    agora = agora_final(motor)
+    do_zero = TabelaStats.a_partir_de(eventos)
+    assert do_zero.n == motor.tabela.n
+    np.testing.assert_allclose(motor.tabela.acum[:do_zero.n], do_zero.acum[:do_zero.n])
+    np.testing.assert_allclose(motor.tabela.totais(agora), do_zero.totais(agora))
+    assert resumo(motor, agora) == resumo(reproduzido(eventos), agora)
+
+
+# ---------- Regras ----------
+def _partida_curta():
+    motor = MotorPartida()
+    motor.aplicar("elenco", 0.0, equipe="A", numeros=[1, 2, 3])
+    motor.aplicar("titulares", 0.0, equipe="A", numeros=[1, 2])
+    return motor
+
+
+@pytest.mark.parametrize("tipo, dados", [
+    ("substituicao", {"sai": None, "entra": 3}),
+    ("exclusao", {"numero": None}),
+    ("expulsao", {"numero": None}),
+])
+def test_selecao_vazia_e_recusada(tipo, dados):
+    motor = _partida_curta()
+    with pytest.raises(AcaoInvalida):
+        motor.aplicar(tipo, 0.0, equipe="A", **dados)
+    assert len(motor.estado["eventos"]) == 2
@@ -0,0 +1,55 @@
+"""Períodos e tempos técnicos (utils.periodos, utils.motor): minutos por período e limites."""
+import numpy as np
+import pytest
+
+from apoio import SEMENTES, TAXAS, agora_final
+from utils.acoes import AcaoInvalida
+from utils.motor import MotorPartida
+from utils.simulador import simular_partida
+
+
+def _partida_curta():
+    motor = MotorPartida()
+    motor.aplicar("elenco", 0.0, equipe="A", numeros=[1, 2, 3])
+    motor.aplicar("titulares", 0.0, equipe="A", numeros=[1, 2])
+    return motor
+
+
+@pytest.mark.parametrize("seed", SEMENTES)
+def test_minutos_por_periodo_batem_com_a_escalacao(seed):
+    motor = simular_partida(seed, taxas=TAXAS)
+    agora = agora_final(motor)
+    tabela = motor.tabela
+    por_periodo = tabela.totais_por_periodo(agora)
+    tot = tabela.totais(agora)
+    np.testing.assert_allclose(por_periodo.sum(axis=1), tot[:, 0] + tot[:, 1])
+    (_, _), (_, meio) = motor.periodos().segmentos
+    janelas = [(0.0, meio), (meio, agora)]
+    indice = motor.escalacao()
+    for i in range(tabela.n):
+        eq, numero = str(tabela.equipe[i]), int(tabela.numero[i])
+        for k, (t1, t2) in enumerate(janelas):
+            assert indice.em_quadra_durante(eq, t1, t2).get(numero, 0.0) == pytest.approx(por_periodo[i, k])
+
+
+# ---------- Regras ----------
+def test_fim_de_periodo_antes_do_inicio_e_recusado():
+    motor = _partida_curta()
+    with pytest.raises(AcaoInvalida):
+        motor.aplicar("fim_periodo", 0.0, epoch=0.0)
+    motor.aplicar("inicio", 0.0, epoch=0.0)
+    motor.aplicar("fim_periodo", 1800.0, epoch=0.0)
+    motor.aplicar("inicio", 1800.0, epoch=0.0)
+    assert motor.estado["periodo"] == "2º Tempo"
+    assert motor.tabela.totais_por_periodo(1900.0)[:, :2].tolist() == [[1800.0, 100.0]] * 2 + [[0.0, 0.0]]
+
+
+def test_limites_de_tempo_tecnico():
+    motor = _partida_curta()
+    motor.aplicar("inicio", 0.0, epoch=0.0)
+    for t in (10.0, 20.0):
+        motor.aplicar("tempo_tecnico", t, equipe="A", epoch=0.0)
+        motor.aplicar("inicio", t, epoch=0.0)
+    with pytest.raises(AcaoInvalida):
+        motor.aplicar("tempo_tecnico", 30.0, equipe="A", epoch=0.0)  # 2 por tempo
+    motor.aplicar("tempo_tecnico", 30.0, equipe="B", epoch=0.0)
@@ -0,0 +1,60 @@
+"""Log de eventos em SQLite (utils.persistencia) e restauração da Partida a partir dele."""
+import pytest
+
+from apoio import agora_final, copiar_para, resumo
+from utils.partidas import Partida
+from utils.persistencia import ArmazenamentoSQLite
+from utils.simulador import simular_partida
+
+
+@pytest.fixture
+def caminho(tmp_path):
+    return str(tmp_path / "partidas.db")
+
+
+def _reaberta(caminho: str, partida_id: str = "quadra1") -> Partida:
+    """A partida como um processo novo a vê: conexão nova e restauração do disco."""
+    partida = Partida(partida_id, ArmazenamentoSQLite(caminho))
+    partida.restaurar()
+    return partida
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_restaurar_reconstroi_a_partida(caminho, seed):
+    arm = ArmazenamentoSQLite(caminho)
+    partida = copiar_para(Partida("quadra1", arm), simular_partida(seed).estado["eventos"])
+    arm.flush()
+    agora = agora_final(partida)
+    assert resumo(_reaberta(caminho), agora) == resumo(partida, agora)
+
+
+def test_desfazer_apaga_o_evento_gravado(caminho):
+    arm = ArmazenamentoSQLite(caminho)
+    partida = copiar_para(Partida("quadra1", arm), simular_partida(0).estado["eventos"])
+    partida.desfazer()
+    partida.desfazer()
+    partida.refazer()
+    arm.flush()
+    agora = agora_final(partida)
+    assert resumo(_reaberta(caminho), agora) == resumo(partida, agora)
+
+
+def test_partidas_ficam_separadas(caminho):
+    arm = ArmazenamentoSQLite(caminho)
+    copiar_para(Partida("quadra1", arm), simular_partida(0).estado["eventos"])
+    outra = copiar_para(Partida("quadra2", arm), simular_partida(1).estado["eventos"])
+    arm.flush()
+    assert arm.partidas() == ["quadra1", "quadra2"]
+    assert resumo(_reaberta(caminho, "quadra2"), 0.0) == resumo(outra, 0.0)
+
+
+def test_iterar_pagina_na_ordem_gravada(caminho):
+    arm = ArmazenamentoSQLite(caminho)
+    eventos = simular_partida(0).estado["eventos"]
+    for ev in eventos:
+        arm.registrar("quadra1", ev)
+    lidos = list(arm.iterar("quadra1", lote=7))
+    assert [ev for _, ev in lidos] == eventos
+    seqs = [seq for seq, _ in lidos]
+    assert seqs == sorted(seqs)
+    assert [ev for _, ev in arm.iterar("quadra1", lote=7, desde=seqs[9])] == eventos[10:]
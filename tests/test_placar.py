@@ -0,0 +1,33 @@
+"""Servidor SSE do placar (utils.placar): só serve partidas já abertas no registro."""
+import urllib.error
+import urllib.request
+
+import pytest
+
+from utils.partidas import RegistroPartidas
+from utils.placar import CentralPlacar, iniciar_servidor_placar
+
+
+@pytest.fixture
+def servidor():
+    registro = RegistroPartidas()
+    registro.obter("aberta")
+    srv = iniciar_servidor_placar(CentralPlacar(registro.ativa), porta=0)
+    yield registro, f"http://127.0.0.1:{srv.server_address[1]}"
+    srv.shutdown()
+    srv.server_close()
+
+
+def test_partida_desconhecida_da_404_sem_criar_partida(servidor):
+    registro, base = servidor
+    with pytest.raises(urllib.error.HTTPError) as erro:
+        urllib.request.urlopen(f"{base}/placar?partida=qualquer", timeout=5)
+    assert erro.value.code == 404
+    assert registro.ids() == ["aberta"]
+
+
+def test_partida_aberta_recebe_o_placar(servidor):
+    _, base = servidor
+    with urllib.request.urlopen(f"{base}/placar?partida=aberta", timeout=5) as resp:
+        assert resp.headers["Content-Type"] == "text/event-stream"
+        assert resp.readline() == b"event: placar\n"
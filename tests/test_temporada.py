@@ -0,0 +1,81 @@
+"""Índice da temporada (utils.temporada): cache em disco e agrupamento pelo nome da equipe."""
+import pandas as pd
+import pytest
+
+from apoio import copiar_para
+from utils import temporada
+from utils.partidas import Partida
+from utils.persistencia import ArmazenamentoSQLite
+from utils.simulador import simular_partida
+
+
+def _gravar(arm, pid: str, seed: int, nomes: dict):
+    eventos = [dict(ev) for ev in simular_partida(seed).estado["eventos"]]
+    for ev in eventos:
+        if ev["tipo"] == "elenco":
+            ev["nome"] = nomes[ev["equipe"]]
+    copiar_para(Partida(pid, arm), eventos)
+    arm.flush()
+
+
+@pytest.fixture
+def arquivo(tmp_path):
+    arm = ArmazenamentoSQLite(str(tmp_path / "partidas.db"))
+    _gravar(arm, "j1", 0, {"A": "Leões", "B": "Tigres"})
+    _gravar(arm, "j2", 1, {"A": "Tigres", "B": "Leões"})  # lados trocados
+    return arm, str(tmp_path / "temporada")
+
+
+def test_indice_salvo_e_reaproveitado(arquivo, monkeypatch):
+    arm, pasta = arquivo
+    indice = temporada.arquivar(arm, pasta)
+
+    def nao_remontar(_):
+        raise AssertionError("índice refeito sem as fontes mudarem")
+
+    monkeypatch.setattr(temporada, "_montar_indice", nao_remontar)
+    pd.testing.assert_frame_equal(temporada.carregar_indice(pasta), indice)
+
+
+def test_indice_refeito_quando_as_fontes_mudam(arquivo):
+    arm, pasta = arquivo
+    assert set(temporada.arquivar(arm, pasta, ids=["j1"])["Partida"]) == {"j1"}
+    assert set(temporada.carregar_indice(pasta)["Partida"]) == {"j1"}
+    assert set(temporada.arquivar(arm, pasta)["Partida"]) == {"j1", "j2"}
+
+
+def test_indice_refeito_quando_a_versao_muda(arquivo, monkeypatch):
+    arm, pasta = arquivo
+    temporada.arquivar(arm, pasta)
+    chamadas = []
+    montar = temporada._montar_indice
+    monkeypatch.setattr(temporada, "_montar_indice", lambda p: chamadas.append(p) or montar(p))
+    monkeypatch.setattr(temporada, "VERSAO_INDICE", temporada.VERSAO_INDICE + 1)
+    temporada.carregar_indice(pasta)
+    temporada.carregar_indice(pasta)
+    assert chamadas == [pasta]  # refeito uma vez e salvo com a versão nova
+
+
+def test_consultas_agrupam_pelo_nome_da_equipe(arquivo):
+    arm, pasta = arquivo
+    indice = temporada.arquivar(arm, pasta)
+    assert temporada.equipes(indice) == ["Leões", "Tigres"]
+    jogadores = temporada.por_jogador(indice, "Leões")
+    assert set(jogadores[temporada.NOME]) == {"Leões"}
+    # as linhas dos Leões vêm do lado A em j1 e do lado B em j2
+    leoes = indice[indice[temporada.NOME] == "Leões"]
+    assert set(zip(leoes["Partida"], leoes["Equipe"])) == {("j1", "A"), ("j2", "B")}
+    assert jogadores["Partidas"].sum() == len(leoes)
+    assert jogadores["Partidas"].max() == 2
+    partidas = temporada.por_partida(indice)
+    assert sorted(zip(partidas["Partida"], partidas["Equipe"], partidas[temporada.NOME])) == [
+        ("j1", "A", "Leões"), ("j1", "B", "Tigres"), ("j2", "A", "Tigres"), ("j2", "B", "Leões"),
+    ]
+
+
+def test_arquivo_antigo_sem_nome_da_equipe(arquivo):
+    arm, pasta = arquivo
+    temporada.arquivar(arm, pasta)
+    caminho = f"{pasta}/jogadores.parquet"
+    pd.read_parquet(caminho).drop(columns=[temporada.NOME]).to_parquet(caminho, index=False)
+    assert temporada.equipes(temporada.carregar_indice(pasta)) == ["Equipe A", "Equipe B"]
@@ -0,0 +1,162 @@
+from utils.elenco import Elenco, Jogador
+from utils.linha_tempo import inserir_evento, registrar_evento, tocado_depois
+from utils.periodos import PERIODOS, REGULAMENTARES, TECNICOS_POR_EQUIPE, TECNICOS_POR_TEMPO
+
+# =====================================================
+# Ações da mesa: regras + aplicação de um evento ao estado
+# =====================================================
+# validar_evento() concentra as regras do jogo (quem pode sair, entrar,
+# receber 2', voltar...) e aplicar_evento() só aplica o que já foi aceito.
+# O mesmo caminho serve à mesa (app), ao simulador em lote e à restauração
+# a partir do armazenamento — esta última reaplica sem validar, na ordem
+# gravada. Formato de campos de tela (MM:SS etc.) continua no app.
+
+
+class AcaoInvalida(ValueError):
+    """Ação recusada pelas regras do jogo; a mensagem vai direto para a mesa."""
+
+
+def _exigir(condicao, mensagem: str):
+    if not condicao:
+        raise AcaoInvalida(mensagem)
+
+
+def _numero(ev: dict, campo: str, mensagem: str) -> int:
+    """Número da camisa em ev[campo]; AcaoInvalida se ausente (ex.: seleção vazia na tela)."""
+    try:
+        return int(ev[campo])
+    except (KeyError, TypeError, ValueError):
+        raise AcaoInvalida(mensagem) from None
+
+
+def validar_evento(state, ev: dict):
+    """Levanta AcaoInvalida se 'ev' não pode ser aplicado ao estado atual."""
+    tipo = ev["tipo"]
+    eq = ev.get("equipe")
+    if eq is not None:
+        _exigir(eq in state["equipes"], f"Equipe inválida: {eq}.")
+    equipe = state["equipes"].get(eq) if eq else None
+
+    if tipo == "elenco":
+        _exigir(ev["numeros"], "O elenco precisa de pelo menos 1 jogador.")
+    elif tipo == "titulares":
+        _exigir(ev["numeros"], "Selecione pelo menos 1 titular.")
+        _exigir(all(n in equipe for n in ev["numeros"]), "Titular fora do elenco.")
+    elif tipo == "substituicao":
+        sai = _numero(ev, "sai", "Seleção inválida para substituição.")
+        entra = _numero(ev, "entra", "Seleção inválida para substituição.")
+        if ev.get("retro"):
+            # no passado o estado era outro: só dá para exigir dois jogadores do elenco
+            _exigir(sai != entra, "Os jogadores de 'Sai' e 'Entra' precisam ser diferentes.")
+            _exigir(sai in equipe and entra in equipe, "Seleção inválida para substituição.")
+        else:
+            _exigir(
+                sai in equipe.por_estado("jogando") and entra in equipe.por_estado("banco"),
+                "Seleção inválida para substituição.",
+            )
+    elif tipo == "exclusao":
+        msg = "Jogador não pode receber 2 minutos."
+        _exigir(_numero(ev, "numero", msg) in equipe.elegiveis(), msg)
+    elif tipo == "retorno":
+        _exigir(
+            state["penalties"][eq].mais_antiga_concluida(ev["t"]) is not None,
+            "Ainda não há exclusões concluídas (2' completos). Aguarde.",
+        )
+        msg = "Jogador precisa estar no banco ou cumprindo 2' para entrar."
+        n = _numero(ev, "numero", msg)
+        _exigir(n in equipe.por_estado("banco") or n in equipe.por_estado("excluido"), msg)
+    elif tipo == "expulsao":
+        msg = "Não foi possível expulsar o jogador selecionado."
+        _exigir(_numero(ev, "numero", msg) in equipe.elegiveis(), msg)
+    elif tipo == "inicio":
+        periodos = state["periodos"]
+        _exigir(periodos.aberto or periodos.proximo is not None, "Todos os períodos já foram jogados.")
+    elif tipo == "fim_periodo":
+        periodos = state["periodos"]
+        _exigir(periodos.aberto, "Não há período em andamento para encerrar.")
+        # encerrar antes de o relógio correr apagaria o período (o próximo começaria no mesmo t)
+        _exigir(
+            state["iniciado"] or periodos.comecou(ev["t"]),
+            f"O {periodos.nome} ainda não começou: inicie o relógio antes de encerrá-lo.",
+        )
+    elif tipo == "tempo_tecnico":
+        _exigir(eq is not None, "Informe a equipe que pediu o tempo técnico.")
+        periodos = state["periodos"]
+        _exigir(periodos.aberto and state["iniciado"], "Tempo técnico só com o período em andamento.")
+        _exigir(periodos.atual < REGULAMENTARES, "Não há tempo técnico na prorrogação.")
+        _exigir(
+            periodos.tecnicos_de(eq) < TECNICOS_POR_EQUIPE,
+            f"A equipe já usou os {TECNICOS_POR_EQUIPE} tempos técnicos da partida.",
+        )
+        _exigir(
+            periodos.tecnicos_de(eq, periodos.atual) < TECNICOS_POR_TEMPO,
+            f"A equipe já usou {TECNICOS_POR_TEMPO} tempos técnicos no {PERIODOS[periodos.atual]}.",
+        )
+    elif tipo == "periodo":
+        _exigir(ev["periodo"] in PERIODOS, f"Período inválido: {ev['periodo']}.")
+    elif tipo not in ("corrigir_titulares", "pausa", "zerar"):
+        raise AcaoInvalida(f"Ação desconhecida: {tipo}.")
+
+
+def aplicar_evento(state, ev: dict) -> dict:
+    """Aplica 'ev' ao estado (elenco, penalidades, relógio) e o grava na linha do tempo."""
+    tipo = ev["tipo"]
+    t = ev["t"]
+    eq = ev.get("equipe")
+    equipe = state["equipes"].get(eq) if eq else None
+
+    if tipo == "elenco":
+        state["equipes"][eq] = Elenco(Jogador(n) for n in ev["numeros"])
+        state["titulares_definidos"][eq] = False
+        if ev.get("nome"):
+            state["nomes"][eq] = ev["nome"]
+        if ev.get("cor"):
+            state["cores"][eq] = ev["cor"]
+    elif tipo == "titulares":
+        sel = {int(n) for n in ev["numeros"]}
+        for n in equipe.numeros():
+            equipe.mudar_estado(n, "jogando" if n in sel else "banco")
+            equipe.definir_elegivel(n, True)
+        state["titulares_definidos"][eq] = True
+    elif tipo == "corrigir_titulares":
+        state["titulares_definidos"][eq] = False
+    elif tipo == "substituicao":
+        for numero, novo in ((ev["sai"], "banco"), (ev["entra"], "jogando")):
+            # retroativa: só vale para o estado atual se nada depois mexeu no jogador
+            if not ev.get("retro") or not tocado_depois(state["eventos"], eq, numero, t):
+                equipe.mudar_estado(numero, novo)
+    elif tipo == "exclusao":
+        equipe.mudar_estado(ev["numero"], "excluido")
+        j = equipe.get(ev["numero"])
+        if j is not None:
+            j.exclusoes += 1
+        state["penalties"][eq].registrar(ev["numero"], t)
+    elif tipo == "retorno":
+        state["penalties"][eq].consumir_mais_antiga(t)
+        equipe.mudar_estado(ev["numero"], "jogando")
+    elif tipo == "expulsao":
+        equipe.mudar_estado(ev["numero"], "expulso")
+        equipe.definir_elegivel(ev["numero"], False)
+    elif tipo == "inicio":
+        state["iniciado"] = True
+        state["cronometro"] = t - state["tempo_base"]
+        state["ultimo_tick"] = ev["epoch"]
+    elif tipo in ("pausa", "fim_periodo", "tempo_tecnico"):
+        state["iniciado"] = False
+        state["cronometro"] = t - state["tempo_base"]
+        state["ultimo_tick"] = ev["epoch"]
+    elif tipo == "zerar":
+        state["tempo_base"] = t
+        state["cronometro"] = 0.0
+        state["iniciado"] = False
+        state["ultimo_tick"] = ev["epoch"]
+
+    periodos = state["periodos"].aplicar(ev)
+    if periodos is not state["periodos"]:
+        state["periodos"] = periodos
+        state["periodo"] = periodos.nome
+
+    dados = {k: v for k, v in ev.items() if k not in ("t", "tipo")}
+    if ev.get("retro"):
+        return inserir_evento(state, t, tipo, **dados)
+    return registrar_evento(state, t, tipo, **dados)
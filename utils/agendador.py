@@ -0,0 +1,84 @@
+import heapq
+import itertools
+import threading
+
+# =====================================================
+# Fim das penalidades de 2' no servidor
+# =====================================================
+# Uma thread por processo e um min-heap por partida com o fim ('end', em
+# tempo de partida) de cada penalidade ativa. A thread dorme até o fim mais
+# próximo entre as partidas com o relógio rodando; com o relógio parado a
+# partida não conta. Qualquer escrita na partida (2', pausa, início, zerar,
+# desfazer...) acorda a thread para recalcular a espera — não há polling
+# por penalidade. Ao vencer, a partida marca a penalidade como expirada e
+# notifica os ouvintes (placar SSE -> navegadores).
+
+
+class AgendadorPenalidades:
+    """Dispara Partida.marcar_expirada no fim de cada 2', pausando com o relógio."""
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._heaps = {}  # partida -> [(end, n, equipe, Penalidade)]
+        self._n = itertools.count()
+        threading.Thread(target=self._laco, daemon=True, name="penalidades").start()
+
+    def acompanhar(self, partida):
+        """Passa a vigiar as penalidades da partida (as ativas agora e as futuras)."""
+        with self._cond:
+            if partida in self._heaps:
+                return
+            heap = self._heaps[partida] = []
+        with partida.leitura():
+            agora = partida.tempo_partida()
+            ativas = [(eq, p) for eq in ("A", "B") for p in partida.penalidades(eq).ativas(agora)]
+        with self._cond:
+            for eq, p in ativas:
+                heapq.heappush(heap, (p.end, next(self._n), eq, p))
+            self._cond.notify()
+        partida.assinar(self._ao_mudar)
+
+    def _ao_mudar(self, partida, ev: dict):
+        nova = None
+        if ev["tipo"] == "exclusao":
+            with partida.leitura():
+                fila = partida.penalidades(ev["equipe"])
+                nova = next((p for p in reversed(list(fila)) if p.start == ev["t"]), None)
+        with self._cond:
+            heap = self._heaps[partida]
+            if nova is not None and not any(item[3] is nova for item in heap):
+                heapq.heappush(heap, (nova.end, next(self._n), ev["equipe"], nova))
+            self._cond.notify()  # relógio ou penalidades mudaram: refaz a espera
+
+    def _vencidas(self):
+        """Retira dos heaps o que já venceu; devolve (vencidas, segundos até a próxima ou None)."""
+        vencidas, espera = [], None
+        for partida, heap in self._heaps.items():
+            if not heap:
+                continue
+            with partida.leitura():
+                rodando = partida.estado["iniciado"]
+                agora = partida.tempo_partida()
+                while heap:
+                    end, _, eq, p = heap[0]
+                    if not partida.penalidades(eq).contem(p):
+                        heapq.heappop(heap)  # desfeita
+                    elif end <= agora:
+                        heapq.heappop(heap)
+                        vencidas.append((partida, eq, p))
+                    else:
+                        break
+            if heap and rodando:
+                falta = heap[0][0] - agora
+                espera = falta if espera is None else min(espera, falta)
+        return vencidas, espera
+
+    def _laco(self):
+        while True:
+            with self._cond:
+                vencidas, espera = self._vencidas()
+                if not vencidas:
+                    self._cond.wait(espera)
+                    continue
+            for partida, eq, p in vencidas:
+                partida.marcar_expirada(eq, p)
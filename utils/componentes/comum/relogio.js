@@ -0,0 +1,50 @@
+// Relógio da partida no navegador, comum aos componentes "relogio" (mesa) e
+// "placar" (público): os dois carregam este arquivo, então contam o tempo
+// exatamente do mesmo jeito. Servido pelo componente "comum" (utils/relogio.py).
+//
+// Hora do servidor = relógio monotônico local (performance.now) + offset.
+// O offset vem da menor ida-e-volta de 5 consultas a GET /hora do servidor
+// de placar, refeita a cada 30 s; até a 1ª medida vale a hora do render.
+var RelogioPartida = (function(){
+  function localAgora(){ return (performance.timeOrigin + performance.now()) / 1000; }
+  let offset = 0, sincronizado = false, timerSync = null;
+  function servidorAgora(){ return localAgora() + offset; }
+  // endereço no servidor de placar (mesmo host da página, outra porta)
+  function urlPlacar(porta, caminho){
+    return location.protocol + "//" + location.hostname + ":" + porta + caminho;
+  }
+  async function sincronizar(porta){
+    const url = urlPlacar(porta, "/hora");
+    let melhor = null;
+    for (let i = 0; i < 5; i++){
+      try {
+        const t0 = localAgora();
+        const r = await fetch(url, {cache: "no-store"});
+        const srv = (await r.json()).agora;
+        const t1 = localAgora();
+        if (!melhor || t1 - t0 < melhor.rtt){ melhor = {rtt: t1 - t0, offset: srv + (t1 - t0) / 2 - t1}; }
+      } catch (e) { break; }
+    }
+    if (melhor){ offset = melhor.offset; sincronizado = true; }
+  }
+  // a: argumentos do componente (porta, servidor_agora = hora do servidor no render)
+  function iniciarSync(a){
+    if (!sincronizado){ offset = a.servidor_agora - localAgora(); }
+    if (timerSync === null){
+      sincronizar(a.porta);
+      timerSync = setInterval(function(){ sincronizar(a.porta); }, 30000);
+    }
+  }
+  function fmt(sec){
+    sec = Math.max(0, Math.ceil(sec - 1e-6));
+    const m = Math.floor(sec/60), s = sec % 60;
+    return (m<10?'0':'')+m+':' + (s<10?'0':'')+s;
+  }
+  // r: {iniciado, cronometro, ultimo_tick} como o servidor manda
+  function decorrido(r){
+    let elapsed = r.cronometro;
+    if (r.iniciado && r.ultimo_tick){ elapsed += servidorAgora() - r.ultimo_tick; }
+    return elapsed;
+  }
+  return {urlPlacar: urlPlacar, iniciarSync: iniciarSync, fmt: fmt, decorrido: decorrido};
+})();
@@ -0,0 +1,117 @@
+# =====================================================
+# Elenco indexado (número da camisa -> jogador)
+# =====================================================
+# Cada jogador é um objeto Jogador (com __slots__: leve e sem dict por
+# instância); as mudanças de estado/elegibilidade devem passar pelos métodos
+# do Elenco para manter os índices secundários por estado sincronizados.
+# por_estado()/elegiveis() guardam a lista montada em cache: numa partida
+# compartilhada, chame-as sob a trava de leitura da Partida (as mudanças já
+# ocorrem sob a de escrita), para nenhuma lista antiga ficar no cache.
+
+
+class Jogador:
+    """Jogador de um elenco: número, estado, elegibilidade e exclusões."""
+
+    __slots__ = ("numero", "estado", "elegivel", "exclusoes")
+
+    def __init__(self, numero: int, estado: str = "banco", elegivel: bool = True, exclusoes: int = 0):
+        self.numero = int(numero)
+        self.estado = estado
+        self.elegivel = bool(elegivel)
+        self.exclusoes = int(exclusoes)
+
+    def __repr__(self):
+        return f"Jogador(#{self.numero}, {self.estado}{'' if self.elegivel else ', inelegível'})"
+
+
+class Elenco:
+    """Elenco de uma equipe com busca O(1) por número e índices por estado."""
+
+    def __init__(self, jogadores=()):
+        self._jogadores = {}   # numero -> Jogador (ordem de cadastro)
+        self._por_estado = {}  # estado -> {numero: None}
+        self._inelegiveis = set()
+        self._cache = {}       # estado (ou None p/ elegíveis) -> lista pronta
+        for j in jogadores:
+            self.adicionar(j)
+
+    # ---------- Coleção ----------
+    def __iter__(self):
+        return iter(self._jogadores.values())
+
+    def __len__(self):
+        return len(self._jogadores)
+
+    def __contains__(self, numero):
+        return int(numero) in self._jogadores
+
+    def numeros(self):
+        return list(self._jogadores)
+
+    def adicionar(self, jogador: Jogador) -> Jogador:
+        numero = jogador.numero
+        if numero in self._jogadores:
+            self._desindexar(numero)
+        self._jogadores[numero] = jogador
+        self._por_estado.setdefault(jogador.estado, {})[numero] = None
+        if not jogador.elegivel:
+            self._inelegiveis.add(numero)
+        self._cache.clear()
+        return jogador
+
+    def _desindexar(self, numero: int):
+        j = self._jogadores[numero]
+        self._por_estado.get(j.estado, {}).pop(numero, None)
+        self._inelegiveis.discard(numero)
+
+    # ---------- Consulta ----------
+    def get(self, numero):
+        """Jogador pelo número da camisa (ou None)."""
+        try:
+            return self._jogadores.get(int(numero))
+        except (TypeError, ValueError):
+            return None
+
+    def por_estado(self, estado: str):
+        """Números elegíveis no estado informado, na ordem de cadastro."""
+        lista = self._cache.get(estado)
+        if lista is None:
+            idx = self._por_estado.get(estado, {})
+            lista = [n for n in self._jogadores if n in idx and n not in self._inelegiveis]
+            self._cache[estado] = lista
+        return lista
+
+    def elegiveis(self):
+        """Todos os números elegíveis (não-expulsos), na ordem de cadastro."""
+        lista = self._cache.get(None)
+        if lista is None:
+            lista = [n for n in self._jogadores if n not in self._inelegiveis]
+            self._cache[None] = lista
+        return lista
+
+    # ---------- Transições ----------
+    def mudar_estado(self, numero, novo_estado: str) -> bool:
+        j = self.get(numero)
+        if j is None:
+            return False
+        antigo = j.estado
+        if antigo != novo_estado:
+            self._por_estado.get(antigo, {}).pop(j.numero, None)
+            self._por_estado.setdefault(novo_estado, {})[j.numero] = None
+            j.estado = novo_estado
+            self._cache.pop(antigo, None)
+            self._cache.pop(novo_estado, None)
+        return True
+
+    def definir_elegivel(self, numero, elegivel: bool) -> bool:
+        j = self.get(numero)
+        if j is None:
+            return False
+        if j.elegivel != bool(elegivel):
+            j.elegivel = bool(elegivel)
+            if elegivel:
+                self._inelegiveis.discard(j.numero)
+            else:
+                self._inelegiveis.add(j.numero)
+            self._cache.clear()
+        return True
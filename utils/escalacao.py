@@ -0,0 +1,119 @@
+import bisect
+
+from utils.linha_tempo import transicoes
+
+# =====================================================
+# Escalação no tempo ("quem estava em quadra aos MM:SS")
+# =====================================================
+# Índice montado a partir da linha do tempo (as mesmas transições que a
+# TabelaStats integra: elenco, titulares, substituições, 2', retornos,
+# expulsões). Por jogador guarda:
+#   _tempos/_estados   instantes das mudanças (ordenados) e o estado após cada uma
+#   _inicios/_fins     intervalos em quadra ('jogando'), ordenados; fim aberto = inf
+# Estado num instante = uma busca binária por jogador; minutos em quadra numa
+# janela = busca binária + só os intervalos que a cruzam.
+
+FIM_ABERTO = float("inf")
+
+
+class IndiceEscalacao:
+    """Estado de cada jogador ao longo da partida, consultável por instante ou janela."""
+
+    def __init__(self, eventos=()):
+        self._tempos = {}   # (eq, numero) -> [t]
+        self._estados = {}  # (eq, numero) -> [estado após t; None = fora do elenco]
+        self._inicios = {}  # (eq, numero) -> [início de cada passagem em quadra]
+        self._fins = {}     # (eq, numero) -> [fim de cada passagem (FIM_ABERTO se ainda em quadra)]
+        for ev in eventos:
+            self.aplicar(ev)
+
+    # ---------- Construção ----------
+    def _mudar(self, eq: str, numero: int, estado, t: float):
+        chave = (eq, int(numero))
+        estados = self._estados.setdefault(chave, [])
+        antigo = estados[-1] if estados else None
+        if antigo == estado:
+            return
+        self._tempos.setdefault(chave, []).append(t)
+        estados.append(estado)
+        if antigo == "jogando":
+            self._fins[chave][-1] = t
+        if estado == "jogando":
+            self._inicios.setdefault(chave, []).append(t)
+            self._fins.setdefault(chave, []).append(FIM_ABERTO)
+
+    def aplicar(self, ev: dict):
+        """Incorpora um evento (em ordem de t, como na linha do tempo)."""
+        t, tipo, eq = ev["t"], ev["tipo"], ev.get("equipe")
+        if tipo == "elenco":
+            numeros = {int(n) for n in ev["numeros"]}
+            for (e, n) in list(self._estados):
+                if e == eq and n not in numeros:
+                    self._mudar(eq, n, None, t)
+            for n in numeros:
+                self._mudar(eq, n, "banco", t)
+        elif tipo == "titulares":
+            titulares = {int(n) for n in ev["numeros"]}
+            for (e, n), estados in list(self._estados.items()):
+                if e == eq and estados[-1] is not None:
+                    self._mudar(eq, n, "jogando" if n in titulares else "banco", t)
+            for n in titulares:
+                self._mudar(eq, n, "jogando", t)
+        else:
+            for e, n, estado in transicoes(ev):
+                self._mudar(e, n, estado, t)
+
+    # ---------- Consultas por instante ----------
+    def estado_em(self, eq: str, numero: int, t: float):
+        """Estado do jogador logo após os eventos de 't' (None = fora do elenco)."""
+        chave = (eq, int(numero))
+        k = bisect.bisect_right(self._tempos.get(chave, ()), t)
+        return self._estados[chave][k - 1] if k else None
+
+    def estados_em(self, eq: str, t: float) -> dict:
+        """{numero: estado} de todo o elenco da equipe em 't' (sem quem estava fora)."""
+        estados = {}
+        for (e, n) in self._estados:
+            if e == eq:
+                s = self.estado_em(e, n, t)
+                if s is not None:
+                    estados[n] = s
+        return estados
+
+    def em_quadra(self, eq: str, t: float):
+        """Números em quadra em 't', ordenados."""
+        return sorted(n for n, s in self.estados_em(eq, t).items() if s == "jogando")
+
+    # ---------- Consultas por janela ----------
+    def em_quadra_durante(self, eq: str, t1: float, t2: float) -> dict:
+        """{numero: segundos em quadra dentro de [t1, t2]} de quem esteve em quadra na janela."""
+        tempos = {}
+        for (e, n), inicios in self._inicios.items():
+            if e != eq:
+                continue
+            fins = self._fins[(e, n)]
+            # passagens que terminam depois de t1 e começam antes de t2
+            k = bisect.bisect_right(fins, t1)
+            total = 0.0
+            while k < len(inicios) and inicios[k] < t2:
+                total += min(fins[k], t2) - max(inicios[k], t1)
+                k += 1
+            if total > 0:
+                tempos[n] = total
+        return tempos
+
+    def formacoes(self, eq: str, t1: float, t2: float):
+        """[(números em quadra, segundos)] na janela [t1, t2], da formação mais usada para a menos."""
+        cortes = {t1, t2}
+        for (e, n), inicios in self._inicios.items():
+            if e == eq:
+                for t in (*inicios, *self._fins[(e, n)]):
+                    if t1 < t < t2:
+                        cortes.add(t)
+        cortes = sorted(cortes)
+        duracoes = {}
+        for a, b in zip(cortes, cortes[1:]):
+            formacao = tuple(self.em_quadra(eq, a))
+            if formacao:
+                duracoes[formacao] = duracoes.get(formacao, 0.0) + (b - a)
+        return sorted(duracoes.items(), key=lambda item: -item[1])
@@ -0,0 +1,176 @@
+import json
+import struct
+import zlib
+
+import numpy as np
+
+from utils.elenco import Elenco, Jogador
+from utils.linha_tempo import ESTADOS, LARGURA, TabelaStats
+from utils.penalidades import FilaPenalidades
+from utils.periodos import Periodos
+
+# =====================================================
+# Instantâneo compacto de uma partida (serializar / restaurar)
+# =====================================================
+# Um bloco zlib com um cabeçalho JSON e, em seguida, os bytes crus de cada
+# array tipado (sem pickle; na leitura viram np.frombuffer, sem cópia):
+#   elenco_<eq>   int32 (n, 4): número, estado (índice em ESTADOS), elegível, exclusões
+#   pen_<eq>      float64 (n, 2): número, início — em ordem de registro
+#   ev_*          a linha do tempo em colunas (t, tipo, equipe, número, sai, entra, retro)
+#   tab_*         as linhas usadas da TabelaStats
+#   cabeçalho     nomes, cores, relógio, períodos, campos raros dos eventos e, por array,
+#                 (nome, dtype, shape) na ordem em que os bytes aparecem
+# Restaurar não reaplica eventos: monta Elenco, FilaPenalidades e TabelaStats
+# direto dos arrays. Os pontos de restauração da tabela não vão junto (a
+# primeira correção retroativa depois de restaurar refaz a tabela do início).
+
+VERSAO = 2
+_CAMPOS_RELOGIO = ("iniciado", "ultimo_tick", "cronometro", "periodo", "tempo_base")
+_INTEIROS = ("numero", "sai", "entra")  # colunas int32 dos eventos (-1 = ausente)
+_EQUIPES = ("A", "B")
+
+
+def _codigo(lista: list, valor) -> int:
+    if valor not in lista:
+        lista.append(valor)
+    return lista.index(valor)
+
+
+def _colunas_eventos(eventos):
+    n = len(eventos)
+    tipos = []
+    cols = {
+        "ev_t": np.fromiter((ev["t"] for ev in eventos), dtype=np.float64, count=n),
+        "ev_tipo": np.fromiter((_codigo(tipos, ev["tipo"]) for ev in eventos), dtype=np.int8, count=n),
+        "ev_equipe": np.fromiter(
+            (_EQUIPES.index(ev["equipe"]) if ev.get("equipe") in _EQUIPES else -1 for ev in eventos),
+            dtype=np.int8, count=n,
+        ),
+        "ev_retro": np.fromiter((bool(ev.get("retro")) for ev in eventos), dtype=bool, count=n),
+    }
+    for campo in _INTEIROS:
+        cols[f"ev_{campo}"] = np.fromiter(
+            (int(ev[campo]) if campo in ev else -1 for ev in eventos), dtype=np.int32, count=n,
+        )
+    comuns = {"t", "tipo", "equipe", "retro", *_INTEIROS}
+    extras = {}
+    for i, ev in enumerate(eventos):
+        resto = {k: v for k, v in ev.items() if k not in comuns}
+        if "equipe" in ev and ev["equipe"] not in _EQUIPES:
+            resto["equipe"] = ev["equipe"]
+        if "retro" in ev and not isinstance(ev["retro"], bool):
+            resto["retro"] = ev["retro"]
+        if resto:
+            extras[str(i)] = resto
+    return cols, tipos, extras
+
+
+def _eventos(dados, tipos, extras):
+    eventos = []
+    # listas Python (tolist) em vez de indexar arrays elemento a elemento
+    t, tipo, equipe, retro = (dados[k].tolist() for k in ("ev_t", "ev_tipo", "ev_equipe", "ev_retro"))
+    inteiros = [(campo, dados[f"ev_{campo}"].tolist()) for campo in _INTEIROS]
+    for i in range(len(t)):
+        ev = {"t": t[i], "tipo": tipos[tipo[i]]}
+        if equipe[i] >= 0:
+            ev["equipe"] = _EQUIPES[equipe[i]]
+        for campo, col in inteiros:
+            if col[i] >= 0:
+                ev[campo] = col[i]
+        if retro[i]:
+            ev["retro"] = True
+        ev.update(extras.get(str(i), ()))
+        eventos.append(ev)
+    return eventos
+
+
+def serializar(motor) -> bytes:
+    """Instantâneo do motor (estado + tabela de tempos) em bytes."""
+    estado = motor.estado
+    cols, tipos, extras = _colunas_eventos(estado["eventos"])
+    tabela = motor.tabela
+    n = tabela.n
+    arrays = {
+        **cols,
+        "tab_equipe": tabela.equipe[:n].astype("<U1"),
+        "tab_numero": tabela.numero[:n],
+        "tab_acum": tabela.acum[:n],
+        "tab_estado": tabela.estado[:n],
+        "tab_desde": tabela.desde[:n],
+        "tab_exclusoes": tabela.exclusoes[:n],
+    }
+    filas = {}
+    for eq in _EQUIPES:
+        arrays[f"elenco_{eq}"] = np.array(
+            [(j.numero, ESTADOS.index(j.estado), j.elegivel, j.exclusoes) for j in motor.elenco(eq)],
+            dtype=np.int32,
+        ).reshape(-1, 4)
+        fila = motor.penalidades(eq)
+        arrays[f"pen_{eq}"] = np.array([(p.numero, p.start) for p in fila], dtype=np.float64).reshape(-1, 2)
+        filas[eq] = {"duracao": fila.duracao, "consumidas": fila._ptr}
+    cabecalho = {
+        "versao": VERSAO,
+        "nomes": estado["nomes"], "cores": estado["cores"],
+        "titulares_definidos": estado["titulares_definidos"],
+        "relogio": {k: estado[k] for k in _CAMPOS_RELOGIO},
+        "filas": filas,
+        "tipos": tipos, "extras": extras,
+        "periodos": estado["periodos"].como_dict(),
+        "tabela_periodos": tabela.periodos.como_dict(),
+        "versao_motor": motor.versao,
+    }
+    arrays = {k: np.ascontiguousarray(a) for k, a in arrays.items()}
+    cabecalho["arrays"] = [(k, a.dtype.str, a.shape) for k, a in arrays.items()]
+    cab = json.dumps(cabecalho, ensure_ascii=False).encode("utf-8")
+    corpo = b"".join([struct.pack("<I", len(cab)), cab, *(a.tobytes() for a in arrays.values())])
+    return zlib.compress(corpo, 1)
+
+
+def restaurar(dados: bytes, motor):
+    """Carrega um instantâneo de serializar() em 'motor' (as pilhas de desfazer ficam vazias)."""
+    corpo = zlib.decompress(dados)
+    (tam,) = struct.unpack_from("<I", corpo)
+    cab = json.loads(corpo[4:4 + tam])
+    if cab["versao"] != VERSAO:
+        raise ValueError(f"Instantâneo de versão {cab['versao']} (esperada {VERSAO}).")
+    arrays, pos = {}, 4 + tam
+    for nome, dtype, shape in cab["arrays"]:
+        dt = np.dtype(dtype)
+        n = int(np.prod(shape)) if shape else 1
+        arrays[nome] = np.frombuffer(corpo, dtype=dt, count=n, offset=pos).reshape(shape)
+        pos += n * dt.itemsize
+
+    estado = motor.estado
+    estado["nomes"].update(cab["nomes"])
+    estado["cores"].update(cab["cores"])
+    estado["titulares_definidos"].update(cab["titulares_definidos"])
+    estado.update(cab["relogio"])
+    estado["periodos"] = Periodos.de_dict(cab["periodos"])
+    estado["eventos"] = _eventos(arrays, cab["tipos"], cab["extras"])
+    for eq in _EQUIPES:
+        estado["equipes"][eq] = Elenco(
+            Jogador(n, ESTADOS[e], bool(el), x) for n, e, el, x in arrays[f"elenco_{eq}"].tolist()
+        )
+        f = cab["filas"][eq]
+        estado["penalties"][eq] = FilaPenalidades.restaurar(
+            f["duracao"], ((int(n), s) for n, s in arrays[f"pen_{eq}"].tolist()), f["consumidas"],
+        )
+
+    n = len(arrays["tab_numero"])
+    tabela = TabelaStats(max(48, n))
+    tabela.n = n
+    tabela.equipe[:n] = arrays["tab_equipe"]
+    tabela.numero[:n] = arrays["tab_numero"]
+    tabela.acum[:n] = arrays["tab_acum"].reshape(n, LARGURA)
+    tabela.estado[:n] = arrays["tab_estado"]
+    tabela.desde[:n] = arrays["tab_desde"]
+    tabela.exclusoes[:n] = arrays["tab_exclusoes"]
+    tabela._linha = {(str(e), int(num)): i for i, (e, num) in enumerate(zip(tabela.equipe[:n], tabela.numero[:n]))}
+    tabela.periodos = Periodos.de_dict(cab["tabela_periodos"])
+    tabela.aplicados = len(estado["eventos"])
+    motor.tabela = tabela
+    motor.versao = cab["versao_motor"]
+    motor._escalacao = None
+    motor._desfazer.clear()
+    motor._refazer.clear()
+    return motor
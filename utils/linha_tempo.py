@@ -0,0 +1,324 @@
+import bisect
+
+import numpy as np
+
+from utils.periodos import PERIODOS, Periodos, fatiar, fatias
+
+# =====================================================
+# Linha do tempo da partida (log de eventos append-only)
+# =====================================================
+# Cada evento é um dict {"t": tempo_de_jogo, "tipo": ..., ...} com "t" no
+# tempo lógico da partida (só avança com o relógio rodando). Os tempos de
+# cada jogador (jogado_1t/jogado_2t/banco/doismin) não são acumulados por
+# tick: são derivados integrando os intervalos entre eventos.
+#
+# A TabelaStats guarda essa integração em arrays NumPy, uma linha por
+# (equipe, número): segundos já fechados por coluna + estado aberto e desde
+# quando. Cada evento novo só toca as linhas dos jogadores envolvidos; os
+# totais "até agora" somam o intervalo aberto de forma vetorizada.
+# O tempo jogado fica numa coluna por período (utils.periodos): cada
+# intervalo em quadra é cortado nas fronteiras registradas no tempo de
+# partida, então trocar de período não fecha nada. No relatório de 4
+# colunas (COLUNAS) as prorrogações somam no jogado_2t.
+#
+# Correções retroativas: a tabela guarda um ponto de restauração a cada
+# PASSO_CHECKPOINT eventos. Um evento inserido na posição i volta ao último
+# ponto <= i e reaplica só o que vem depois — custo proporcional aos
+# eventos posteriores à correção, não à partida inteira.
+
+COLUNAS = ("jogado_1t", "jogado_2t", "banco", "doismin")
+_BANCO = len(PERIODOS)   # colunas de acum: jogado por período, banco, 2'
+_DOISMIN = _BANCO + 1
+LARGURA = _DOISMIN + 1
+ESTADOS = ("banco", "jogando", "excluido", "expulso")
+_COD = {e: i for i, e in enumerate(ESTADOS)}
+FORA = -1  # linha de jogador que saiu do elenco (não acumula)
+PASSO_CHECKPOINT = 32
+
+
+def inicializar_linha_tempo(state):
+    if "eventos" not in state:
+        state["eventos"] = []
+    if "tempo_base" not in state:
+        # tempo de jogo acumulado antes do último "Zerar"
+        state["tempo_base"] = 0.0
+
+
+def registrar_evento(state, t: float, tipo: str, **dados) -> dict:
+    """Anexa um evento no fim do log (t não-decrescente)."""
+    ev = {"t": float(t), "tipo": tipo, **dados}
+    state["eventos"].append(ev)
+    return ev
+
+
+def _t(ev):
+    return ev["t"]
+
+
+def inserir_evento(state, t: float, tipo: str, **dados) -> dict:
+    """Insere um evento no passado, mantendo o log ordenado por t."""
+    ev = {"t": float(t), "tipo": tipo, **dados}
+    bisect.insort_right(state["eventos"], ev, key=_t)
+    return ev
+
+
+def posicao_evento(eventos, ev: dict) -> int:
+    """Índice de 'ev' no log (busca binária por t; é o último entre os de mesmo t)."""
+    i = bisect.bisect_right(eventos, ev["t"], key=_t) - 1
+    while eventos[i] is not ev:
+        i -= 1
+    return i
+
+
+def tocado_depois(eventos, eq: str, numero: int, t: float) -> bool:
+    """True se algum evento depois de 't' muda o estado do jogador (ou refaz o elenco da equipe)."""
+    numero = int(numero)
+    for ev in eventos[bisect.bisect_right(eventos, t, key=_t):]:
+        if ev["tipo"] in ("elenco", "titulares") and ev.get("equipe") == eq:
+            return True
+        if any(e == eq and n == numero for e, n, _ in transicoes(ev)):
+            return True
+    return False
+
+
+# ---------- Transições por tipo de evento ----------
+def transicoes(ev: dict):
+    """Retorna [(equipe, numero, novo_estado)] causadas pelo evento."""
+    tipo = ev["tipo"]
+    eq = ev.get("equipe")
+    if tipo == "substituicao":
+        return [(eq, int(ev["sai"]), "banco"), (eq, int(ev["entra"]), "jogando")]
+    if tipo == "exclusao":
+        return [(eq, int(ev["numero"]), "excluido")]
+    if tipo == "retorno":
+        return [(eq, int(ev["numero"]), "jogando")]
+    if tipo == "expulsao":
+        return [(eq, int(ev["numero"]), "expulso")]
+    return []
+
+
+class TabelaStats:
+    """Tempos por jogador em arrays pré-alocados, atualizados evento a evento."""
+
+    def __init__(self, capacidade: int = 48):
+        self._linha = {}  # (equipe, numero) -> índice
+        self.n = 0
+        self.equipe = np.empty(capacidade, dtype="<U1")
+        self.numero = np.zeros(capacidade, dtype=np.int32)
+        self.acum = np.zeros((capacidade, LARGURA))  # segundos fechados
+        self.estado = np.full(capacidade, FORA, dtype=np.int8)
+        self.desde = np.zeros(capacidade)
+        self.exclusoes = np.zeros(capacidade, dtype=np.int16)
+        self.periodos = Periodos()
+        self._ordem = None  # índices ordenados por (equipe, número), refeito ao criar linha
+        self.aplicados = 0      # eventos já incorporados (prefixo do log)
+        self._checkpoints = []  # (aplicados, estado copiado), a cada PASSO_CHECKPOINT eventos
+
+    @classmethod
+    def a_partir_de(cls, eventos, ate: float | None = None) -> "TabelaStats":
+        tabela = cls()
+        for ev in eventos:
+            if ate is not None and ev["t"] > ate:
+                break
+            tabela.aplicar(ev)
+        return tabela
+
+    # ---------- Linhas ----------
+    def _linha_de(self, eq: str, numero: int) -> int:
+        chave = (eq, int(numero))
+        i = self._linha.get(chave)
+        if i is None:
+            i = self.n
+            if i == len(self.numero):
+                self._crescer()
+            self.equipe[i] = eq
+            self.numero[i] = chave[1]
+            self._linha[chave] = i
+            self.n += 1
+            self._ordem = None
+        return i
+
+    def _crescer(self):
+        cap = 2 * len(self.numero)
+        for nome in ("equipe", "numero", "acum", "desde", "exclusoes"):
+            antigo = getattr(self, nome)
+            novo = np.zeros((cap,) + antigo.shape[1:], dtype=antigo.dtype)
+            novo[:len(antigo)] = antigo
+            setattr(self, nome, novo)
+        estado = np.full(cap, FORA, dtype=np.int8)
+        estado[:len(self.estado)] = self.estado
+        self.estado = estado
+
+    @staticmethod
+    def _coluna(cod: int):
+        # 'jogando' não tem coluna única: é fatiado por período
+        if cod == _COD["banco"]:
+            return _BANCO
+        if cod == _COD["excluido"]:
+            return _DOISMIN
+        return None
+
+    # ---------- Intervalos ----------
+    def _fechar(self, i: int, t: float):
+        cod = self.estado[i]
+        if cod == _COD["jogando"]:
+            for k, segundos in fatias(float(self.desde[i]), t, self.periodos.segmentos):
+                self.acum[i, k] += segundos
+        else:
+            col = self._coluna(cod)
+            if col is not None:
+                self.acum[i, col] += max(0.0, t - self.desde[i])
+        self.desde[i] = t
+
+    def _mudar(self, eq: str, numero: int, estado: str, t: float):
+        i = self._linha_de(eq, numero)
+        if self.estado[i] == FORA:
+            self.desde[i] = t
+        else:
+            self._fechar(i, t)
+        self.estado[i] = _COD[estado]
+
+    def _abertos(self, t: float):
+        """Segundos do intervalo aberto de cada linha, por coluna (vetorizado)."""
+        n = self.n
+        dt = np.maximum(0.0, t - self.desde[:n])
+        cod = self.estado[:n]
+        extra = np.zeros((n, LARGURA))
+        for estado in ("banco", "excluido"):
+            c = _COD[estado]
+            extra[:, self._coluna(c)] = np.where(cod == c, dt, 0.0)
+        jogando = cod == _COD["jogando"]
+        if jogando.any():
+            desde = self.desde[:n][jogando]
+            extra[jogando, :_BANCO] = fatiar(desde, np.full(len(desde), t), self.periodos.segmentos)
+        return extra
+
+    # ---------- Pontos de restauração ----------
+    def _copiar(self):
+        # as linhas só são acrescentadas: as n primeiras e o índice (equipe, número)
+        # -> linha se recuperam de equipe/numero, sem copiar o dict a cada ponto
+        n = self.n
+        return (
+            n, self.periodos,
+            self.acum[:n].copy(), self.estado[:n].copy(), self.desde[:n].copy(), self.exclusoes[:n].copy(),
+        )
+
+    def _restaurar(self, copia):
+        n, self.periodos, acum, estado, desde, exclusoes = copia
+        if n < self.n:
+            self._linha = {k: i for k, i in self._linha.items() if i < n}
+        self.n = n
+        self.acum[:n], self.estado[:n], self.desde[:n], self.exclusoes[:n] = acum, estado, desde, exclusoes
+        self.acum[n:] = 0.0
+        self.estado[n:] = FORA
+        self.exclusoes[n:] = 0
+        self._ordem = None
+
+    def refazer_desde(self, eventos, i: int):
+        """
+        Recalcula após inserir um evento na posição i do log: volta ao último
+        ponto de restauração anterior a i e reaplica eventos[ponto:].
+        """
+        while self._checkpoints and self._checkpoints[-1][0] > i:
+            self._checkpoints.pop()
+        if self._checkpoints:
+            self.aplicados, copia = self._checkpoints[-1]
+            self._restaurar(copia)
+        else:
+            self.__init__(len(self.numero))
+        for ev in eventos[self.aplicados:]:
+            self.aplicar(ev)
+
+    # ---------- Eventos ----------
+    def aplicar(self, ev: dict):
+        """Incorpora um evento (em ordem de t) tocando só as linhas envolvidas."""
+        if self.aplicados % PASSO_CHECKPOINT == 0 and not (
+            self._checkpoints and self._checkpoints[-1][0] == self.aplicados
+        ):
+            # depois de refazer_desde o ponto de partida já está guardado: não duplicar
+            self._checkpoints.append((self.aplicados, self._copiar()))
+        self.aplicados += 1
+        t = ev["t"]
+        tipo = ev["tipo"]
+        self.periodos = self.periodos.aplicar(ev)
+        if tipo == "elenco":
+            eq = ev["equipe"]
+            numeros = {int(n) for n in ev["numeros"]}
+            for (e, n), i in self._linha.items():
+                if e == eq and n not in numeros and self.estado[i] != FORA:
+                    self._fechar(i, t)
+                    self.estado[i] = FORA
+            for n in numeros:
+                self._mudar(eq, n, "banco", t)
+                self.exclusoes[self._linha[(eq, n)]] = 0
+        elif tipo == "titulares":
+            eq = ev["equipe"]
+            titulares = {int(n) for n in ev["numeros"]}
+            for (e, n), i in list(self._linha.items()):
+                if e == eq and self.estado[i] != FORA:
+                    self._mudar(eq, n, "jogando" if n in titulares else "banco", t)
+            for n in titulares:
+                i = self._linha_de(eq, n)
+                if self.estado[i] == FORA:
+                    self._mudar(eq, n, "jogando", t)
+                # banco do titular até a titulação não conta
+                self.acum[i, _BANCO] = 0.0
+        else:
+            for eq, n, estado in transicoes(ev):
+                self._mudar(eq, n, estado, t)
+            if tipo == "exclusao":
+                self.exclusoes[self._linha[(ev["equipe"], int(ev["numero"]))]] += 1
+
+    # ---------- Consultas ----------
+    def totais(self, agora: float):
+        """Array (n, 4) com os segundos por coluna (COLUNAS) até 'agora'."""
+        tot = self.acum[:self.n] + self._abertos(agora)
+        return np.column_stack((tot[:, 0], tot[:, 1:_BANCO].sum(axis=1), tot[:, _BANCO], tot[:, _DOISMIN]))
+
+    def totais_por_periodo(self, agora: float):
+        """Array (n, len(PERIODOS)) com os segundos jogados em cada período até 'agora'."""
+        return self.acum[:self.n, :_BANCO] + self._abertos(agora)[:, :_BANCO]
+
+    def ordem(self):
+        """Índices das linhas no elenco, ordenados por (equipe, número)."""
+        if self._ordem is None:
+            n = self.n
+            self._ordem = np.lexsort((self.numero[:n], self.equipe[:n]))
+        return self._ordem[self.estado[self._ordem] != FORA]
+
+    def como_dict(self, agora: float):
+        tot = self.totais(agora)
+        stats = {"A": {}, "B": {}}
+        for (eq, n), i in self._linha.items():
+            stats.setdefault(eq, {})[n] = dict(zip(COLUNAS, map(float, tot[i])))
+        return stats
+
+    def quadro(self, agora: float, cumprido_2min, cores):
+        """
+        DataFrame do relatório (colunas de _stats_to_dataframe), já ordenado.
+        cumprido_2min(eq, numero) -> segundos de 2' cumpridos; cores: {eq: cor}.
+        """
+        import pandas as pd
+
+        idx = self.ordem()
+        if not len(idx):
+            return pd.DataFrame()
+        tot = self.totais(agora)[idx] / 60.0
+        equipes = self.equipe[idx]
+        numeros = self.numero[idx]
+        doismin = np.fromiter(
+            (cumprido_2min(e, int(n)) for e, n in zip(equipes, numeros)), dtype=float, count=len(idx),
+        ) / 60.0
+        return pd.DataFrame({
+            "Equipe": equipes,
+            "Número": numeros,
+            "Estado": np.asarray(ESTADOS)[self.estado[idx]],
+            "Exclusões": self.exclusoes[idx],
+            "Jogado 1ºT (min)": np.round(tot[:, 0], 1),
+            "Jogado 2ºT (min)": np.round(tot[:, 1], 1),
+            "Jogado Total (min)": np.round(tot[:, 0] + tot[:, 1], 1),
+            "Banco (min)": np.round(tot[:, 2], 1),
+            "2 min (min)": np.round(doismin, 1),
+            "CorEquipe": [cores.get(e, "#333") for e in equipes],
+        })
+
@@ -0,0 +1,201 @@
+from collections import deque
+
+from utils import tempo
+from utils.acoes import aplicar_evento, validar_evento
+from utils.elenco import Elenco
+from utils.escalacao import IndiceEscalacao
+from utils.linha_tempo import TabelaStats, inicializar_linha_tempo, posicao_evento
+from utils.penalidades import FilaPenalidades
+from utils.periodos import Periodos
+
+# =====================================================
+# Motor da partida (Python puro, sem Streamlit)
+# =====================================================
+# Um único núcleo de regras para a mesa e para o simulador em lote: o
+# estado da partida (elencos de Jogador, filas de Penalidade, relógio,
+# linha do tempo) + a TabelaStats de tempos. O tempo é sempre passado por
+# quem chama; a Partida (utils/partidas.py) acrescenta relógio de parede,
+# trava, persistência e ouvintes por cima deste motor.
+#
+# Desfazer/refazer: cada ação da mesa (painel das equipes e relógio) guarda
+# um registro inverso pequeno — estado anterior só dos jogadores envolvidos,
+# a penalidade criada/consumida e os campos do relógio e dos períodos — em
+# vez de copiar o estado inteiro. Desfazer tira o evento do log e aplica o inverso; a
+# tabela de tempos se refaz a partir do ponto de restauração anterior.
+# Ações que não se desfazem (elenco, titulares, retroativas) limpam as pilhas.
+
+_ACOES_RELOGIO = {"inicio", "pausa", "zerar", "periodo", "fim_periodo", "tempo_tecnico"}
+DESFAZIVEIS = {"substituicao", "exclusao", "retorno", "expulsao", *_ACOES_RELOGIO}
+_RELOGIO = ("iniciado", "cronometro", "ultimo_tick", "tempo_base", "periodo", "periodos")
+DESFAZER_MAX = 500  # registros inversos guardados (memória limitada numa partida longa)
+
+
+class RegistroInverso:
+    """O necessário para desfazer uma ação da mesa (com __slots__: centenas por partida)."""
+
+    __slots__ = ("ev", "jogadores", "relogio", "criada", "consumida", "seq")
+
+    def __init__(self, ev: dict, jogadores, relogio: tuple | None, criada=None, consumida=None):
+        self.ev = ev
+        self.jogadores = jogadores  # ((numero, estado, elegivel, exclusoes), ...) antes da ação
+        self.relogio = relogio      # valores de _RELOGIO antes da ação (só ações de relógio)
+        self.criada = criada        # Penalidade registrada pela ação
+        self.consumida = consumida  # Penalidade consumida pela ação
+        self.seq = None             # linha no armazenamento (preenchida pela Partida)
+
+
+def estado_inicial() -> dict:
+    """Estado de uma partida nova (mesmas chaves que o app usava na sessão)."""
+    estado = {
+        "equipes": {"A": Elenco(), "B": Elenco()},
+        "cores": {"A": "#00AEEF", "B": "#EC008C"},
+        "nomes": {"A": "Equipe A", "B": "Equipe B"},
+        "titulares_definidos": {"A": False, "B": False},
+        "iniciado": False,
+        "ultimo_tick": tempo.agora(),
+        "cronometro": 0.0,
+        "periodo": "1º Tempo",
+        "periodos": Periodos(),  # fronteiras dos períodos e tempos técnicos (imutável)
+        # penalties[eq] = FilaPenalidades de Penalidade(numero, start, end, consumido)
+        "penalties": {"A": FilaPenalidades(), "B": FilaPenalidades()},
+    }
+    inicializar_linha_tempo(estado)
+    return estado
+
+
+class MotorPartida:
+    """Estado + tabela de tempos de uma partida; aplica eventos validados."""
+
+    def __init__(self):
+        self.estado = estado_inicial()
+        self.tabela = TabelaStats()  # tempos por jogador, mantidos evento a evento
+        self.versao = 0
+        self._desfazer = deque(maxlen=DESFAZER_MAX)  # registros inversos, mais recente no fim
+        self._refazer = []                                # eventos desfeitos, para refazer
+        # IndiceEscalacao mantido evento a evento depois da 1ª consulta; None = montar
+        # do log na próxima (após retroativa, desfazer ou reproduzir, que mexem no passado)
+        self._escalacao = None
+
+    # ---------- Eventos ----------
+    def _aplicar_evento(self, ev: dict, validar: bool = True, refazendo: bool = False) -> dict:
+        if validar:
+            validar_evento(self.estado, ev)
+        desfazivel = ev["tipo"] in DESFAZIVEIS and not ev.get("retro")
+        antes = self._inverso_antes(ev) if desfazivel else None
+        ev = aplicar_evento(self.estado, ev)
+        if ev.get("retro"):
+            # evento no passado: refaz só a partir do ponto de restauração anterior a ele
+            eventos = self.estado["eventos"]
+            self.tabela.refazer_desde(eventos, posicao_evento(eventos, ev))
+            self._escalacao = None
+        else:
+            self.tabela.aplicar(ev)
+            if self._escalacao is not None:
+                self._escalacao.aplicar(ev)
+        self.versao += 1
+        if desfazivel:
+            self._desfazer.append(self._inverso_depois(ev, antes))
+        else:
+            self._desfazer.clear()
+        if not refazendo:
+            self._refazer.clear()
+        return ev
+
+    # ---------- Desfazer / refazer ----------
+    def _inverso_antes(self, ev: dict):
+        eq = ev.get("equipe")
+        jogadores = []
+        if eq:
+            for chave in ("numero", "sai", "entra"):
+                j = self.elenco(eq).get(ev[chave]) if chave in ev else None
+                if j is not None:
+                    jogadores.append((j.numero, j.estado, j.elegivel, j.exclusoes))
+        fila = self.penalidades(eq) if eq else None
+        # ações de jogador não mexem no relógio, e as de relógio desfeitas depois delas
+        # já o restauraram: só as de relógio (inclusive o tempo técnico) guardam os campos
+        relogio = tuple(self.estado[k] for k in _RELOGIO) if ev["tipo"] in _ACOES_RELOGIO else None
+        return tuple(jogadores), relogio, fila._ptr if fila else None
+
+    def _inverso_depois(self, ev: dict, antes) -> RegistroInverso:
+        jogadores, relogio, ptr = antes
+        eq = ev.get("equipe")
+        registro = RegistroInverso(ev, jogadores, relogio)
+        if ev["tipo"] == "exclusao":
+            registro.criada = self.penalidades(eq)._todas[-1]
+        elif ev["tipo"] == "retorno" and self.penalidades(eq)._ptr != ptr:
+            fila = self.penalidades(eq)
+            registro.consumida = fila._fila[fila._ptr - 1]
+        return registro
+
+    def desfazer(self) -> dict | None:
+        """Retira a última ação da mesa e restaura o estado anterior a ela. Devolve o evento."""
+        if not self._desfazer:
+            return None
+        r = self._desfazer.pop()
+        ev = r.ev
+        eventos = self.estado["eventos"]
+        i = posicao_evento(eventos, ev)
+        del eventos[i]
+        eq = ev.get("equipe")
+        if eq:
+            elenco = self.elenco(eq)
+            for numero, estado, elegivel, exclusoes in r.jogadores:
+                elenco.mudar_estado(numero, estado)
+                elenco.definir_elegivel(numero, elegivel)
+                elenco.get(numero).exclusoes = exclusoes
+            if r.criada is not None:
+                self.penalidades(eq).remover(r.criada)
+            if r.consumida is not None:
+                self.penalidades(eq).desconsumir(r.consumida)
+        if r.relogio is not None:
+            self.estado.update(zip(_RELOGIO, r.relogio))
+        self.tabela.refazer_desde(eventos, i)
+        self._escalacao = None
+        self.versao += 1
+        self._refazer.append(ev)
+        return ev
+
+    def refazer(self) -> dict | None:
+        """Reaplica a última ação desfeita (com o mesmo tempo de partida). Devolve o evento."""
+        if not self._refazer:
+            return None
+        ev = self._refazer.pop()
+        dados = {k: v for k, v in ev.items() if k not in ("t", "tipo")}
+        return self._aplicar_evento({"t": ev["t"], "tipo": ev["tipo"], **dados}, refazendo=True)
+
+    def aplicar(self, tipo: str, t: float, **dados) -> dict:
+        """Valida e aplica uma ação no tempo de partida 't' (AcaoInvalida se recusada)."""
+        return self._aplicar_evento({"t": float(t), "tipo": tipo, **dados})
+
+    def reproduzir(self, eventos) -> int:
+        """Reaplica eventos já aceitos (ex.: do armazenamento), sem validar."""
+        n = 0
+        for ev in eventos:
+            aplicar_evento(self.estado, ev)
+            n += 1
+        self.tabela = TabelaStats.a_partir_de(self.estado["eventos"])
+        self._escalacao = None
+        self.versao += n
+        self._desfazer.clear()
+        self._refazer.clear()
+        return n
+
+    # ---------- Consultas ----------
+    def elenco(self, eq: str) -> Elenco:
+        return self.estado["equipes"][eq]
+
+    def penalidades(self, eq: str) -> FilaPenalidades:
+        return self.estado["penalties"][eq]
+
+    def periodos(self) -> Periodos:
+        return self.estado["periodos"]
+
+    def escalacao(self) -> IndiceEscalacao:
+        """Índice de quem estava em quadra quando (montado do log só na 1ª consulta após mexer no passado)."""
+        if self._escalacao is None:
+            self._escalacao = IndiceEscalacao(self.estado["eventos"])
+        return self._escalacao
+
+    def tempos(self, agora: float):
+        """{eq: {numero: {coluna: segundos}}} até 'agora' (tempo de partida)."""
+        return self.tabela.como_dict(agora)
@@ -0,0 +1,211 @@
+import threading
+from collections import deque
+from contextlib import contextmanager
+
+from utils import instantaneo, tempo
+from utils.motor import MotorPartida
+from utils.penalidades import id_penalidade
+
+# =====================================================
+# Registro de partidas (modo servidor, várias quadras)
+# =====================================================
+# Um único RegistroPartidas por processo (via st.cache_resource no app)
+# guarda o estado de cada partida pelo id da URL (?partida=quadra3). Todas
+# as sessões de mesa e de público que abrem o mesmo id compartilham o mesmo
+# dict de estado; leituras podem ser concorrentes e cada escrita é feita
+# sob a trava exclusiva da partida.
+#
+# A cada INSTANTANEO_CADA eventos gravados a partida salva um instantâneo
+# compacto (utils.instantaneo); ao reabrir num processo novo, carrega o
+# instantâneo e reaplica só a cauda de eventos gravada depois dele.
+
+INSTANTANEO_CADA = 200
+
+
+class TravaLeituraEscrita:
+    """Vários leitores ou um escritor (escritores têm preferência)."""
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._leitores = 0
+        self._escrevendo = False
+        self._esperando = 0
+
+    @contextmanager
+    def leitura(self):
+        with self._cond:
+            while self._escrevendo or self._esperando:
+                self._cond.wait()
+            self._leitores += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._leitores -= 1
+                if not self._leitores:
+                    self._cond.notify_all()
+
+    @contextmanager
+    def escrita(self):
+        with self._cond:
+            self._esperando += 1
+            while self._escrevendo or self._leitores:
+                self._cond.wait()
+            self._esperando -= 1
+            self._escrevendo = True
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._escrevendo = False
+                self._cond.notify_all()
+
+
+class Partida(MotorPartida):
+    """Motor compartilhado de uma partida + trava + versão (conta as escritas)."""
+
+    def __init__(self, partida_id: str, armazenamento=None):
+        super().__init__()
+        self.id = partida_id
+        self.armazenamento = armazenamento
+        self._trava = TravaLeituraEscrita()
+        self._ouvintes = []
+        # 2' que o agendador viu terminar (mais recentes no fim); não entram na linha do tempo
+        self.expiradas = deque(maxlen=20)
+        self._ultimo_seq = 0      # maior seq gravado por esta partida
+        self._seq_instantaneo = 0  # seq do último instantâneo salvo
+
+    def leitura(self):
+        return self._trava.leitura()
+
+    def escrita(self):
+        return self._trava.escrita()
+
+    def assinar(self, ouvinte):
+        """Registra ouvinte(partida, ev) chamado após cada escrita (fora da trava)."""
+        self._ouvintes.append(ouvinte)
+
+    # ---------- Relógio ----------
+    def tempo_logico(self) -> float:
+        """Tempo exibido no cronômetro (reinicia no 'Zerar')."""
+        e = self.estado
+        if e["iniciado"]:
+            return e["cronometro"] + (tempo.agora() - e["ultimo_tick"])
+        return e["cronometro"]
+
+    def tempo_partida(self) -> float:
+        """Tempo de jogo monotônico da partida; base da linha do tempo."""
+        return self.estado["tempo_base"] + self.tempo_logico()
+
+    # ---------- Escrita ----------
+    def aplicar(self, tipo: str, t: float | None = None, **dados) -> dict:
+        """Valida e aplica uma ação sob a trava de escrita e a persiste (AcaoInvalida se recusada)."""
+        with self.escrita():
+            ev = {"t": float(self.tempo_partida() if t is None else t), "tipo": tipo, **dados}
+            ev = self._aplicar_evento(ev)
+            self._persistir(ev)
+        self._notificar(ev)
+        return ev
+
+    def desfazer(self) -> dict | None:
+        """Desfaz a última ação da mesa (estado, tabela e armazenamento)."""
+        with self.escrita():
+            seq = self._desfazer[-1].seq if self._desfazer else None
+            ev = super().desfazer()
+            if ev is not None and seq is not None:
+                self.armazenamento.remover(seq)
+                if seq <= self._seq_instantaneo:
+                    self._salvar_instantaneo()  # o salvo incluía a ação desfeita
+        if ev is not None:
+            self._notificar(ev)
+        return ev
+
+    def refazer(self) -> dict | None:
+        with self.escrita():
+            ev = super().refazer()
+            if ev is not None:
+                self._persistir(ev)
+        if ev is not None:
+            self._notificar(ev)
+        return ev
+
+    def marcar_expirada(self, equipe: str, p):
+        """Chamado pelo AgendadorPenalidades quando um 2' termina; avisa os ouvintes."""
+        with self.escrita():
+            self.expiradas.append(id_penalidade(equipe, p))
+            self.versao += 1
+        self._notificar({"t": p.end, "tipo": "expirou", "equipe": equipe, "numero": p.numero})
+
+    def _persistir(self, ev: dict):
+        if self.armazenamento is None:
+            return
+        seq = self.armazenamento.registrar(self.id, ev)
+        if self._desfazer and self._desfazer[-1].ev is ev:
+            self._desfazer[-1].seq = seq  # para apagar a linha se a ação for desfeita
+        self._ultimo_seq = seq
+        if len(self.estado["eventos"]) % INSTANTANEO_CADA == 0:
+            self._salvar_instantaneo()
+
+    def _salvar_instantaneo(self):
+        # chamado com a trava de escrita: o estado é exatamente o dos eventos até _ultimo_seq
+        self.armazenamento.salvar_instantaneo(self.id, self._ultimo_seq, instantaneo.serializar(self))
+        self._seq_instantaneo = self._ultimo_seq
+
+    def _notificar(self, ev: dict):
+        for ouvinte in list(self._ouvintes):
+            ouvinte(self, ev)
+
+    def restaurar(self) -> int:
+        """Reconstrói a partida do armazenamento; devolve o nº de eventos reaplicados."""
+        if self.armazenamento is None:
+            return 0
+        salvo = self.armazenamento.instantaneo(self.id)
+        with self.escrita():
+            if salvo is not None:
+                try:
+                    instantaneo.restaurar(salvo[1], self)
+                except ValueError:
+                    salvo = None  # instantâneo de outra versão: reaplica o log inteiro
+            if salvo is None:
+                cauda = list(self.armazenamento.iterar(self.id))
+                self.reproduzir(ev for _, ev in cauda)
+            else:
+                self._seq_instantaneo = salvo[0]
+                cauda = list(self.armazenamento.iterar(self.id, desde=self._seq_instantaneo))
+                for _, ev in cauda:
+                    self._aplicar_evento(ev, validar=False)
+                self._desfazer.clear()
+                self._refazer.clear()
+            self._ultimo_seq = cauda[-1][0] if cauda else self._seq_instantaneo
+        return len(cauda)
+
+
+class RegistroPartidas:
+    """Partidas ativas no processo, indexadas pelo id."""
+
+    def __init__(self, armazenamento=None, ao_criar=None):
+        self.armazenamento = armazenamento
+        self.ao_criar = ao_criar  # ao_criar(partida) após a restauração (ex.: agendador)
+        self._partidas = {}
+        self._lock = threading.Lock()
+
+    def obter(self, partida_id: str) -> Partida:
+        """Partida pelo id; na primeira vez é criada e restaurada do armazenamento."""
+        with self._lock:
+            partida = self._partidas.get(partida_id)
+            if partida is None:
+                partida = Partida(partida_id, self.armazenamento)
+                partida.restaurar()
+                self._partidas[partida_id] = partida
+                if self.ao_criar is not None:
+                    self.ao_criar(partida)
+            return partida
+
+    def ativa(self, partida_id: str) -> Partida | None:
+        """Partida já aberta no processo, sem criar nem restaurar (None se não há)."""
+        with self._lock:
+            return self._partidas.get(partida_id)
+
+    def ids(self):
+        with self._lock:
+            return list(self._partidas)
@@ -0,0 +1,142 @@
+import bisect
+
+# =====================================================
+# Fila de penalidades (2') de uma equipe
+# =====================================================
+# Cada penalidade é um objeto Penalidade (numero, start, end, consumido; com
+# __slots__) e elas ficam numa lista ordenada pelo fim ('end'). As consumidas (retorno já
+# confirmado no "Completou") formam o prefixo [:_ptr], então:
+#   concluídas não consumidas = _fila[_ptr:i]   (end <= agora)
+#   ativas                    = _fila[i:]       (end >  agora)
+# com i obtido por busca binária.
+
+DURACAO_2MIN = 120.0
+
+
+class Penalidade:
+    """Exclusão de 2' de um jogador, em tempo de partida."""
+
+    __slots__ = ("numero", "start", "end", "consumido")
+
+    def __init__(self, numero: int, start: float, end: float, consumido: bool = False):
+        self.numero = int(numero)
+        self.start = float(start)
+        self.end = float(end)
+        self.consumido = consumido
+
+    def __repr__(self):
+        return f"Penalidade(#{self.numero}, {self.start:.1f}–{self.end:.1f}{', consumida' if self.consumido else ''})"
+
+
+def _fim(p):
+    return p.end
+
+
+def id_penalidade(equipe: str, p: Penalidade) -> str:
+    """Identificador estável de uma penalidade (usado pelos componentes de relógio)."""
+    return f"pen_{equipe}_{p.numero}_{int(p.start)}"
+
+
+class FilaPenalidades:
+    """Penalidades de uma equipe ordenadas por fim, com ponteiro de consumidas."""
+
+    def __init__(self, duracao: float = DURACAO_2MIN):
+        self.duracao = float(duracao)
+        self._todas = []        # ordem de registro
+        self._fila = []         # ordenada por 'end'; [:_ptr] consumidas
+        self._ptr = 0
+        self._por_jogador = {}  # numero -> (penalidades por 'end', soma acumulada das durações)
+
+    @classmethod
+    def restaurar(cls, duracao: float, penalidades, consumidas: int) -> "FilaPenalidades":
+        """Fila a partir de (numero, start) em ordem de registro e do nº de consumidas."""
+        fila = cls(duracao)
+        for numero, start in penalidades:
+            fila.registrar(numero, start)
+        for p in fila._fila[:consumidas]:
+            p.consumido = True
+        fila._ptr = int(consumidas)
+        return fila
+
+    def __iter__(self):
+        return iter(self._todas)
+
+    def __len__(self):
+        return len(self._todas)
+
+    def contem(self, p: Penalidade) -> bool:
+        """True se 'p' ainda está registrada (não foi desfeita)."""
+        return any(q is p for q in reversed(self._todas))
+
+    # ---------- Registro ----------
+    def registrar(self, numero: int, start: float) -> Penalidade:
+        p = Penalidade(numero, start, float(start) + self.duracao)
+        self._todas.append(p)
+        bisect.insort_right(self._fila, p, lo=self._ptr, key=_fim)
+
+        pens, acum = self._por_jogador.setdefault(p.numero, ([], [0.0]))
+        k = bisect.bisect_right(pens, p.end, key=_fim)
+        pens.insert(k, p)
+        self._refazer_acum(pens, acum, k)
+        return p
+
+    @staticmethod
+    def _refazer_acum(pens, acum, k: int):
+        # refaz a soma acumulada só a partir de k (fim da lista = O(1))
+        del acum[k + 1:]
+        for q in pens[k:]:
+            acum.append(acum[-1] + (q.end - q.start))
+
+    # ---------- Desfazer ----------
+    def remover(self, p: Penalidade):
+        """Retira uma penalidade registrada (desfazer do registrar)."""
+        self._todas.remove(p)
+        i = next(i for i in range(self._ptr, len(self._fila)) if self._fila[i] is p)
+        del self._fila[i]
+        pens, acum = self._por_jogador[p.numero]
+        k = next(k for k, q in enumerate(pens) if q is p)
+        del pens[k]
+        self._refazer_acum(pens, acum, k)
+
+    def desconsumir(self, p: Penalidade):
+        """Desfaz o último consumir_mais_antiga (p precisa ser a última consumida)."""
+        assert self._ptr and self._fila[self._ptr - 1] is p
+        p.consumido = False
+        self._ptr -= 1
+
+    # ---------- Consultas ----------
+    def _corte(self, agora: float) -> int:
+        return bisect.bisect_right(self._fila, agora, lo=self._ptr, key=_fim)
+
+    def ativas(self, agora: float):
+        """Penalidades ainda correndo (agora < end), por ordem de fim."""
+        return self._fila[self._corte(agora):]
+
+    def concluidas_nao_consumidas(self, agora: float):
+        """Penalidades cumpridas cujo retorno ainda não foi confirmado."""
+        return self._fila[self._ptr:self._corte(agora)]
+
+    def mais_antiga_concluida(self, agora: float):
+        if self._ptr < len(self._fila) and self._fila[self._ptr].end <= agora:
+            return self._fila[self._ptr]
+        return None
+
+    def consumir_mais_antiga(self, agora: float):
+        """Marca como consumida a penalidade concluída mais antiga (ou None)."""
+        p = self.mais_antiga_concluida(agora)
+        if p is not None:
+            p.consumido = True
+            self._ptr += 1
+        return p
+
+    def cumprido(self, numero: int, agora: float) -> float:
+        """Segundos de 2' já cumpridos pelo jogador até 'agora'."""
+        pens, acum = self._por_jogador.get(int(numero), ((), (0.0,)))
+        k = bisect.bisect_right(pens, agora, key=_fim)
+        total = acum[k]
+        # penalidades ainda em curso (duração fixa: ordem por fim == ordem por início)
+        for p in pens[k:]:
+            if p.start >= agora:
+                break
+            total += agora - p.start
+        return total
@@ -0,0 +1,132 @@
+import functools
+import json
+import os
+import pickle
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+
+import streamlit as st
+
+# =====================================================
+# Instrumentação opcional dos reruns (?perfil=1 ou HANDEBOL_PERFIL=1)
+# =====================================================
+# Cada rerun completo vira um registro {secao: {"ms", "chamadas"}} +
+# contadores (componentes emitidos) + tamanho do session_state, guardado
+# num histórico curto da sessão e exibido na barra lateral. Desligada, a
+# única coisa que roda por chamada é o teste de 'ativo()' — medir() devolve
+# um nullcontext compartilhado e cronometrado() chama a função direto.
+# Reruns de fragmento não passam pelo início/fim do script: o que medem
+# entra no registro do próximo rerun completo.
+
+_CHAVE = "_perfil"
+_NULO = nullcontext()
+HISTORICO = 50
+
+
+def ativo() -> bool:
+    return _CHAVE in st.session_state
+
+
+def iniciar_rerun():
+    """Chame no topo do app: liga/desliga pela URL e abre o registro deste rerun."""
+    ligar = st.query_params.get("perfil") == "1" or os.environ.get("HANDEBOL_PERFIL") == "1"
+    if not ligar:
+        st.session_state.pop(_CHAVE, None)
+        return
+    st.session_state.setdefault(_CHAVE, {"historico": deque(maxlen=HISTORICO), "atual": None})
+    _atual()["inicio"] = time.perf_counter()
+
+
+def _atual() -> dict:
+    p = st.session_state[_CHAVE]
+    if p["atual"] is None:
+        p["atual"] = {"secoes": {}, "contadores": {}}
+    return p["atual"]
+
+
+@contextmanager
+def _medir(nome: str):
+    secoes = _atual()["secoes"]
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        s = secoes.setdefault(nome, {"ms": 0.0, "chamadas": 0})
+        s["ms"] += (time.perf_counter() - t0) * 1000
+        s["chamadas"] += 1
+
+
+def medir(nome: str):
+    """with medir("secao"): ...  — cronometra o bloco (sem custo se desligado)."""
+    return _medir(nome) if ativo() else _NULO
+
+
+def cronometrado(nome: str | None = None):
+    """Decorador: cronometra cada chamada da função como a seção 'nome'."""
+    def deco(fn):
+        rotulo = nome or fn.__name__
+
+        @functools.wraps(fn)
+        def envolvida(*args, **kwargs):
+            if not ativo():
+                return fn(*args, **kwargs)
+            with _medir(rotulo):
+                return fn(*args, **kwargs)
+        return envolvida
+    return deco
+
+
+def contar(nome: str, n: int = 1):
+    """Soma 'n' ao contador 'nome' do rerun atual (ex.: componentes emitidos)."""
+    if ativo():
+        cont = _atual()["contadores"]
+        cont[nome] = cont.get(nome, 0) + n
+
+
+def _tamanho_sessao():
+    """(chaves, bytes serializáveis) do session_state; itens não serializáveis contam 0 bytes."""
+    total = 0
+    chaves = [k for k in st.session_state.keys() if k != _CHAVE]
+    for k in chaves:
+        try:
+            total += len(pickle.dumps(st.session_state[k], protocol=pickle.HIGHEST_PROTOCOL))
+        except Exception:
+            pass
+    return len(chaves), total
+
+
+def finalizar_rerun():
+    """Chame no fim do app: fecha o registro e desenha o painel de depuração."""
+    if not ativo():
+        return
+    p = st.session_state[_CHAVE]
+    atual, p["atual"] = p["atual"], None
+    chaves, tamanho = _tamanho_sessao()
+    registro = {
+        "total_ms": round((time.perf_counter() - atual.pop("inicio")) * 1000, 2),
+        "secoes": {k: {"ms": round(v["ms"], 2), "chamadas": v["chamadas"]} for k, v in atual["secoes"].items()},
+        "contadores": atual["contadores"],
+        "session_state": {"chaves": chaves, "bytes": tamanho},
+    }
+    p["historico"].append(registro)
+    _painel(registro, list(p["historico"]))
+
+
+def _painel(registro: dict, historico):
+    with st.sidebar:
+        st.markdown("### ⏱️ Perfil do rerun")
+        st.metric("Rerun (ms)", registro["total_ms"])
+        if registro["secoes"]:
+            st.dataframe(
+                [{"Seção": k, "ms": v["ms"], "Chamadas": v["chamadas"]} for k, v in registro["secoes"].items()],
+                hide_index=True,
+            )
+        for k, v in registro["contadores"].items():
+            st.caption(f"{k}: {v}")
+        ss = registro["session_state"]
+        st.caption(f"session_state: {ss['chaves']} chaves, {ss['bytes'] / 1024:.1f} KiB")
+        st.download_button(
+            "Baixar JSON", json.dumps(historico, indent=2, ensure_ascii=False),
+            file_name="perfil_reruns.json", mime="application/json", key="_perfil_json",
+        )
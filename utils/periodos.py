@@ -0,0 +1,128 @@
+import numpy as np
+
+# =====================================================
+# Períodos da partida (tempos, intervalo, tempos técnicos, prorrogações)
+# =====================================================
+# As fronteiras ficam no tempo de partida (o "t" da linha do tempo, que só
+# avança com o relógio rodando), registradas pelos próprios eventos:
+#   inicio        com o período encerrado, abre o próximo (2º tempo, prorrogações)
+#   fim_periodo   encerra o período aberto e para o relógio (intervalo)
+#   tempo_tecnico para o relógio e conta o pedido da equipe
+#   periodo       (logs antigos) troca direto para o período nomeado
+# Periodos é imutável: cada evento devolve um objeto novo, então o estado,
+# os pontos de restauração da tabela e o desfazer guardam só a referência.
+#
+# Minutos por período: fatiar() corta de uma vez todos os intervalos
+# [desde, ate] nas fronteiras — matriz (n, segmentos) de sobreposições
+# somada por período —, sem depender de qual período estava selecionado.
+
+PERIODOS = ("1º Tempo", "2º Tempo", "1ª Prorrogação", "2ª Prorrogação")
+DURACOES = (30 * 60.0, 30 * 60.0, 5 * 60.0, 5 * 60.0)  # no cronômetro (adulto: 2 x 30 + 2 x 5)
+REGULAMENTARES = 2  # períodos do tempo normal; os demais são prorrogação
+INTERVALO = "Intervalo"
+TECNICOS_POR_EQUIPE = 3  # no tempo normal, nenhum na prorrogação
+TECNICOS_POR_TEMPO = 2
+
+
+class Periodos:
+    """Segmentos (período, início) no tempo de partida + tempos técnicos pedidos."""
+
+    __slots__ = ("segmentos", "aberto", "tecnicos")
+
+    def __init__(self, segmentos=((0, 0.0),), aberto: bool = True, tecnicos=()):
+        self.segmentos = tuple(segmentos)  # ((índice em PERIODOS, início), ...) em ordem de t
+        self.aberto = aberto               # False no intervalo (período encerrado)
+        self.tecnicos = tuple(tecnicos)    # ((equipe, t, período), ...)
+
+    # ---------- Eventos ----------
+    def _abrir(self, k: int, t: float) -> "Periodos":
+        segmentos = self.segmentos
+        if segmentos[-1][1] == t:
+            segmentos = segmentos[:-1]  # nenhum tempo jogado no segmento anterior
+        return Periodos(segmentos + ((k, t),), True, self.tecnicos)
+
+    def aplicar(self, ev: dict) -> "Periodos":
+        """Periodos após o evento (o próprio objeto se o evento não mexe em período)."""
+        tipo = ev["tipo"]
+        if tipo == "inicio" and not self.aberto:
+            return self._abrir(self.atual + 1, ev["t"])
+        if tipo == "fim_periodo":
+            return Periodos(self.segmentos, False, self.tecnicos)
+        if tipo == "tempo_tecnico":
+            return Periodos(self.segmentos, self.aberto, self.tecnicos + ((ev["equipe"], ev["t"], self.atual),))
+        if tipo == "periodo":
+            return self._abrir(PERIODOS.index(ev["periodo"]), ev["t"])
+        return self
+
+    # ---------- Consultas ----------
+    @property
+    def atual(self) -> int:
+        """Índice (em PERIODOS) do período aberto ou do último encerrado."""
+        return self.segmentos[-1][0]
+
+    @property
+    def nome(self) -> str:
+        return PERIODOS[self.atual] if self.aberto else INTERVALO
+
+    @property
+    def proximo(self) -> int | None:
+        """Período que o próximo 'inicio' abre (None se há um aberto ou se acabaram)."""
+        if self.aberto or self.atual + 1 >= len(PERIODOS):
+            return None
+        return self.atual + 1
+
+    def comecou(self, t: float) -> bool:
+        """True se há período aberto e o relógio já correu nele até 't'."""
+        return self.aberto and t > self.segmentos[-1][1]
+
+    def fim_previsto(self) -> float | None:
+        """Tempo de partida em que o período aberto completa a duração regulamentar."""
+        if not self.aberto:
+            return None
+        return self.segmentos[-1][1] + DURACOES[self.atual]
+
+    def tecnicos_de(self, eq: str, periodo: int | None = None) -> int:
+        return sum(1 for e, _, k in self.tecnicos if e == eq and (periodo is None or k == periodo))
+
+    def como_dict(self) -> dict:
+        return {"segmentos": self.segmentos, "aberto": self.aberto, "tecnicos": self.tecnicos}
+
+    @classmethod
+    def de_dict(cls, dados: dict) -> "Periodos":
+        return cls(
+            (tuple(s) for s in dados["segmentos"]), dados["aberto"], (tuple(x) for x in dados["tecnicos"]),
+        )
+
+
+def fatias(desde: float, ate: float, segmentos):
+    """[(período, segundos)] de um único intervalo [desde, ate] (sem arrays: um evento fecha poucos)."""
+    saida = []
+    for j, (k, inicio) in enumerate(segmentos):
+        fim = segmentos[j + 1][1] if j + 1 < len(segmentos) else ate
+        s = min(ate, fim) - (max(desde, inicio) if j else desde)
+        if s > 0:
+            saida.append((k, s))
+    return saida
+
+
+def fatiar(desde, ate, segmentos) -> np.ndarray:
+    """
+    Array (n, len(PERIODOS)) com os segundos de cada intervalo [desde[i], ate[i]]
+    dentro de cada período. O primeiro segmento vale desde -inf e o último até +inf.
+    """
+    desde = np.asarray(desde, dtype=float)
+    ate = np.asarray(ate, dtype=float)
+    if len(segmentos) == 1:
+        saida = np.zeros((len(desde), len(PERIODOS)))
+        saida[:, segmentos[0][0]] = np.maximum(0.0, ate - desde)
+        return saida
+    ks = [k for k, _ in segmentos]
+    inicios = np.array([s for _, s in segmentos])
+    inicios[0] = -np.inf
+    fins = np.append(inicios[1:], np.inf)
+    sobrepostos = np.maximum(
+        0.0, np.minimum(ate[:, None], fins) - np.maximum(desde[:, None], inicios),
+    )  # (n, segmentos)
+    por_periodo = np.zeros((len(segmentos), len(PERIODOS)))
+    por_periodo[np.arange(len(segmentos)), ks] = 1.0
+    return sobrepostos @ por_periodo
@@ -0,0 +1,138 @@
+import json
+import os
+import sqlite3
+import threading
+
+# =====================================================
+# Armazenamento persistente da partida (SQLite, modo WAL)
+# =====================================================
+# Cada ação que muda o estado vira uma linha na tabela 'eventos' (append,
+# O(1) por ação). Os commits são agrupados: no máximo 'lote' eventos ou
+# 'intervalo' segundos por transação, e um timer garante o commit mesmo que
+# o script seja interrompido por st.rerun(). Ao abrir uma nova sessão, o
+# estado é reconstruído reaplicando os eventos gravados (ver utils.partidas).
+# A tabela 'instantaneos' guarda, por partida, o último instantâneo compacto
+# (utils.instantaneo) e o 'seq' até onde ele vale: restaurar = carregar o
+# instantâneo + reaplicar só os eventos depois dele.
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS eventos (
+    seq     INTEGER PRIMARY KEY AUTOINCREMENT,
+    partida TEXT NOT NULL,
+    t       REAL NOT NULL,
+    tipo    TEXT NOT NULL,
+    dados   TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS eventos_partida ON eventos (partida, seq);
+CREATE TABLE IF NOT EXISTS instantaneos (
+    partida TEXT PRIMARY KEY,
+    seq     INTEGER NOT NULL,
+    dados   BLOB NOT NULL
+);
+"""
+
+
+class ArmazenamentoSQLite:
+    """Log de eventos por partida com commits em lote (seguro entre threads)."""
+
+    def __init__(self, caminho: str = "dados/partidas.db", lote: int = 50, intervalo: float = 0.5):
+        pasta = os.path.dirname(caminho)
+        if pasta:
+            os.makedirs(pasta, exist_ok=True)
+        self.lote = int(lote)
+        self.intervalo = float(intervalo)
+        self._lock = threading.Lock()
+        self._pendentes = 0
+        self._timer = None
+        self._con = sqlite3.connect(caminho, check_same_thread=False)
+        self._con.execute("PRAGMA journal_mode=WAL")
+        self._con.execute("PRAGMA synchronous=NORMAL")
+        self._con.executescript(_SCHEMA)
+        self._con.commit()
+
+    # ---------- Escrita ----------
+    def registrar(self, partida: str, ev: dict) -> int:
+        """Grava o evento; devolve o 'seq' da linha (para remover() no desfazer)."""
+        dados = {k: v for k, v in ev.items() if k not in ("t", "tipo")}
+        with self._lock:
+            seq = self._con.execute(
+                "INSERT INTO eventos (partida, t, tipo, dados) VALUES (?, ?, ?, ?)",
+                (partida, float(ev["t"]), ev["tipo"], json.dumps(dados, ensure_ascii=False)),
+            ).lastrowid
+            self._agendar_commit()
+        return seq
+
+    def remover(self, seq: int):
+        """Apaga um evento gravado (ação desfeita na mesa)."""
+        with self._lock:
+            self._con.execute("DELETE FROM eventos WHERE seq = ?", (int(seq),))
+            self._agendar_commit()
+
+    def salvar_instantaneo(self, partida: str, seq: int, dados: bytes):
+        """Substitui o instantâneo da partida (válido para os eventos com seq <= 'seq')."""
+        with self._lock:
+            self._con.execute(
+                "INSERT OR REPLACE INTO instantaneos (partida, seq, dados) VALUES (?, ?, ?)",
+                (partida, int(seq), sqlite3.Binary(dados)),
+            )
+            self._agendar_commit()
+
+    def _agendar_commit(self):
+        # chamado com self._lock: commit por lote ou pelo timer de 'intervalo'
+        self._pendentes += 1
+        if self._pendentes >= self.lote:
+            self._commit()
+        elif self._timer is None:
+            self._timer = threading.Timer(self.intervalo, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _commit(self):
+        if self._pendentes:
+            self._con.commit()
+            self._pendentes = 0
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def flush(self):
+        with self._lock:
+            self._commit()
+
+    # ---------- Leitura ----------
+    def iterar(self, partida: str, lote: int = 1000, desde: int = 0):
+        """Eventos gravados da partida em páginas de 'lote' linhas: (seq, evento) com seq > 'desde', na ordem aplicada."""
+        ultimo = int(desde)
+        while True:
+            with self._lock:
+                linhas = self._con.execute(
+                    "SELECT seq, t, tipo, dados FROM eventos WHERE partida = ? AND seq > ? ORDER BY seq LIMIT ?",
+                    (partida, ultimo, lote),
+                ).fetchall()
+            for seq, t, tipo, dados in linhas:
+                yield seq, {"t": t, "tipo": tipo, **json.loads(dados)}
+            if len(linhas) < lote:
+                return
+            ultimo = linhas[-1][0]
+
+    def instantaneo(self, partida: str):
+        """(seq, bytes) do último instantâneo da partida, ou None."""
+        with self._lock:
+            linha = self._con.execute(
+                "SELECT seq, dados FROM instantaneos WHERE partida = ?", (partida,)
+            ).fetchone()
+        return (linha[0], bytes(linha[1])) if linha else None
+
+    def partidas(self):
+        """Ids de todas as partidas gravadas, na ordem do primeiro evento."""
+        with self._lock:
+            linhas = self._con.execute(
+                "SELECT partida FROM eventos GROUP BY partida ORDER BY MIN(seq)"
+            ).fetchall()
+        return [p for (p,) in linhas]
+
+    def fechar(self):
+        with self._lock:
+            self._commit()
+            self._con.close()
+
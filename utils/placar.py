@@ -0,0 +1,185 @@
+import json
+import threading
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from utils import tempo
+
+# =====================================================
+# Placar para o público (somente leitura), alimentado por diffs
+# =====================================================
+# O placar de uma partida é um dict pequeno: relógio + uma entrada por equipe
+# (nome, cor, em quadra, cumprindo 2', penalidades ativas). A cada escrita na
+# partida o CanalPlacar recalcula esse dict e guarda apenas as chaves que
+# mudaram. Um servidor HTTP leve (Server-Sent Events) empurra esses diffs
+# para os navegadores: o script do Streamlit da página de placar roda uma
+# única vez, e dezenas de telas custam só uma thread parada por conexão.
+# O mesmo servidor responde GET /hora, usado pelos componentes de relógio
+# para medir a diferença entre o relógio do navegador e o do servidor.
+
+
+def quadra_e_excluidos(elenco):
+    """Números em quadra e cumprindo 2' (elegíveis), ordenados — os chips do painel."""
+    return sorted(elenco.por_estado("jogando")), sorted(elenco.por_estado("excluido"))
+
+
+def snapshot(partida) -> dict:
+    """Estado do placar (chame com a trava de leitura da partida)."""
+    estado = partida.estado
+    agora = partida.tempo_partida()
+    placar = {
+        "relogio": {
+            "iniciado": estado["iniciado"],
+            "cronometro": estado["cronometro"],
+            "ultimo_tick": estado["ultimo_tick"],
+            "tempo_base": estado["tempo_base"],
+        },
+        "expiradas": list(getattr(partida, "expiradas", ())),
+    }
+    for eq in ("A", "B"):
+        quadra, excluidos = quadra_e_excluidos(estado["equipes"][eq])
+        placar[eq] = {
+            "nome": estado["nomes"].get(eq) or f"Equipe {eq}",
+            "cor": estado["cores"].get(eq, "#333"),
+            "quadra": quadra,
+            "excluidos": excluidos,
+            "penalidades": [
+                {"numero": p.numero, "end": p.end}
+                for p in estado["penalties"][eq].ativas(agora)
+            ],
+        }
+    return placar
+
+
+class CanalPlacar:
+    """Último placar de uma partida + histórico curto de diffs por versão."""
+
+    def __init__(self, partida, historico: int = 256):
+        self.partida = partida
+        self._cond = threading.Condition()
+        self._diffs = deque(maxlen=historico)  # (versao, {chave: valor})
+        self._esquecida = -1                   # maior versão já descartada do histórico
+        with partida.leitura():
+            self._placar = snapshot(partida)
+            self.versao = partida.versao
+        partida.assinar(self.publicar)
+
+    def publicar(self, partida, ev=None):
+        with partida.leitura():
+            novo = snapshot(partida)
+            versao = partida.versao
+        with self._cond:
+            diff = {k: v for k, v in novo.items() if self._placar.get(k) != v}
+            self._placar = novo
+            self.versao = versao
+            if diff:
+                if len(self._diffs) == self._diffs.maxlen:
+                    self._esquecida = self._diffs[0][0]
+                self._diffs.append((versao, diff))
+            self._cond.notify_all()
+
+    def atual(self):
+        with self._cond:
+            return self.versao, self._placar
+
+    def aguardar(self, desde: int, timeout: float = 15.0):
+        """
+        Bloqueia até haver versão > 'desde' (ou timeout).
+        Retorna (versao, diff) com as chaves alteradas desde 'desde', ou
+        (versao, placar completo) se o histórico já não cobre 'desde'.
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: self.versao > desde, timeout=timeout)
+            if self.versao <= desde:
+                return desde, {}
+            if desde < self._esquecida:
+                return self.versao, dict(self._placar)
+            diff = {}
+            for v, d in self._diffs:
+                if v > desde:
+                    diff.update(d)
+            return self.versao, diff
+
+
+class CentralPlacar:
+    """Canais de placar por partida (criados sob demanda, só para partidas já abertas)."""
+
+    def __init__(self, partida_ativa):
+        self._partida_ativa = partida_ativa  # partida_ativa(id) -> Partida | None, sem criar
+        self._canais = {}
+        self._lock = threading.Lock()
+
+    def canal(self, partida_id: str) -> CanalPlacar | None:
+        """Canal da partida, ou None se ela não está aberta no servidor."""
+        with self._lock:
+            canal = self._canais.get(partida_id)
+            if canal is None:
+                partida = self._partida_ativa(partida_id)
+                if partida is None:
+                    return None
+                canal = CanalPlacar(partida)
+                self._canais[partida_id] = canal
+            return canal
+
+
+class _HandlerPlacar(BaseHTTPRequestHandler):
+    central: CentralPlacar = None
+
+    def log_message(self, *args):
+        pass
+
+    def _sse(self, nome: str, versao: int, dados: dict):
+        msg = f"event: {nome}\nid: {versao}\ndata: {json.dumps(dados, ensure_ascii=False)}\n\n"
+        self.wfile.write(msg.encode("utf-8"))
+        self.wfile.flush()
+
+    def _hora(self):
+        # sincronização dos navegadores: hora do servidor (utils.tempo) em JSON
+        corpo = json.dumps({"agora": tempo.agora()}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Cache-Control", "no-store")
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.send_header("Content-Length", str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        partida_id = parse_qs(url.query).get("partida", ["principal"])[0]
+        if url.path == "/hora":
+            self._hora()
+            return
+        canal = self.central.canal(partida_id) if url.path == "/placar" else None
+        if canal is None:
+            # só partidas já abertas na mesa: um id qualquer não cria partida nem canal
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.end_headers()
+        try:
+            versao, placar = canal.atual()
+            self._sse("placar", versao, placar)
+            while True:
+                nova, diff = canal.aguardar(versao)
+                if nova == versao:
+                    self.wfile.write(b": ping\n\n")  # mantém a conexão viva
+                    self.wfile.flush()
+                    continue
+                self._sse("diff", nova, diff)
+                versao = nova
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+def iniciar_servidor_placar(central: CentralPlacar, porta: int = 8502, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """Sobe o servidor SSE do placar numa thread daemon, escutando em 'host'."""
+    handler = type("HandlerPlacar", (_HandlerPlacar,), {"central": central})
+    servidor = ThreadingHTTPServer((host, porta), handler)
+    servidor.daemon_threads = True
+    threading.Thread(target=servidor.serve_forever, daemon=True, name="placar-sse").start()
+    return servidor
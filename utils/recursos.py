@@ -0,0 +1,38 @@
+import functools
+import os
+
+import streamlit as st
+
+# =====================================================
+# Recursos estáticos (CSS, HTML) em cache por processo
+# =====================================================
+# Os arquivos de utils/estaticos/ são lidos do disco uma única vez por
+# processo (functools.cache) e compartilhados por todas as sessões. O que
+# ainda precisa ir para a página a cada rerun (o <style> da mesa) sai de
+# uma string pronta, sem remontar nada. Bibliotecas pesadas (pandas,
+# pyarrow) continuam importadas dentro da seção/função que as usa — este
+# módulo só depende do Streamlit.
+
+PASTA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "estaticos")
+
+
+@functools.cache
+def binario(nome: str) -> bytes:
+    """Conteúdo de utils/estaticos/<nome> (lido uma vez por processo)."""
+    with open(os.path.join(PASTA, nome), "rb") as f:
+        return f.read()
+
+
+@functools.cache
+def texto(nome: str) -> str:
+    return binario(nome).decode("utf-8")
+
+
+@functools.cache
+def _bloco_estilo(nome: str) -> str:
+    return f"<style>\n{texto(nome)}</style>"
+
+
+def estilo(nome: str):
+    """Injeta utils/estaticos/<nome> (CSS) na página."""
+    st.markdown(_bloco_estilo(nome), unsafe_allow_html=True)
@@ -1,17 +1,176 @@
-import pandas as pd
+import csv
+import io
 import os
 
-def salvar_csv(state):
-    registros = []
-    for equipe in ["A", "B"]:
-        for jogador in state["equipes"][equipe]:
-            registros.append({
-                "Equipe": equipe,
-                "Jogador": jogador["numero"],
-                "Tempo jogado (min)": round(jogador["tempo_jogado"] / 60, 2),
-                "Tempo no banco (min)": round(jogador["tempo_banco"] / 60, 2),
-                "Tempo 2min (min)": round(jogador["tempo_penalidade"] / 60, 2)
-            })
-    df = pd.DataFrame(registros)
-    os.makedirs("dados", exist_ok=True)
-    df.to_csv("dados/saida_jogo.csv", index=False, encoding="utf-8")
+from utils.linha_tempo import COLUNAS, ESTADOS
+
+# =====================================================
+# Exportação em fluxo (CSV e Parquet)
+# =====================================================
+# Duas tabelas, ambas produzidas por geradores de tuplas (uma linha por
+# vez, nada de DataFrame no meio):
+#   jogadores — o relatório agregado por jogador (mesmas colunas da tela),
+#               com o nome da equipe: "A"/"B" é só o lado dela naquela partida
+#   eventos   — a linha do tempo completa, um evento por linha (elenco e
+#               titulares com os números, para remontar as escalações)
+# Os escritores consomem o gerador aos poucos: CSV linha a linha, Parquet
+# em grupos de 'lote' linhas. O pyarrow (já instalado com o Streamlit) só
+# é importado quando se pede Parquet.
+
+COLUNAS_JOGADORES = (
+    "Partida", "Equipe", "Nome da equipe", "Número", "Estado", "Exclusões",
+    "Jogado 1ºT (min)", "Jogado 2ºT (min)", "Jogado Total (min)", "Banco (min)", "2 min (min)",
+)
+COLUNAS_EVENTOS = (
+    "Partida", "Seq", "t", "Tipo", "Equipe", "Número", "Sai", "Entra", "Período", "Retro", "Números",
+)
+
+_TIPOS_ARROW = {
+    "Partida": "string", "Equipe": "string", "Nome da equipe": "string", "Estado": "string", "Tipo": "string",
+    "Período": "string", "Números": "string",
+    "Número": "int32", "Exclusões": "int16", "Sai": "int32", "Entra": "int32", "Seq": "int64",
+    "Retro": "bool_",
+}
+
+
+# ---------- Geradores de linhas ----------
+def linhas_jogadores(motor, agora: float, partida: str = ""):
+    """Uma tupla (COLUNAS_JOGADORES) por jogador do elenco, em ordem de equipe e número."""
+    tabela = motor.tabela
+    idx = tabela.ordem()
+    if not len(idx):
+        return
+    tot = tabela.totais(agora)
+    i1, i2, ib = COLUNAS.index("jogado_1t"), COLUNAS.index("jogado_2t"), COLUNAS.index("banco")
+    nomes = motor.estado["nomes"]
+    for i in idx:
+        eq, n = str(tabela.equipe[i]), int(tabela.numero[i])
+        t = tot[i]
+        yield (
+            partida, eq, nomes.get(eq) or f"Equipe {eq}", n, ESTADOS[tabela.estado[i]], int(tabela.exclusoes[i]),
+            round(t[i1] / 60, 1), round(t[i2] / 60, 1), round((t[i1] + t[i2]) / 60, 1),
+            round(t[ib] / 60, 1), round(motor.penalidades(eq).cumprido(n, agora) / 60, 1),
+        )
+
+
+def linhas_eventos(eventos, partida: str = ""):
+    """
+    Uma tupla (COLUNAS_EVENTOS) por evento; aceita eventos ou pares (seq, evento).
+    "Números" (elenco/titulares) vai como texto separado por espaços: "1 2 3".
+    """
+    for seq, ev in enumerate(eventos, 1):
+        if isinstance(ev, tuple):
+            seq, ev = ev
+        numeros = ev.get("numeros")
+        yield (
+            partida, seq, float(ev["t"]), ev["tipo"], ev.get("equipe"), ev.get("numero"),
+            ev.get("sai"), ev.get("entra"), ev.get("periodo"), bool(ev.get("retro", False)),
+            " ".join(map(str, numeros)) if numeros is not None else None,
+        )
+
+
+# ---------- CSV ----------
+def escrever_csv(linhas, destino, colunas) -> int:
+    """Grava cabeçalho + linhas em 'destino' (caminho ou arquivo texto). Devolve o nº de linhas."""
+    if isinstance(destino, (str, os.PathLike)):
+        pasta = os.path.dirname(destino)
+        if pasta:
+            os.makedirs(pasta, exist_ok=True)
+        with open(destino, "w", newline="", encoding="utf-8") as f:
+            return escrever_csv(linhas, f, colunas)
+    w = csv.writer(destino)
+    w.writerow(colunas)
+    n = 0
+    for linha in linhas:
+        w.writerow(linha)
+        n += 1
+    return n
+
+
+def csv_em_blocos(linhas, colunas, tamanho: int = 64 * 1024):
+    """CSV em blocos de bytes UTF-8 de ~'tamanho' (para respostas HTTP / downloads)."""
+    buf = io.StringIO()
+    w = csv.writer(buf)
+    w.writerow(colunas)
+    for linha in linhas:
+        w.writerow(linha)
+        if buf.tell() >= tamanho:
+            yield buf.getvalue().encode("utf-8")
+            buf.seek(0)
+            buf.truncate()
+    if buf.tell():
+        yield buf.getvalue().encode("utf-8")
+
+
+# ---------- Parquet ----------
+def _schema(colunas):
+    import pyarrow as pa
+
+    return pa.schema([(c, getattr(pa, _TIPOS_ARROW.get(c, "float64"))()) for c in colunas])
+
+
+def _lotes(linhas, tamanho: int):
+    lote = []
+    for linha in linhas:
+        lote.append(linha)
+        if len(lote) == tamanho:
+            yield lote
+            lote = []
+    if lote:
+        yield lote
+
+
+def escrever_parquet(linhas, destino, colunas, lote: int = 10_000) -> int:
+    """Grava as linhas em Parquet (caminho ou arquivo binário), um row group por lote."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = _schema(colunas)
+    if isinstance(destino, (str, os.PathLike)):
+        pasta = os.path.dirname(destino)
+        if pasta:
+            os.makedirs(pasta, exist_ok=True)
+    n = 0
+    with pq.ParquetWriter(destino, schema) as w:
+        for bloco in _lotes(linhas, lote):
+            w.write_table(pa.Table.from_arrays(
+                [pa.array(col, type=campo.type) for col, campo in zip(zip(*bloco), schema)], schema=schema,
+            ))
+            n += len(bloco)
+    return n
+
+
+# ---------- Arquivo de temporada ----------
+def exportar_temporada(armazenamento, pasta: str = "dados/temporada", ids=None, formato: str = "parquet"):
+    """
+    Grava jogadores.<fmt> e eventos.<fmt> com todas as partidas do armazenamento
+    (ou só 'ids'), reconstruindo uma partida por vez. Devolve {tabela: nº de linhas}.
+    """
+    from utils.motor import MotorPartida
+
+    ids = list(ids) if ids is not None else armazenamento.partidas()
+    escrever = escrever_parquet if formato == "parquet" else escrever_csv
+
+    def jogadores():
+        for pid in ids:
+            motor = MotorPartida()
+            motor.reproduzir(ev for _, ev in armazenamento.iterar(pid))
+            eventos = motor.estado["eventos"]
+            yield from linhas_jogadores(motor, eventos[-1]["t"] if eventos else 0.0, pid)
+
+    def eventos():
+        for pid in ids:
+            yield from linhas_eventos(armazenamento.iterar(pid), pid)
+
+    return {
+        "jogadores": escrever(jogadores(), os.path.join(pasta, f"jogadores.{formato}"), COLUNAS_JOGADORES),
+        "eventos": escrever(eventos(), os.path.join(pasta, f"eventos.{formato}"), COLUNAS_EVENTOS),
+    }
+
+
+def salvar_csv(motor, caminho: str = "dados/saida_jogo.csv", agora: float | None = None, partida: str = ""):
+    """Relatório por jogador da partida em CSV (agora: tempo de partida; padrão = último evento)."""
+    if agora is None:
+        eventos = motor.estado["eventos"]
+        agora = eventos[-1]["t"] if eventos else 0.0
+    return escrever_csv(linhas_jogadores(motor, agora, partida), caminho, COLUNAS_JOGADORES)
@@ -0,0 +1,66 @@
+import json
+import os
+
+import streamlit.components.v1 as components
+
+from utils import tempo
+
+# Componente único (um iframe só) para o cronômetro e as contagens de 2'.
+# Com 'key' fixa o iframe persiste entre reruns: o Streamlit apenas reenvia
+# os argumentos, e o próprio componente redesenha a lista de penalidades.
+_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "componentes", "relogio")
+_componente_relogio = components.declare_component("relogio_partida", path=_DIR)
+
+# Script do relógio comum à mesa e ao placar (sincronia com /hora, formato,
+# tempo decorrido). Cada componente só serve a própria pasta, então a pasta
+# "comum" é declarada como componente — nunca renderizado — só para ser
+# servida; os index.html a carregam por <script src="../utils.relogio.comum/relogio.js">.
+_DIR_COMUM = os.path.join(os.path.dirname(os.path.abspath(__file__)), "componentes", "comum")
+components.declare_component("comum", path=_DIR_COMUM)
+
+# Listas/dicts vão como texto JSON: o Streamlit testa se cada argumento de
+# componente é "tipo DataFrame", e esse teste importa o pandas para listas e
+# dicts — com strings a sessão da mesa não carrega o pandas.
+
+
+def relogio_partida(iniciado: bool, cronometro: float, ultimo_tick: float, tempo_base: float,
+                    equipes, penalidades, porta: int, partida_id: str = "principal",
+                    fim_periodo: float | None = None, key: str = "relogio_partida"):
+    """
+    Renderiza o relógio principal e as penalidades ativas.
+
+    equipes: [{"equipe", "nome", "cor"}] na ordem dos lados da tela.
+    penalidades: [{"id", "equipe", "numero", "end"}] com 'end' no tempo da partida.
+    porta: servidor de placar, cujo /hora sincroniza o relógio do navegador e cujo
+    SSE (/placar?partida=partida_id) traz os 2' que o servidor deu por encerrados.
+    fim_periodo: cronômetro em que o período aberto completa a duração (toca o alarme
+    ao cruzar); None no intervalo.
+    Retorna {"expiradas": [ids]} quando alguma penalidade termina (aviso do servidor
+    ou, sem conexão, a contagem local chegando a zero).
+    """
+    return _componente_relogio(
+        iniciado=bool(iniciado),
+        cronometro=float(cronometro),
+        ultimo_tick=float(ultimo_tick) if iniciado else None,
+        tempo_base=float(tempo_base),
+        equipes=json.dumps(list(equipes)),
+        penalidades=json.dumps(list(penalidades)),
+        porta=int(porta),
+        partida=partida_id,
+        fim_periodo=None if fim_periodo is None else float(fim_periodo),
+        servidor_agora=tempo.agora(),
+        key=key,
+        default=None,
+    )
+
+
+# Placar do público: mesmo esquema de relógio, mas atualizado por diffs (SSE)
+_DIR_PLACAR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "componentes", "placar")
+_componente_placar = components.declare_component("placar_publico", path=_DIR_PLACAR)
+
+
+def placar_publico(partida_id: str, placar: dict, porta: int, key: str = "placar_publico"):
+    """Placar somente leitura; após o primeiro render, recebe só diffs do servidor SSE."""
+    return _componente_placar(
+        partida=partida_id, placar=json.dumps(placar), porta=int(porta), servidor_agora=tempo.agora(), key=key, default=None,
+    )
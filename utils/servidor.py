@@ -0,0 +1,57 @@
+import logging
+import os
+import streamlit as st
+
+from utils.agendador import AgendadorPenalidades
+from utils.partidas import Partida, RegistroPartidas
+from utils.persistencia import ArmazenamentoSQLite
+from utils.placar import CentralPlacar, iniciar_servidor_placar
+
+# =====================================================
+# Recursos por processo (compartilhados por todas as páginas e sessões)
+# =====================================================
+# Ficam num módulo próprio porque o st.cache_resource é indexado pela função:
+# app.py e pages/placar.py precisam enxergar o mesmo registro de partidas.
+
+PORTA_PLACAR = int(os.environ.get("PLACAR_PORTA", "8502"))
+# interface do servidor de placar: a mesma do Streamlit (server.address) ou só
+# a máquina local; PLACAR_HOST=0.0.0.0 libera as telas de outras máquinas da rede
+HOST_PLACAR = os.environ.get("PLACAR_HOST") or st.get_option("server.address") or "127.0.0.1"
+
+
+@st.cache_resource
+def armazenamento() -> ArmazenamentoSQLite:
+    """Conexão única por processo, compartilhada entre as sessões."""
+    return ArmazenamentoSQLite("dados/partidas.db")
+
+
+@st.cache_resource
+def agendador() -> AgendadorPenalidades:
+    """Thread única que marca o fim dos 2' de todas as partidas."""
+    return AgendadorPenalidades()
+
+
+@st.cache_resource
+def registro() -> RegistroPartidas:
+    """Partidas ativas no servidor; sessões com o mesmo ?partida= compartilham o estado."""
+    return RegistroPartidas(armazenamento(), ao_criar=agendador().acompanhar)
+
+
+@st.cache_resource
+def central_placar() -> CentralPlacar:
+    """Canais de diffs do placar + servidor SSE (sobe uma vez por processo)."""
+    central = CentralPlacar(registro().ativa)
+    try:
+        iniciar_servidor_placar(central, PORTA_PLACAR, HOST_PLACAR)
+    except OSError as e:
+        # porta ocupada: a mesa segue funcionando; relógios ficam com a hora do render
+        logging.getLogger(__name__).warning("Servidor de placar indisponível na porta %s: %s", PORTA_PLACAR, e)
+    return central
+
+
+def partida_id() -> str:
+    return st.query_params.get("partida", "principal")
+
+
+def partida_atual() -> Partida:
+    return registro().obter(partida_id())
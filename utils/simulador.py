@@ -0,0 +1,119 @@
+"""
+Simulador de partidas em lote sobre o MotorPartida (sem Streamlit).
+
+Gera partidas sintéticas com ações plausíveis de mesa (substituições,
+2', retornos, expulsões, correções retroativas, tempos técnicos, intervalo)
+e as aplica pelo mesmo motor de regras que a mesa usa.
+
+Uso:  python -m utils.simulador [--partidas 1000] [--seed 0] [--tecnicos-por-min 0.05]
+"""
+import argparse
+import json
+import random
+import time
+
+from utils.motor import MotorPartida
+from utils.periodos import PERIODOS, TECNICOS_POR_EQUIPE, TECNICOS_POR_TEMPO
+
+# ações de mesa por minuto de jogo (as duas equipes somadas); "retro" é uma
+# substituição retroativa num instante sorteado do passado; "tempo_tecnico" para
+# o relógio e o reinicia no mesmo instante de partida
+TAXAS = {
+    "substituicao": 1.4, "exclusao": 0.16, "retorno": 0.4, "expulsao": 0.04, "retro": 0.0, "tempo_tecnico": 0.0,
+}
+
+
+def _acao_aleatoria(motor: MotorPartida, rng: random.Random, tipo: str, eq: str, t: float):
+    """(tipo, dados) de uma ação válida para a equipe no tempo t, ou None."""
+    elenco = motor.elenco(eq)
+    jogando = elenco.por_estado("jogando")
+    banco = elenco.por_estado("banco")
+    if tipo == "retro":
+        sai, entra = rng.sample(elenco.numeros(), 2)
+        return "substituicao", {"sai": sai, "entra": entra, "retro": True, "t": rng.uniform(0.0, t)}
+    if tipo == "substituicao" and jogando and banco:
+        return tipo, {"sai": rng.choice(jogando), "entra": rng.choice(banco)}
+    if tipo == "exclusao" and jogando:
+        return tipo, {"numero": rng.choice(jogando)}
+    if tipo == "retorno" and motor.penalidades(eq).mais_antiga_concluida(t) is not None:
+        candidatos = elenco.por_estado("excluido") or banco
+        if candidatos:
+            return tipo, {"numero": rng.choice(candidatos)}
+    if tipo == "expulsao" and jogando:
+        return tipo, {"numero": rng.choice(jogando)}
+    if tipo == "tempo_tecnico":
+        periodos = motor.periodos()
+        if (periodos.tecnicos_de(eq) < TECNICOS_POR_EQUIPE
+                and periodos.tecnicos_de(eq, periodos.atual) < TECNICOS_POR_TEMPO):
+            return tipo, {"epoch": 0.0}
+    return None
+
+
+def simular_partida(seed=None, jogadores: int = 14, duracao: float = 3600.0,
+                    taxas: dict | None = None) -> MotorPartida:
+    """
+    Uma partida completa (dois tempos de duracao/2) aplicada num MotorPartida novo.
+    taxas: ações por minuto, sobrepondo TAXAS (ex.: {"retro": 0.1}).
+    """
+    taxas = {**TAXAS, **(taxas or {})}
+    tipos = [k for k, v in taxas.items() if v > 0]
+    pesos = [taxas[k] for k in tipos]
+    rng = random.Random(seed)
+    motor = MotorPartida()
+    numeros = rng.sample(range(1, 100), jogadores)
+    for eq in ("A", "B"):
+        motor.aplicar("elenco", 0.0, equipe=eq, numeros=numeros, nome=f"Equipe {eq}")
+        motor.aplicar("titulares", 0.0, equipe=eq, numeros=numeros[:7])
+    motor.aplicar("inicio", 0.0, epoch=0.0)
+
+    t = 0.0
+    meio = duracao / 2
+    taxa = sum(pesos) / 60.0
+    while True:
+        t += rng.expovariate(taxa)
+        if t >= duracao:
+            break
+        if motor.periodos().atual == 0 and t >= meio:
+            motor.aplicar("fim_periodo", meio, epoch=0.0, periodo=PERIODOS[0])
+            motor.aplicar("inicio", meio, epoch=0.0)  # 2º tempo
+        eq = rng.choice(("A", "B"))
+        sorteada = _acao_aleatoria(motor, rng, rng.choices(tipos, weights=pesos)[0], eq, t)
+        if sorteada is not None:
+            tipo, dados = sorteada
+            motor.aplicar(tipo, dados.pop("t", t), equipe=eq, **dados)
+            if tipo == "tempo_tecnico":
+                motor.aplicar("inicio", t, epoch=0.0)
+    motor.aplicar("fim_periodo", duracao, epoch=0.0, periodo=PERIODOS[1])
+    return motor
+
+
+def simular_lote(partidas: int, seed: int = 0, **kwargs):
+    """Simula 'partidas' partidas (sementes seed, seed+1, ...) e devolve os motores."""
+    return [simular_partida(seed + i, **kwargs) for i in range(partidas)]
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--partidas", type=int, default=1000)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--jogadores", type=int, default=14)
+    ap.add_argument("--retros-por-min", type=float, default=TAXAS["retro"])
+    ap.add_argument("--tecnicos-por-min", type=float, default=TAXAS["tempo_tecnico"])
+    args = ap.parse_args()
+
+    t0 = time.perf_counter()
+    motores = simular_lote(args.partidas, args.seed, jogadores=args.jogadores,
+                           taxas={"retro": args.retros_por_min, "tempo_tecnico": args.tecnicos_por_min})
+    dt = time.perf_counter() - t0
+    eventos = sum(len(m.estado["eventos"]) for m in motores)
+    print(json.dumps({
+        "partidas": args.partidas,
+        "eventos": eventos,
+        "segundos": round(dt, 3),
+        "partidas_por_s": round(args.partidas / dt, 1),
+        "eventos_por_s": round(eventos / dt, 1),
+    }, indent=2, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,19 @@
+import time
+
+# =====================================================
+# Base de tempo única do servidor
+# =====================================================
+# time.time() pode saltar (ajuste de NTP, fuso, relógio acertado à mão);
+# time.monotonic() não salta, mas não tem época. agora() junta os dois: a
+# hora de parede é lida uma vez, ao importar o módulo, e dali em diante só
+# avança pelo relógio monotônico. Todos os 'epoch' dos eventos, o relógio
+# da partida e o /hora do servidor de placar (sincronização dos navegadores)
+# usam esta mesma função.
+
+_ANCORA_PAREDE = time.time()
+_ANCORA_MONO = time.monotonic()
+
+
+def agora() -> float:
+    """Segundos desde a época, sem saltos durante a vida do processo."""
+    return _ANCORA_PAREDE + (time.monotonic() - _ANCORA_MONO)
@@ -0,0 +1,125 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from utils.registros import exportar_temporada
+
+# =====================================================
+# Análise de temporada (partidas arquivadas)
+# =====================================================
+# Lê a pasta gravada por registros.exportar_temporada (jogadores + eventos)
+# e monta um índice por (partida, equipe, número) com as colunas do
+# relatório da tela + contadores de rotação. As consultas da temporada
+# agrupam pelo nome da equipe — "A"/"B" é só o lado de cada partida, e a
+# camisa 7 de clubes diferentes não pode virar um jogador só. O índice fica em
+# <pasta>/indice.parquet e só é refeito quando os arquivos de origem mudam
+# (tamanho/mtime gravados nos metadados); as consultas são groupbys sobre
+# ele, sem tocar de novo nos arquivos de origem.
+
+INDICE = "indice.parquet"
+NOME = "Nome da equipe"
+VERSAO_INDICE = 2  # muda quando as colunas do índice mudam (força refazer o salvo)
+_CHAVE_META = b"handebol_fontes"
+
+# colunas numéricas do relatório (mesmas de _stats_to_dataframe)
+MINUTOS = ["Jogado 1ºT (min)", "Jogado 2ºT (min)", "Jogado Total (min)", "Banco (min)", "2 min (min)"]
+
+
+def _fontes(pasta: str) -> dict:
+    fontes = {"versao": VERSAO_INDICE}
+    for nome in ("jogadores.parquet", "eventos.parquet"):
+        info = os.stat(os.path.join(pasta, nome))
+        fontes[nome] = [info.st_size, info.st_mtime_ns]
+    return fontes
+
+
+def _rotacao(eventos: pd.DataFrame) -> pd.DataFrame:
+    """Entradas e saídas por (Partida, Equipe, Número) a partir da linha do tempo."""
+    subs = eventos[eventos["Tipo"] == "substituicao"]
+    ret = eventos[eventos["Tipo"] == "retorno"]
+    chave = ["Partida", "Equipe", "Número"]
+    entradas = pd.concat([
+        subs[["Partida", "Equipe", "Entra"]].rename(columns={"Entra": "Número"}),
+        ret[["Partida", "Equipe", "Número"]],
+    ]).groupby(chave).size().rename("Entradas")
+    saidas = subs[["Partida", "Equipe", "Sai"]].rename(columns={"Sai": "Número"}) \
+        .groupby(chave).size().rename("Saídas")
+    return pd.concat([entradas, saidas], axis=1).fillna(0).astype("int32")
+
+
+def _montar_indice(pasta: str) -> pd.DataFrame:
+    jogadores = pd.read_parquet(os.path.join(pasta, "jogadores.parquet"))
+    eventos = pd.read_parquet(
+        os.path.join(pasta, "eventos.parquet"),
+        columns=["Partida", "Tipo", "Equipe", "Número", "Sai", "Entra"],
+    )
+    if NOME not in jogadores:  # arquivo gravado antes da coluna existir
+        jogadores[NOME] = "Equipe " + jogadores["Equipe"].astype(str)
+    chave = ["Partida", "Equipe", "Número"]
+    indice = jogadores.merge(_rotacao(eventos).reset_index(), on=chave, how="left")
+    indice[["Entradas", "Saídas"]] = indice[["Entradas", "Saídas"]].fillna(0).astype("int32")
+    for col in ("Partida", "Equipe", NOME, "Estado"):
+        indice[col] = indice[col].astype("category")
+    return indice
+
+
+def carregar_indice(pasta: str = "dados/temporada") -> pd.DataFrame:
+    """Índice da temporada; reaproveita <pasta>/indice.parquet se as fontes não mudaram."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    fontes = _fontes(pasta)
+    caminho = os.path.join(pasta, INDICE)
+    if os.path.exists(caminho):
+        meta = pq.read_schema(caminho).metadata or {}
+        if json.loads(meta.get(_CHAVE_META, b"null")) == fontes:
+            return pd.read_parquet(caminho)
+
+    indice = _montar_indice(pasta)
+    tabela = pa.Table.from_pandas(indice, preserve_index=False)
+    tabela = tabela.replace_schema_metadata({**(tabela.schema.metadata or {}), _CHAVE_META: json.dumps(fontes)})
+    pq.write_table(tabela, caminho)
+    return indice
+
+
+def arquivar(armazenamento, pasta: str = "dados/temporada", ids=None) -> pd.DataFrame:
+    """Exporta as partidas do armazenamento para a pasta e devolve o índice novo."""
+    exportar_temporada(armazenamento, pasta, ids)
+    return carregar_indice(pasta)
+
+
+# ---------- Consultas ----------
+def equipes(indice: pd.DataFrame):
+    """Nomes das equipes presentes no arquivo, em ordem alfabética."""
+    return sorted(indice[NOME].unique())
+
+
+def por_jogador(indice: pd.DataFrame, equipe: str | None = None) -> pd.DataFrame:
+    """Totais e médias por (nome da equipe, Número) ao longo da temporada; equipe = um nome."""
+    df = indice if equipe is None else indice[indice[NOME] == equipe]
+    g = df.groupby([NOME, "Número"], observed=True, sort=True)
+    out = g[MINUTOS].sum().round(1)
+    out.insert(0, "Partidas", g.size())
+    out["Média jogada (min)"] = (out["Jogado Total (min)"] / out["Partidas"]).round(1)
+    out["Exclusões"] = g["Exclusões"].sum()
+    out["Entradas"] = g["Entradas"].sum()
+    out["Saídas"] = g["Saídas"].sum()
+    # tempo médio em quadra por passagem (titular conta como a primeira passagem)
+    passagens = np.maximum(out["Entradas"].to_numpy(), out["Saídas"].to_numpy()).clip(min=1)
+    out["Min por passagem"] = (out["Jogado Total (min)"] / passagens).round(1)
+    return out.reset_index()
+
+
+def por_partida(indice: pd.DataFrame) -> pd.DataFrame:
+    """Rotação por partida e equipe: jogadores usados, entradas e exclusões."""
+    chave = ["Partida", "Equipe", NOME]
+    g = indice.groupby(chave, observed=True, sort=False)
+    usados = (indice["Jogado Total (min)"] > 0).groupby([indice[c] for c in chave], observed=True, sort=False)
+    return pd.DataFrame({
+        "Jogadores usados": usados.sum(),
+        "Entradas": g["Entradas"].sum(),
+        "Exclusões": g["Exclusões"].sum(),
+        "2 min (min)": g["2 min (min)"].sum().round(1),
+    }).reset_index()